@@ -0,0 +1,38 @@
+# Micro-benchmark: 10k todo toggles with a connect per operation
+# against the shared connection
+# Run from the repository root: python -m benchmarks.database
+import os
+import time
+import sqlite3
+import tempfile
+from services.database import get_database
+
+toggles = 10000
+with tempfile.TemporaryDirectory() as tmp:
+    path = os.path.join(tmp, "bench.db")
+    database = get_database(path)
+    database.execute(
+        "CREATE TABLE todos (id INTEGER PRIMARY KEY AUTOINCREMENT, task TEXT NOT NULL, "
+        "done BOOLEAN DEFAULT 0, created_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP, "
+        "completed_date TIMESTAMP, synced BOOLEAN DEFAULT 0)"
+    )
+    database.executemany("INSERT INTO todos (task) VALUES (?)", ((f"task {i}",) for i in range(1000)))
+    toggle = ("UPDATE todos SET done = ?, completed_date = CASE WHEN ? THEN CURRENT_TIMESTAMP "
+              "ELSE NULL END WHERE id = ?")
+
+    start = time.perf_counter()
+    for i in range(toggles):
+        conn = sqlite3.connect(path)
+        conn.execute(toggle, (i % 2, i % 2, i % 1000 + 1))
+        conn.commit()
+        conn.close()
+    per_connect = (time.perf_counter() - start) / toggles
+
+    start = time.perf_counter()
+    for i in range(toggles):
+        database.execute(toggle, (i % 2, i % 2, i % 1000 + 1))
+    shared = (time.perf_counter() - start) / toggles
+
+    database.close()
+    print(f"connect per toggle: {per_connect * 1e6:8.1f} us per toggle")
+    print(f"shared connection:  {shared * 1e6:8.1f} us per toggle")
@@ -0,0 +1,39 @@
+# Micro-benchmark: the cost of one click should not grow with the tree size
+# Run from the repository root: python -m benchmarks.explorer_click
+import os
+import time
+import types
+import tempfile
+import customtkinter as ctk
+from ui.explorer import FileExplorer
+
+root = ctk.CTk()
+app = types.SimpleNamespace()
+clicks = 200
+with tempfile.TemporaryDirectory() as tmp:
+    for folders in (1, 10, 50):
+        workspace = os.path.join(tmp, f"tree_{folders}")
+        for i in range(folders):
+            folder = os.path.join(workspace, f"folder_{i:03d}")
+            os.makedirs(folder)
+            for j in range(100):
+                open(os.path.join(folder, f"file_{j:03d}.txt"), "w").close()
+
+        explorer = FileExplorer(root, app, {"root": workspace})
+        explorer.pack(fill="both", expand=True)
+        for path, item in list(explorer.tree_items.items()):
+            if item["is_dir"] and not item["expanded"]:
+                explorer.toggle_directory(path)
+        root.update()
+
+        files = [p for p, item in explorer.tree_items.items() if not item["is_dir"]]
+        start = time.perf_counter()
+        for k in range(clicks):
+            path = files[k * 7919 % len(files)]
+            explorer.item_clicked(path, False)
+        root.update_idletasks()
+        elapsed = (time.perf_counter() - start) / clicks
+        print(f"{len(explorer.tree_items):5d} rows: {elapsed * 1000:.3f} ms per click")
+        explorer.destroy()
+
+root.destroy()
@@ -0,0 +1,18 @@
+# Micro-benchmark: the check run on every start of an up to date database
+# Run from the repository root: python -m benchmarks.migrations
+import os
+import time
+import tempfile
+from services.database import Database
+from services.migrations import migrate
+
+with tempfile.TemporaryDirectory() as tmp:
+    db = Database(os.path.join(tmp, "minux.db"))
+    conn = db.connection()
+    migrate(conn)
+    runs = 10000
+    start = time.perf_counter()
+    for _ in range(runs):
+        migrate(conn)
+    print(f"up to date check: {(time.perf_counter() - start) / runs * 1e6:.1f} us")
+    db.close()
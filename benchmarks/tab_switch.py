@@ -0,0 +1,25 @@
+# Micro-benchmark: the cost of one tab switch should not grow with the tab count
+# Run from the repository root: python -m benchmarks.tab_switch
+import time
+import customtkinter as ctk
+from ui.tabs import VSCodeTabView
+
+root = ctk.CTk()
+view = VSCodeTabView(root)
+view.pack(fill="both", expand=True)
+root.update()
+
+switches = 200
+for count in (10, 40, 80, 160):
+    while len(view._tab_order) < count:
+        view.add(f"tab {len(view._tab_order)}")
+    root.update()
+
+    start = time.perf_counter()
+    for _ in range(switches):
+        view._next_tab()
+    root.update_idletasks()
+    elapsed = (time.perf_counter() - start) / switches
+    print(f"{count:4d} tabs: {elapsed * 1000:.3f} ms per switch")
+
+root.destroy()
@@ -0,0 +1,36 @@
+# Micro-benchmark: toggling one task of 100k moves it between groups
+# without regrouping the rest
+# Run from the repository root: python -m benchmarks.todo_model
+import time
+import random
+import datetime
+from services.todo_model import TaskModel, STATUS_GROUPS, parse_quick_add
+
+random.seed(1)
+today = datetime.date(2024, 5, 15)
+tags = ("work", "home", "errands", "reading")
+tasks = [{
+    "id": i, "text": f"task {i}", "done": i % 3 == 0, "priority": i % 4,
+    "due_date": (today + datetime.timedelta(days=random.randint(-10, 30))).isoformat() if i % 2 else None,
+    "tags": tuple(random.sample(tags, i % 3)),
+} for i in range(100000)]
+
+start = time.perf_counter()
+model = TaskModel(today)
+model.load(tasks)
+print(f"indexed {len(tasks)} tasks in {(time.perf_counter() - start) * 1000:.1f} ms")
+print({key: len(group) for key, group in model.groups("due")})
+
+start = time.perf_counter()
+for task in tasks[:1000]:
+    model.update(task, done=not task["done"])
+print(f"toggle: {(time.perf_counter() - start) * 1000:.3f} us per task")
+
+start = time.perf_counter()
+regrouped = {}
+for task in tasks:
+    regrouped.setdefault(STATUS_GROUPS[task["done"]], []).append(task)
+print(f"regrouping everything instead: {(time.perf_counter() - start) * 1000:.1f} ms")
+assert [len(group) for _, group in model.groups("status")] == [len(regrouped["To do"]), len(regrouped["Done"])]
+
+print(parse_quick_add("call mum #home due:tomorrow !2 about #Home stuff", today))
@@ -0,0 +1,31 @@
+# Micro-benchmark: opening the list should not get slower with the task count
+# Run from the repository root: python -m benchmarks.todo_open
+import os
+import time
+import tempfile
+import customtkinter as ctk
+from services.database import get_database
+from services.migrations import migrate
+from ui.widgets.todo import TodoWidget
+
+root = ctk.CTk()
+with tempfile.TemporaryDirectory() as tmp:
+    for count in (100, 10000, 100000):
+        db_path = os.path.join(tmp, f"todos_{count}.db")
+        db = get_database(db_path)
+        migrate(db.connection())
+        db.executemany("INSERT INTO todos (task, done) VALUES (?, ?)", ((f"task {i}", i % 3 == 0) for i in range(count)))
+
+        start = time.perf_counter()
+        widget = TodoWidget(root, print, db_path)
+        widget.pack(fill="both", expand=True)
+        # The first page arrives from the database worker
+        while widget._loading:
+            root.update()
+            time.sleep(0.001)
+        root.update()
+        print(f"{count:7d} tasks: opened in {(time.perf_counter() - start) * 1000:.1f} ms with {len(widget._rows)} rows")
+        widget.destroy()
+        # Runs after the requests the widget queued, on the worker's own thread
+        db.close()
+root.destroy()
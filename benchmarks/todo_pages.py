@@ -0,0 +1,45 @@
+# Micro-benchmark: a deep page costs the same as the first one, and a
+# cached summary is a pragma read
+# Run from the repository root: python -m benchmarks.todo_pages
+import os
+import time
+import tempfile
+from services.database import Database
+from services.migrations import migrate
+from services.todo_pages import fetch_page, TaskSummary, TASK_COLUMNS, PAGE_SIZE
+
+count = 500000
+with tempfile.TemporaryDirectory() as tmp:
+    db = Database(os.path.join(tmp, "pages.db"))
+    migrate(db.connection())
+    with db.transaction() as conn:
+        conn.executemany(
+            "INSERT INTO todos (task, done, created_date) VALUES (?, ?, datetime('2020-01-01', ? || ' seconds'))",
+            ((f"task {i}", i % 4 == 0, i // 3) for i in range(count))
+        )
+
+    for page in (1, 100, 2000):
+        cursor, start = None, time.perf_counter()
+        for _ in range(page):
+            rows, cursor = fetch_page(db, cursor)
+        keyset = (time.perf_counter() - start) / page
+        start = time.perf_counter()
+        offset_rows = db.fetchall(
+            f"SELECT {TASK_COLUMNS} FROM todos WHERE deleted_at IS NULL "
+            "ORDER BY created_date DESC, id DESC LIMIT ? OFFSET ?", (PAGE_SIZE, (page - 1) * PAGE_SIZE)
+        )
+        offset = time.perf_counter() - start
+        assert offset_rows == rows
+        print(f"page {page:5d}: keyset {keyset * 1000:6.2f} ms, offset {offset * 1000:6.2f} ms")
+
+    summary = TaskSummary()
+    start = time.perf_counter()
+    pending, newest = summary.get(db)
+    print(f"summary: {pending} pending in {(time.perf_counter() - start) * 1000:.1f} ms")
+    start = time.perf_counter()
+    for _ in range(1000):
+        summary.get(db)
+    print(f"cached summary: {(time.perf_counter() - start) * 1000:.1f} us")
+    db.execute("UPDATE todos SET done = 1 WHERE id = ?", (newest[0][0],))
+    assert summary.get(db)[0] == pending - 1
+    db.close()
@@ -0,0 +1,31 @@
+# Micro-benchmark: search latency per keystroke over 500k tasks
+# Run from the repository root: python -m benchmarks.todo_search [task count]
+import os
+import sys
+import time
+import random
+import tempfile
+from services.database import Database
+from services.migrations import migrate
+from services.todo_search import search_tasks
+
+count = int(sys.argv[1]) if len(sys.argv) > 1 else 500000
+words = ("fix review write release deploy report meeting email plan design refactor update "
+         "docs build server client cache index query test bug call budget invoice draft").split()
+random.seed(1)
+with tempfile.TemporaryDirectory() as tmp:
+    db = Database(os.path.join(tmp, "search.db"))
+    migrate(db.connection())
+    start = time.perf_counter()
+    with db.transaction() as conn:
+        conn.executemany("INSERT INTO todos (task, done) VALUES (?, ?)", (
+            (" ".join(random.choice(words) for _ in range(6)) + f" item{i}", i % 4 == 0)
+            for i in range(count)))
+    print(f"indexed {count} tasks in {time.perf_counter() - start:.1f} s")
+
+    for typed in ("r", "re", "rep", "repo", "report", "report b", "report bu", "report bud", "item4242"):
+        start = time.perf_counter()
+        results = search_tasks(db, typed)
+        elapsed = (time.perf_counter() - start) * 1000
+        print(f"{typed!r:14} {elapsed:6.2f} ms  {len(results):3d} results  {results[0][3] if results else ''}")
+    db.close()
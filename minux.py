@@ -21,11 +21,21 @@ from tkinter import ttk, messagebox
 import firebase_admin
 from firebase_admin import credentials, firestore
 import queue
+import zlib
 from ui.explorer import FileExplorer
 from ui.tabs import VSCodeTabView
 from ui.file_viewer import FileViewer
 from ui.widgets.todo import TodoWidget
 from ui.welcome import WelcomeScreen
+from ui.quick_open import QuickOpen
+from services.path_index import PathIndex
+from services.documents import Document
+from services.session import SessionStore
+from services.database import get_database
+from services.migrations import migrate
+from services.todo_sync import FirestoreTransport, SyncEngine
+from services.ignore import IgnoreMatcher, DEFAULT_EXCLUDES
+from services.thumbnails import ThumbnailCache, ThumbnailLoader
 import sqlite3
 import threading
 from pathlib import Path
@@ -125,6 +135,8 @@ class VSCodeTextEditor(ctk.CTkFrame):
     def __init__(self, master, **kwargs):
         super().__init__(master, **kwargs)
         self.configure(fg_color="#1e1e1e")
+        self.document = None
+        self.on_modified = None  # Called with the document when the user first edits it
         
         # Configure grid weights for proper expansion
         self.grid_columnconfigure(2, weight=1)  # Text widget column should expand
@@ -315,13 +327,47 @@ class VSCodeTextEditor(ctk.CTkFrame):
                 content = file.read()
                 self.text.delete('1.0', 'end')
                 self.text.insert('1.0', content)
+                self.text.edit_reset()
+                self.text.edit_modified(False)
                 self.update_line_numbers()
                 self.update_cursor_position()
         except Exception as e:
             print(f"Error loading file: {e}")
+            
+    def open_document(self, document):
+        """Show a document, restoring its stored text if any, its cursor and its scroll position"""
+        self.document = document
+        if document.hibernated:
+            self.text.delete('1.0', 'end')
+            self.text.insert('1.0', document.take_text())
+            self.text.edit_reset()
+            self.text.edit_modified(document.modified)
+        else:
+            self.load_file(document.path)
+        self.text.mark_set('insert', document.cursor)
+        self.update_line_numbers()
+        self.on_scroll_both('moveto', document.yview)
+        self.text.xview_moveto(document.xview)
+        
+    def hibernate(self):
+        """Move the text and view state into the document; the undo history is dropped"""
+        self.document.store(
+            self.text.get('1.0', 'end-1c'),
+            self.text.index('insert'),
+            self.text.yview()[0],
+            self.text.xview()[0],
+            self.text.edit_modified()
+        )
+        
+    def memory_usage(self):
+        """Rough bytes held by the text widgets: the text, line numbers and undo data"""
+        chars = int(self.text.count('1.0', 'end', 'chars')[0])
+        return chars * 8
 
     def on_text_modified(self, event):
-        self.text.edit_modified(True)
+        # <<Modified>> also fires when loading resets the flag, so check it
+        if self.text.edit_modified() and self.document and self.on_modified:
+            self.on_modified(self.document)
 
 class MinuxApp(ctk.CTk):
     def show_error_notification(self, message):
@@ -347,6 +393,35 @@ class MinuxApp(ctk.CTk):
             # Track current active panel
             self.current_panel = None
             
+            # Open documents by path, holding the text of hibernated editors
+            self.documents = {}
+            
+            # File explorer and the Quick Open index of its workspace
+            self.explorer = None
+            self.path_index = None
+            
+            # Ignore rules shared by the explorer and the workspace indexers
+            self.file_excludes = load_file_excludes()
+            self.ignore_matcher = None
+            
+            # Image previews are decoded on worker threads and cached on disk
+            self.thumbnails = ThumbnailLoader(ThumbnailCache(THUMBNAIL_CACHE_DIR))
+            
+            # Todos are synced once init_database() has added the sync columns
+            self.todo_sync = None
+            
+            # Open tabs are saved as they change and reopened on the next start
+            self.session = None
+            try:
+                self.session = SessionStore(SESSION_PATH)
+            except (OSError, sqlite3.Error) as e:
+                logger.error(f"Failed to open session store: {str(e)}")
+            self._session_job = None
+            self._session_active = None
+            self._session_saved = {}  # {path: (view, whether a buffer is stored)} as last written
+            self._restored_buffers = set()  # Paths whose unsaved text is still in the store
+            self._edited = set()  # Paths whose editor text changed since the last save
+            
             # Set window title and size
             self.title("Marcetux")
             self.geometry("1200x800")
@@ -415,6 +490,7 @@ class MinuxApp(ctk.CTk):
             self.file_menu.add_separator()
             self.file_menu.add_command(label="Open File...", command=lambda: self.open_file(None))
             self.file_menu.add_command(label="Open Folder...", command=lambda: self.open_folder(None))
+            self.file_menu.add_command(label="Go to File...", command=self.show_quick_open, accelerator="Ctrl+P")
             self.file_menu.add_separator()
             self.file_menu.add_command(label="Save", command=self.save_current)
             self.file_menu.add_command(label="Save All", command=self.save_all)
@@ -422,7 +498,7 @@ class MinuxApp(ctk.CTk):
             self.file_menu.add_command(label="Preferences", command=self.show_preferences)
             self.file_menu.add_separator()
             self.file_menu.add_command(label="Close Editor", command=self.close_current)
-            self.file_menu.add_command(label="Close Window", command=self.quit)
+            self.file_menu.add_command(label="Close Window", command=self.on_close)
 
             # Edit menu
             self.edit_menu = tk.Menu(self.menu_bar, tearoff=0)
@@ -482,6 +558,12 @@ class MinuxApp(ctk.CTk):
             self.help_menu.add_separator()
             self.help_menu.add_command(label="About", command=self.show_about)
 
+            # Keyboard shortcuts
+            self.bind("<Control-p>", lambda e: self.show_quick_open())
+            
+            # Persist UI state when the window is closed
+            self.protocol("WM_DELETE_WINDOW", self.on_close)
+
             # Configure main grid layout
             self.grid_columnconfigure(0, weight=0, minsize=48)  # Activity bar - fixed width
             self.grid_columnconfigure(1, weight=0, minsize=240)  # Sidebar - fixed width
@@ -508,7 +590,11 @@ class MinuxApp(ctk.CTk):
             logger.debug("Creating tab view")
             self.tab_view = None
             try:
-                self.tab_view = VSCodeTabView(self)
+                max_live_tabs, memory_budget = load_tab_limits()
+                self.tab_view = VSCodeTabView(
+                    self, max_live_tabs=max_live_tabs, memory_budget=memory_budget,
+                    command=self.schedule_session_save
+                )
                 self.tab_view.grid(row=0, column=2, sticky="nsew")
             except Exception as e:
                 logger.error(f"Failed to create tab view: {str(e)}", exc_info=True)
@@ -535,6 +621,9 @@ class MinuxApp(ctk.CTk):
             logger.debug("Initializing database")
             init_database()
             
+            # Sync todos with Firestore in the background
+            self.start_todo_sync()
+            
             # Initialize UI components
             logger.debug("Setting up UI components")
             try:
@@ -554,6 +643,9 @@ class MinuxApp(ctk.CTk):
             except Exception as e:
                 logger.error(f"Failed to show welcome screen: {str(e)}", exc_info=True)
                 self.show_error_notification(f"Failed to show welcome screen: {str(e)}")
+            
+            # Reopen the files of the last session
+            self.restore_session()
                 
         except Exception as e:
             logger.error(f"Error in MinuxApp initialization: {str(e)}", exc_info=True)
@@ -561,6 +653,45 @@ class MinuxApp(ctk.CTk):
                 self.show_error_notification(f"Failed to initialize application: {str(e)}")
             raise
 
+    def on_close(self):
+        """Persist UI state and close the window"""
+        try:
+            if self.explorer is not None and self.explorer.winfo_exists():
+                self.explorer.save_state(EXPLORER_STATE_PATH)
+        except Exception as e:
+            logger.error(f"Failed to save explorer state: {str(e)}")
+        try:
+            if self.session is not None:
+                self.save_session()
+                self.session.flush()
+        except Exception as e:
+            logger.error(f"Failed to save session: {str(e)}")
+        if self.todo_sync is not None:
+            self.todo_sync.stop()
+        # Queued thumbnails are dropped, running ones finish on their own
+        self.thumbnails.shutdown()
+        self.destroy()
+        # Let writes still queued on the database worker, a daemon
+        # thread, finish before exiting
+        try:
+            get_database(DB_PATH).submit(lambda db: None).result(timeout=DB_SHUTDOWN_TIMEOUT)
+        except Exception as e:
+            logger.error(f"Failed to finish database writes: {str(e)}")
+
+    def start_todo_sync(self):
+        """Start syncing todos when a Firestore service account key is configured"""
+        if not os.path.exists(SERVICE_ACCOUNT_KEY_PATH):
+            logger.info("No service account key, todos stay local")
+            return
+        try:
+            if not firebase_admin._apps:
+                firebase_admin.initialize_app(credentials.Certificate(SERVICE_ACCOUNT_KEY_PATH))
+            transport = FirestoreTransport(firestore.client())
+            self.todo_sync = SyncEngine(get_database(DB_PATH), transport).start()
+        except Exception as e:
+            logger.error(f"Failed to start todo sync: {str(e)}")
+            self.show_error_notification(f"Todo sync unavailable: {str(e)}")
+
     def handle_welcome_action(self, action):
         """Handle actions from the welcome screen"""
         if isinstance(action, tuple):
@@ -579,7 +710,7 @@ class MinuxApp(ctk.CTk):
                 todo_frame = self.tab_view.tab("TODO")
                 for widget in todo_frame.winfo_children():
                     widget.destroy()
-                self.setup_todo_widget(todo_frame, selected_task=task)
+                self.setup_todo_widget(todo_frame, selected_task=task)  # Row id of the task
         else:
             if action == "New File":
                 self.new_file()
@@ -705,6 +836,7 @@ class MinuxApp(ctk.CTk):
                     "items": [
                         "Ctrl+N: New File",
                         "Ctrl+O: Open File",
+                        "Ctrl+P: Go to File",
                         "Ctrl+S: Save File",
                         "Ctrl+W: Close Tab",
                         "Ctrl+`: Toggle Terminal"
@@ -1122,13 +1254,22 @@ class MinuxApp(ctk.CTk):
             # Show explorer
             self.sidebar.grid()
             # Clear existing content
-            for widget in self.sidebar.winfo_children():
-                widget.destroy()
-            # Add file explorer
-            explorer = FileExplorer(self.sidebar, self)
-            explorer.pack(fill="both", expand=True)
+            self.clear_sidebar()
+            # Reuse the explorer so expanded folders and scroll position survive
+            if self.explorer is None or not self.explorer.winfo_exists():
+                state = FileExplorer.load_state(EXPLORER_STATE_PATH)
+                self.explorer = FileExplorer(self.sidebar, self, state=state)
+            self.explorer.pack(fill="both", expand=True)
             self.current_panel = "explorer"
             
+    def clear_sidebar(self):
+        """Remove the sidebar content, keeping the file explorer alive"""
+        for widget in self.sidebar.winfo_children():
+            if widget is self.explorer:
+                widget.pack_forget()
+            else:
+                widget.destroy()
+                
     def toggle_search(self):
         """Toggle the search sidebar"""
         if self.sidebar.winfo_ismapped() and self.current_panel == "search":
@@ -1139,8 +1280,7 @@ class MinuxApp(ctk.CTk):
             # Show search
             self.sidebar.grid()
             # Clear existing content
-            for widget in self.sidebar.winfo_children():
-                widget.destroy()
+            self.clear_sidebar()
             # TODO: Add search content
             search_label = ctk.CTkLabel(self.sidebar, text="Search", font=("Segoe UI", 14, "bold"))
             search_label.pack(padx=10, pady=10)
@@ -1156,8 +1296,7 @@ class MinuxApp(ctk.CTk):
             # Show source control
             self.sidebar.grid()
             # Clear existing content
-            for widget in self.sidebar.winfo_children():
-                widget.destroy()
+            self.clear_sidebar()
             # TODO: Add source control content
             git_label = ctk.CTkLabel(self.sidebar, text="Source Control", font=("Segoe UI", 14, "bold"))
             git_label.pack(padx=10, pady=10)
@@ -1173,8 +1312,7 @@ class MinuxApp(ctk.CTk):
             # Show debug
             self.sidebar.grid()
             # Clear existing content
-            for widget in self.sidebar.winfo_children():
-                widget.destroy()
+            self.clear_sidebar()
             # TODO: Add debug content
             debug_label = ctk.CTkLabel(self.sidebar, text="Run and Debug", font=("Segoe UI", 14, "bold"))
             debug_label.pack(padx=10, pady=10)
@@ -1190,8 +1328,7 @@ class MinuxApp(ctk.CTk):
             # Show extensions
             self.sidebar.grid()
             # Clear existing content
-            for widget in self.sidebar.winfo_children():
-                widget.destroy()
+            self.clear_sidebar()
             # TODO: Add extensions content
             extensions_label = ctk.CTkLabel(self.sidebar, text="Extensions", font=("Segoe UI", 14, "bold"))
             extensions_label.pack(padx=10, pady=10)
@@ -1217,29 +1354,212 @@ class MinuxApp(ctk.CTk):
             if hasattr(self, 'terminal'):
                 self.terminal._textbox.focus_set()
 
-    def open_file(self, file_path):
-        """Open a file in a new tab"""
+    def open_file(self, file_path, background=False, preview=False):
+        """Open a file in a new tab.
+        
+        Tabs are keyed by absolute path; the editor is only created when
+        the tab is first shown, so files opened in the background are cheap.
+        With `preview` the file is shown in the preview tab, whose editor
+        is reused for the next previewed file until the tab is pinned by
+        a double click or an edit.
+        """
         try:
-            # Get file name for tab title
-            file_name = os.path.basename(file_path)
-            
-            # Create new tab
-            tab = self.tab_view.add(file_name)
-            
-            # Create text editor in the tab
-            editor = VSCodeTextEditor(tab)
-            editor.pack(fill="both", expand=True)
-            
-            # Load file content
-            editor.load_file(file_path)
+            path = os.path.abspath(file_path)
+            tabs = self.tab_view
+            
+            if path in tabs.keys():
+                # Opening a previewed file for real keeps its tab
+                if not preview:
+                    tabs.pin(path)
+            elif preview and tabs.preview_tab is not None:
+                # Swap the document shown by the preview editor
+                old = tabs.preview_tab
+                self.documents.pop(old, None)
+                self._session_saved.pop(old, None)
+                document = self.documents[path] = Document(path)
+                tabs.rekey(
+                    old, path,
+                    title=os.path.basename(path),
+                    builder=lambda tab: self.create_editor(tab, path),
+                    on_close=lambda: self.close_document(path)
+                )
+                if self.session is not None:
+                    self.session.rename_tab(old, path)
+                editor = tabs.content(path)
+                if editor is not None:
+                    editor.open_document(document)
+                    tabs.update_usage(path)
+            else:
+                # Create new tab, titled with the file name
+                tabs.add(
+                    path,
+                    title=os.path.basename(path),
+                    builder=lambda tab: self.create_editor(tab, path),
+                    on_close=lambda: self.close_document(path)
+                )
+                if self.session is not None:
+                    self.session.add_tab(path)
+                if preview:
+                    tabs.set_preview(path)
             
-            # Switch to the new tab
-            self.tab_view.set(file_name)
+            # Switch to the tab
+            if not background:
+                tabs.set(path)
             
         except Exception as e:
             logger.error(f"Failed to open file {file_path}: {str(e)}")
             self.show_error_notification(f"Failed to open file: {str(e)}")
 
+    def create_editor(self, tab, file_path):
+        """Create a text editor for `file_path` in a tab frame"""
+        editor = VSCodeTextEditor(tab)
+        editor.pack(fill="both", expand=True)
+        editor.on_modified = self.document_modified
+        document = self.documents.get(file_path)
+        if document is None:
+            document = self.documents[file_path] = Document(file_path)
+        if file_path in self._restored_buffers:
+            # Unsaved text from the last session, read only now it is shown
+            self._restored_buffers.discard(file_path)
+            compressed = self.session.load_buffer(file_path)
+            if compressed is not None:
+                document.store_compressed(compressed)
+        editor.open_document(document)
+        # Keys that type or delete have a character; moving the cursor only changes the view
+        editor.text.bind('<Key>', lambda e: self.editor_changed(editor.document.path) if e.char
+                         else self.schedule_session_save(), add='+')
+        for sequence in ('<<Cut>>', '<<Paste>>', '<<Undo>>', '<<Redo>>'):
+            editor.text.bind(sequence, lambda e: self.editor_changed(editor.document.path), add='+')
+        return editor
+
+    def editor_changed(self, path):
+        """Note an edit in the editor of `path`, handled once edits settle"""
+        self._edited.add(path)
+        self.schedule_session_save()
+
+    def close_document(self, path):
+        """Forget a document whose tab was closed"""
+        self.documents.pop(path, None)
+        self._session_saved.pop(path, None)
+        self._restored_buffers.discard(path)
+        if self.session is not None:
+            self.session.remove_tab(path)
+
+    def restore_session(self):
+        """Reopen the tabs of the last session.
+        
+        The tab strip is filled at once from the stored rows; only the
+        active tab builds its editor, the others load when first shown.
+        """
+        if self.session is None:
+            return
+        try:
+            tabs, active = self.session.load()
+        except sqlite3.Error as e:
+            logger.error(f"Failed to load session: {str(e)}")
+            return
+        for tab in tabs:
+            if not tab.has_buffer and not os.path.exists(tab.path):
+                self.session.remove_tab(tab.path)
+                continue
+            document = self.documents[tab.path] = Document(tab.path)
+            document.cursor, document.yview, document.xview = tab.cursor, tab.yview, tab.xview
+            view = (tab.cursor, tab.yview, tab.xview)
+            if tab.has_buffer:
+                self._restored_buffers.add(tab.path)
+            self._session_saved[tab.path] = (view, tab.has_buffer)
+            self.open_file(tab.path, background=True)
+        if active in self.documents:
+            self.tab_view.set(active)
+
+    def schedule_session_save(self):
+        """Save the session shortly, once edits and tab switches settle"""
+        if self._session_job is not None:
+            return
+        self._session_job = self.after(1000, self.save_session)
+
+    def save_session(self):
+        """Queue the active tab, views and unsaved buffers that changed since the last save"""
+        self._session_job = None
+        edited, self._edited = self._edited, set()
+        # Edited editors are measured once here, not on every tab switch
+        for path in edited:
+            self.tab_view.update_usage(path)
+        if self.session is None:
+            return
+        active = self.tab_view.get()
+        if active in self.documents and active != self._session_active:
+            self.session.set_active(active)
+            self._session_active = active
+            
+        for path, document in self.documents.items():
+            editor = self.tab_view.content(path)
+            live = editor is not None and editor.document is document
+            if live:
+                text = editor.text
+                view = (text.index('insert'), text.yview()[0], text.xview()[0])
+            else:
+                # Hibernated or not shown yet, the document holds the state
+                view = (document.cursor, document.yview, document.xview)
+                
+            saved_view, saved_buffer = self._session_saved.get(path, (None, False))
+            if view != saved_view:
+                self.session.set_view(path, *view)
+            # Only the text of edited tabs is read; the others have not changed
+            if path in edited:
+                if live:
+                    data = None
+                    if text.edit_modified():
+                        data = zlib.compress(text.get('1.0', 'end-1c').encode('utf-8', 'surrogatepass'), 1)
+                else:
+                    # Hibernated since the edit
+                    data = document.compressed if document.modified else None
+                if data is not None or saved_buffer:
+                    self.session.set_buffer(path, data)
+                saved_buffer = data is not None
+            self._session_saved[path] = (view, saved_buffer)
+
+    def document_modified(self, document):
+        """Pin a previewed document once it is edited and mark its tab"""
+        self.tab_view.pin(document.path)
+        self.tab_view.set_modified(document.path, True)
+
+    def get_workspace_path(self):
+        """Return the folder currently shown in the file explorer"""
+        if self.explorer is not None and self.explorer.current_path:
+            return self.explorer.current_path
+        return os.getcwd()
+
+    def get_ignore_matcher(self, root):
+        """Return the .gitignore matcher for `root`, reusing its compiled rules"""
+        root = os.path.abspath(root)
+        if self.ignore_matcher is None or self.ignore_matcher.root != root:
+            self.ignore_matcher = IgnoreMatcher(root, self.file_excludes)
+        return self.ignore_matcher
+
+    def get_path_index(self):
+        """Return the Quick Open index for the workspace, crawling it if needed"""
+        workspace = os.path.abspath(self.get_workspace_path())
+        if self.path_index is None or self.path_index.root != workspace:
+            if self.path_index is not None:
+                self.path_index.cancel()
+            self.path_index = PathIndex(workspace, self.get_ignore_matcher(workspace)).start()
+        return self.path_index
+
+    def invalidate_path_index(self):
+        """Forget the Quick Open index, e.g. after files were created or deleted"""
+        if self.path_index is not None:
+            self.path_index.cancel()
+            self.path_index = None
+
+    def show_quick_open(self):
+        """Show the Quick Open file finder"""
+        try:
+            QuickOpen(self, self.get_path_index())
+        except Exception as e:
+            logger.error(f"Failed to show Quick Open: {str(e)}")
+            self.show_error_notification(f"Failed to show Quick Open: {str(e)}")
+
     def toggle_todo(self):
         """Toggle the TODO list tab"""
         if "TODO" in self.tab_view._tab_dict:
@@ -1259,7 +1579,8 @@ class MinuxApp(ctk.CTk):
                 frame,
                 self.show_error_notification,
                 DB_PATH,
-                selected_task=selected_task
+                selected_task=selected_task,
+                sync=self.todo_sync
             )
             todo_widget.pack(fill="both", expand=True)
             
@@ -1270,15 +1591,15 @@ class MinuxApp(ctk.CTk):
     def show_todo_content(self):
         """Show TODO content in the sidebar"""
         # Clear existing content
-        for widget in self.sidebar.winfo_children():
-            widget.destroy()
+        self.clear_sidebar()
             
         try:
             # Create TODO widget in sidebar
             todo_widget = TodoWidget(
                 self.sidebar,
                 self.show_error_notification,
-                DB_PATH
+                DB_PATH,
+                sync=self.todo_sync
             )
             todo_widget.pack(fill="both", expand=True)
             
@@ -1577,7 +1898,7 @@ class MinuxApp(ctk.CTk):
             welcome_frame.grid_rowconfigure(0, weight=1)
             
             # Create welcome screen
-            welcome_screen = WelcomeScreen(welcome_frame, self.handle_welcome_action)
+            welcome_screen = WelcomeScreen(welcome_frame, self.handle_welcome_action, sync=self.todo_sync)
             welcome_screen.pack(fill="both", expand=True, padx=0, pady=0)
             
             # Switch to Welcome tab
@@ -1641,53 +1962,57 @@ class MinuxApp(ctk.CTk):
         )
         label.pack()
 
+# Configure user settings
+CONFIG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'configs', 'minux.ini')
+
+def load_file_excludes():
+    """Read the user's file exclude patterns (gitignore syntax) from minux.ini"""
+    config = configparser.ConfigParser()
+    try:
+        config.read(CONFIG_PATH)
+    except configparser.Error as e:
+        logger.error(f"Failed to read {CONFIG_PATH}: {str(e)}")
+        return list(DEFAULT_EXCLUDES)
+    if not config.has_option('files', 'exclude'):
+        return list(DEFAULT_EXCLUDES)
+    return [line.strip() for line in config.get('files', 'exclude').splitlines() if line.strip()]
+
+def load_tab_limits():
+    """Read how many editors stay alive and their memory budget from minux.ini"""
+    config = configparser.ConfigParser()
+    try:
+        config.read(CONFIG_PATH)
+        max_live_tabs = config.getint('editor', 'max_live_tabs', fallback=12)
+        memory_budget = config.getint('editor', 'memory_budget_mb', fallback=64) * 1024 * 1024
+    except (configparser.Error, ValueError) as e:
+        logger.error(f"Failed to read editor limits from {CONFIG_PATH}: {str(e)}")
+        return 12, 64 * 1024 * 1024
+    return max(1, max_live_tabs), memory_budget
+
 # Configure database
 DB_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'minux.db')
 
+# Seconds to wait on exit for queued database writes
+DB_SHUTDOWN_TIMEOUT = 5
+
+# Configure image preview cache
+THUMBNAIL_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cache', 'thumbnails')
+
+# Configure the store of open tabs restored on startup
+SESSION_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cache', 'session.db')
+
+# Configure explorer snapshot restored on startup
+EXPLORER_STATE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cache', 'explorer_state.json')
+
 def init_database():
-    """Initialize SQLite database and create necessary tables"""
+    """Bring minux.db up to the current schema version"""
     try:
-        logger.info(f"Initializing database at {DB_PATH}")
-        logger.debug(f"Current working directory: {os.getcwd()}")
-        
-        # Create database directory if it doesn't exist
-        db_dir = os.path.dirname(DB_PATH)
-        if not os.path.exists(db_dir):
-            os.makedirs(db_dir)
-            logger.info(f"Created database directory: {db_dir}")
-        
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
-        
-        # Create todos table if it doesn't exist
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS todos (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                task TEXT NOT NULL,
-                done BOOLEAN DEFAULT 0,
-                created_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                completed_date TIMESTAMP,
-                synced BOOLEAN DEFAULT 0
-            )
-        ''')
-        
-        conn.commit()
-        conn.close()
-        
-        # Verify the database was created
-        if os.path.exists(DB_PATH):
-            logger.info(f"Database initialized successfully at {DB_PATH}")
-            logger.info(f"Database file size: {os.path.getsize(DB_PATH)} bytes")
-        else:
-            logger.error(f"Database file was not created at {DB_PATH}")
-            
+        version = migrate(get_database(DB_PATH).connection())
+        logger.debug(f"Database at {DB_PATH} was at schema version {version}")
     except Exception as e:
         logger.error(f"Failed to initialize database: {str(e)}")
         logger.error(f"Stack trace: ", exc_info=True)
 
-# Initialize database
-init_database()
-
 if __name__ == "__main__":
     try:
         app = MinuxApp()
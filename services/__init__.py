@@ -0,0 +1,36 @@
+from .path_index import PathIndex, FuzzyMatcher
+from .thumbnails import ThumbnailCache, ThumbnailLoader, ThumbnailJob
+from .file_stats import FileStat, StatCache, StatWorker
+from .folder_sizes import FolderSizes, FolderSizeJob
+from .file_ops import FileOperation, FileOperationQueue
+from .documents import Document
+from .session import SessionStore, SessionTab
+from .database import Database, get_database
+from .todo_sync import SyncEngine, FirestoreTransport, FakeFirestore
+from .todo_model import TaskModel
+from .todo_pages import TaskSummary
+
+__all__ = [
+    'PathIndex',
+    'FuzzyMatcher',
+    'ThumbnailCache',
+    'ThumbnailLoader',
+    'ThumbnailJob',
+    'FileStat',
+    'StatCache',
+    'StatWorker',
+    'FolderSizes',
+    'FolderSizeJob',
+    'FileOperation',
+    'FileOperationQueue',
+    'Document',
+    'SessionStore',
+    'SessionTab',
+    'Database',
+    'get_database',
+    'SyncEngine',
+    'FirestoreTransport',
+    'FakeFirestore',
+    'TaskModel',
+    'TaskSummary'
+]
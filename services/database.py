@@ -0,0 +1,138 @@
+import os
+import queue
+import sqlite3
+import logging
+import threading
+from concurrent.futures import Future
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+# Statements kept prepared per connection; the app uses a few dozen
+CACHED_STATEMENTS = 256
+
+# Bytes of the database file read through a memory map
+MMAP_SIZE = 256 * 1024 * 1024
+
+class Database:
+    """Shared access to one SQLite database file.
+
+    Each thread gets one long-lived connection, opened on first use with
+    WAL journaling, synchronous=NORMAL and a memory map, so an operation
+    costs a statement lookup in the connection's prepared statement cache
+    instead of a connect. Connections are in autocommit mode: a single
+    statement commits on its own, `transaction()` groups several.
+
+    `submit()` runs work on a dedicated worker thread instead, one
+    request at a time in submission order, so UI code never waits on a
+    locked or slow database file.
+    """
+
+    def __init__(self, path, mmap_size=MMAP_SIZE):
+        self.path = path
+        self.mmap_size = mmap_size
+        self._local = threading.local()
+        self._generation = 0  # Bumped by close(); older connections are closed on next use
+        self._lock = threading.Lock()
+        self._requests = queue.Queue()
+        self._thread = None
+
+    def connection(self):
+        """Return the calling thread's connection, opening it on first use"""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None and self._local.generation != self._generation:
+            # close() ran on another thread since; only this one may close it
+            self._close_local()
+            conn = None
+        if conn is None:
+            conn = sqlite3.connect(self.path, isolation_level=None, cached_statements=CACHED_STATEMENTS)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(f"PRAGMA mmap_size={int(self.mmap_size)}")
+            conn.execute("PRAGMA temp_store=MEMORY")
+            self._local.conn = conn
+            self._local.generation = self._generation
+            logger.debug(f"Opened {self.path} for thread {threading.current_thread().name}")
+        return conn
+
+    def execute(self, sql, params=()):
+        return self.connection().execute(sql, params)
+
+    def executemany(self, sql, seq_of_params):
+        return self.connection().executemany(sql, seq_of_params)
+
+    def fetchall(self, sql, params=()):
+        return self.connection().execute(sql, params).fetchall()
+
+    def fetchone(self, sql, params=()):
+        return self.connection().execute(sql, params).fetchone()
+
+    @contextmanager
+    def transaction(self):
+        """Run the statements of a with block in one transaction"""
+        conn = self.connection()
+        conn.execute("BEGIN")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def submit(self, fn, *args):
+        """Run fn(database, *args) on the worker thread and return a Future for its result"""
+        future = Future()
+        self._requests.put((future, fn, args))
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._work, name="Database", daemon=True)
+                self._thread.start()
+        return future
+
+    def _work(self):
+        while True:
+            future, fn, args = self._requests.get()
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(fn(self, *args))
+            except BaseException as e:
+                logger.error(f"Database request failed: {e}")
+                future.set_exception(e)
+
+    def close(self):
+        """Close the calling thread's connection and the worker's.
+
+        A connection may only be closed by the thread that opened it, so
+        the worker closes its own once the requests queued before this
+        call have run. Other threads close theirs on their next use, or
+        drop it when they exit. Every thread reconnects on its next use.
+        """
+        with self._lock:
+            self._generation += 1
+            worker = self._thread
+        if worker is not None and worker is not threading.current_thread():
+            self.submit(lambda db: db._close_local()).result()
+        self._close_local()
+
+    def _close_local(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            return
+        self._local.conn = None
+        try:
+            conn.close()
+        except sqlite3.Error as e:
+            logger.debug(f"Failed to close connection to {self.path}: {e}")
+
+_databases = {}
+_databases_lock = threading.Lock()
+
+def get_database(path):
+    """Return the shared Database for the file at `path`"""
+    path = os.path.abspath(path)
+    with _databases_lock:
+        database = _databases.get(path)
+        if database is None:
+            database = _databases[path] = Database(path)
+        return database
@@ -0,0 +1,55 @@
+import zlib
+
+class Document:
+    """An open file's text and view state, kept apart from its editor widget.
+
+    While an editor shows the document the widget holds the text. When
+    the editor is hibernated, the text is stored here zlib compressed,
+    together with the cursor and scroll position to restore.
+    """
+
+    __slots__ = ("path", "cursor", "yview", "xview", "modified", "size", "_compressed")
+
+    def __init__(self, path):
+        self.path = path
+        self.cursor = "1.0"
+        self.yview = 0.0
+        self.xview = 0.0
+        self.modified = False
+        self.size = 0  # Characters of the stored text
+        self._compressed = None
+
+    @property
+    def hibernated(self):
+        """True while the text lives here instead of in an editor"""
+        return self._compressed is not None
+
+    def store(self, text, cursor, yview, xview, modified):
+        """Keep the text and view state of an editor that is going away"""
+        self._compressed = zlib.compress(text.encode("utf-8", "surrogatepass"), 1)
+        self.size = len(text)
+        self.cursor = cursor
+        self.yview = yview
+        self.xview = xview
+        self.modified = modified
+
+    def store_compressed(self, compressed, modified=True):
+        """Hold text compressed by `store()` elsewhere, e.g. a restored unsaved buffer"""
+        self._compressed = compressed
+        self.size = 0  # Unknown until the text is taken
+        self.modified = modified
+
+    @property
+    def compressed(self):
+        """The stored text as zlib compressed UTF-8, or None"""
+        return self._compressed
+
+    def take_text(self):
+        """Return the stored text and release it, for an editor taking over"""
+        text = zlib.decompress(self._compressed).decode("utf-8", "surrogatepass")
+        self._compressed = None
+        return text
+
+    @property
+    def stored_bytes(self):
+        return len(self._compressed) if self._compressed is not None else 0
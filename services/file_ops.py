@@ -0,0 +1,313 @@
+import os
+import stat
+import queue
+import shutil
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+# Bytes copied between progress updates and cancel checks
+CHUNK_SIZE = 8 * 1024 * 1024
+
+class OperationCancelled(Exception):
+    pass
+
+class FileOperation:
+    """One queued batch of file operations.
+
+    `kind` is "create_file", "create_folder", "copy", "move" or "delete";
+    a batch covers every selected source. Progress fields are written by
+    the worker thread and read from the Tk thread; `done` is set when the
+    batch has finished, failed or been cancelled.
+    """
+
+    def __init__(self, kind, sources, target=None):
+        self.kind = kind
+        self.sources = [os.path.abspath(p) for p in sources]
+        self.target = os.path.abspath(target) if target else None
+        self.total_bytes = 0
+        self.done_bytes = 0
+        self.current = None  # Path being processed
+        self.created = []  # Paths written by the operation
+        self.error = None
+        self.done = threading.Event()
+        self._cancelled = threading.Event()
+
+    @property
+    def cancelled(self):
+        return self._cancelled.is_set()
+
+    def cancel(self):
+        self._cancelled.set()
+
+    @property
+    def progress(self):
+        """Fraction of the work done, 0..1"""
+        if self.total_bytes <= 0:
+            return 1.0 if self.done.is_set() else 0.0
+        return min(1.0, self.done_bytes / self.total_bytes)
+
+    def affected_directories(self):
+        """Return the folders whose listing the operation changes"""
+        folders = {os.path.dirname(p) for p in self.sources}
+        if self.target and self.kind in ("copy", "move"):
+            folders.add(self.target)
+        elif self.target:
+            folders.add(os.path.dirname(self.target))
+        return folders
+
+    def _check(self):
+        if self._cancelled.is_set():
+            raise OperationCancelled()
+
+    def _advance(self, size):
+        self.done_bytes += size
+        self._check()
+
+def unique_destination(folder, name):
+    """Return a path in `folder` for `name` that does not exist yet, like 'a copy.txt'"""
+    candidate = os.path.join(folder, name)
+    if not os.path.lexists(candidate):
+        return candidate
+    stem, ext = os.path.splitext(name)
+    if os.path.isdir(candidate):
+        stem, ext = name, ""
+    index = 1
+    while True:
+        suffix = " copy" if index == 1 else f" copy {index}"
+        candidate = os.path.join(folder, f"{stem}{suffix}{ext}")
+        if not os.path.lexists(candidate):
+            return candidate
+        index += 1
+
+def tree_size(path):
+    """Return the bytes of the files in `path`, not following links"""
+    try:
+        st = os.lstat(path)
+    except OSError:
+        return 0
+    if not stat.S_ISDIR(st.st_mode):
+        return st.st_size
+    total = 0
+    pending = [path]
+    while pending:
+        try:
+            with os.scandir(pending.pop()) as it:
+                for entry in it:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            pending.append(entry.path)
+                        else:
+                            total += entry.stat(follow_symlinks=False).st_size
+                    except OSError:
+                        continue
+        except OSError:
+            continue
+    return total
+
+def _copy_data(src_fd, dst_fd, op):
+    """Copy file contents in chunks, in the kernel where possible"""
+    copied = 0
+    # copy_file_range can reflink/offload on the same filesystem, sendfile
+    # still avoids user space copies elsewhere on Linux
+    for kernel_copy in (getattr(os, "copy_file_range", None), getattr(os, "sendfile", None)):
+        if kernel_copy is None:
+            continue
+        try:
+            while True:
+                if kernel_copy is os.sendfile:
+                    sent = os.sendfile(dst_fd, src_fd, copied, CHUNK_SIZE)
+                else:
+                    sent = os.copy_file_range(src_fd, dst_fd, CHUNK_SIZE)
+                if sent == 0:
+                    return
+                copied += sent
+                op._advance(sent)
+        except OSError as e:
+            # Unsupported between these files; fall back unless data was written
+            if copied:
+                raise
+            logger.debug(f"{kernel_copy.__name__} not usable, falling back: {e}")
+
+    while True:
+        chunk = os.read(src_fd, CHUNK_SIZE)
+        if not chunk:
+            return
+        view = memoryview(chunk)
+        while view:
+            written = os.write(dst_fd, view)
+            view = view[written:]
+        op._advance(len(chunk))
+
+def copy_file(src, dst, op):
+    """Copy one file with its permissions and times"""
+    op.current = src
+    src_fd = os.open(src, os.O_RDONLY | getattr(os, "O_BINARY", 0))
+    try:
+        dst_fd = os.open(dst, os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0), 0o666)
+        try:
+            _copy_data(src_fd, dst_fd, op)
+        except BaseException:
+            os.close(dst_fd)
+            dst_fd = None
+            os.remove(dst)
+            raise
+        finally:
+            if dst_fd is not None:
+                os.close(dst_fd)
+    finally:
+        os.close(src_fd)
+    shutil.copystat(src, dst)
+
+def copy_tree(src, dst, op):
+    """Copy a file, link or folder tree to `dst`"""
+    if os.path.islink(src):
+        os.symlink(os.readlink(src), dst)
+        op._advance(os.lstat(src).st_size)
+        return
+    if not os.path.isdir(src):
+        copy_file(src, dst, op)
+        return
+    os.mkdir(dst)
+    with os.scandir(src) as it:
+        entries = list(it)
+    for entry in entries:
+        op._check()
+        copy_tree(entry.path, os.path.join(dst, entry.name), op)
+    shutil.copystat(src, dst)
+
+def delete_tree(path, op):
+    """Delete a file, link or folder tree"""
+    op.current = path
+    if os.path.isdir(path) and not os.path.islink(path):
+        with os.scandir(path) as it:
+            entries = list(it)
+        for entry in entries:
+            op._check()
+            delete_tree(entry.path, op)
+        os.rmdir(path)
+    else:
+        size = os.lstat(path).st_size
+        os.remove(path)
+        op._advance(size)
+
+class FileOperationQueue:
+    """Runs file operations one batch at a time on a worker thread.
+
+    Finished operations (done, failed or cancelled) are collected from
+    the Tk thread with `finished()`; running ones can be polled for
+    progress through their FileOperation.
+    """
+
+    def __init__(self):
+        self._pending = queue.Queue()
+        self._finished = queue.Queue()
+        self._thread = None
+        self.active = []  # Submitted operations that have not finished
+
+    def submit(self, op):
+        self.active.append(op)
+        self._pending.put(op)
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._work, name="FileOperations", daemon=True)
+            self._thread.start()
+        return op
+
+    def finished(self):
+        """Return the operations that finished since the last call"""
+        ops = []
+        while True:
+            try:
+                op = self._finished.get_nowait()
+            except queue.Empty:
+                return ops
+            if op in self.active:
+                self.active.remove(op)
+            ops.append(op)
+
+    def _work(self):
+        while True:
+            op = self._pending.get()
+            try:
+                op._check()
+                getattr(self, f"_run_{op.kind}")(op)
+            except OperationCancelled:
+                pass
+            except Exception as e:
+                logger.error(f"File operation {op.kind} failed: {e}")
+                op.error = e
+            op.done.set()
+            self._finished.put(op)
+
+    def _run_create_file(self, op):
+        # O_EXCL so an existing file is never truncated
+        os.close(os.open(op.target, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666))
+        op.created.append(op.target)
+
+    def _run_create_folder(self, op):
+        os.mkdir(op.target)
+        op.created.append(op.target)
+
+    def _run_copy(self, op):
+        for src in op.sources:
+            if (op.target + os.sep).startswith(src.rstrip(os.sep) + os.sep):
+                # The copy would land in the tree being copied and never end
+                raise ValueError(f"Cannot copy {src} into itself")
+        op.total_bytes = sum(tree_size(src) for src in op.sources)
+        for src in op.sources:
+            dst = unique_destination(op.target, os.path.basename(src))
+            op.created.append(dst)
+            try:
+                copy_tree(src, dst, op)
+            except BaseException:
+                # Leave no half copied tree behind, cancelled or failed
+                self._discard(dst)
+                raise
+
+    def _run_move(self, op):
+        target_dev = os.stat(op.target).st_dev
+        cross_device = []
+        for src in op.sources:
+            op._check()
+            dst = os.path.join(op.target, os.path.basename(src))
+            if src == dst:
+                continue
+            if (op.target + os.sep).startswith(src.rstrip(os.sep) + os.sep):
+                raise ValueError(f"Cannot move {src} into itself")
+            if os.path.lexists(dst):
+                raise FileExistsError(f"{dst} already exists")
+            if os.lstat(src).st_dev == target_dev:
+                # Same filesystem, a rename is instant whatever the size
+                op.current = src
+                os.rename(src, dst)
+                op.created.append(dst)
+            else:
+                cross_device.append((src, dst))
+
+        if not cross_device:
+            return
+        op.total_bytes = sum(tree_size(src) for src, _ in cross_device) * 2
+        for src, dst in cross_device:
+            op.created.append(dst)
+            try:
+                copy_tree(src, dst, op)
+            except BaseException:
+                self._discard(dst)
+                raise
+            delete_tree(src, op)
+
+    def _run_delete(self, op):
+        op.total_bytes = sum(tree_size(src) for src in op.sources)
+        for src in op.sources:
+            delete_tree(src, op)
+
+    @staticmethod
+    def _discard(path):
+        try:
+            if os.path.isdir(path) and not os.path.islink(path):
+                shutil.rmtree(path)
+            elif os.path.lexists(path):
+                os.remove(path)
+        except OSError as e:
+            logger.error(f"Failed to clean up {path}: {e}")
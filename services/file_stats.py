@@ -0,0 +1,180 @@
+import os
+import queue
+import logging
+import subprocess
+import threading
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+FileStat = namedtuple("FileStat", ("ino", "mtime_ns", "size"))
+
+# Letters shown for `git status --porcelain` codes, most important first
+_GIT_LETTERS = (
+    ("U", "!"),  # Unmerged
+    ("D", "D"),
+    ("A", "A"),
+    ("R", "R"),
+    ("M", "M"),
+    ("?", "U"),  # Untracked
+)
+
+def format_size(size):
+    """Return a short human readable size, e.g. '12.3 KB'"""
+    for unit in ("B", "KB", "MB", "GB"):
+        if size < 1024 or unit == "GB":
+            return f"{size} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} TB"
+
+class StatCache:
+    """Thread safe {path: FileStat} cache.
+
+    Entries remember the inode and mtime they were read with, so stating
+    an unchanged file again is recognised and callers can skip redrawing.
+    """
+
+    def __init__(self):
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    def get(self, path):
+        return self._stats.get(path)
+
+    def put(self, path, st):
+        """Store a FileStat, returning True if it differs from the cached one"""
+        with self._lock:
+            old = self._stats.get(path)
+            self._stats[path] = st
+        return old != st
+
+    def invalidate(self, path=None):
+        """Drop cached stats for `path` and below, or everything"""
+        with self._lock:
+            if path is None:
+                self._stats.clear()
+                return
+            prefix = path.rstrip(os.sep) + os.sep
+            for cached in [p for p in self._stats if p == path or p.startswith(prefix)]:
+                del self._stats[cached]
+
+def read_git_status(root):
+    """Return {absolute path: status letter} for changed files below `root`.
+
+    Directories containing changes are included with a "•". An empty
+    dict is returned outside git repositories or without git installed.
+    """
+    try:
+        output = subprocess.run(
+            ["git", "-C", root, "status", "--porcelain=v1", "-z", "--untracked-files=all"],
+            capture_output=True, timeout=30, check=True
+        ).stdout
+        top = subprocess.run(
+            ["git", "-C", root, "rev-parse", "--show-toplevel"],
+            capture_output=True, text=True, timeout=30, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.SubprocessError) as e:
+        logger.debug(f"No git status for {root}: {e}")
+        return {}
+
+    status = {}
+    records = output.decode("utf-8", "surrogateescape").split("\0")
+    i = 0
+    while i < len(records):
+        record = records[i]
+        i += 1
+        if len(record) < 4:
+            continue
+        code, rel = record[:2], record[3:]
+        if "R" in code or "C" in code:
+            i += 1  # Skip the original path of renames and copies
+        letter = next((shown for key, shown in _GIT_LETTERS if key in code), "M")
+        path = os.path.normpath(os.path.join(top, rel))
+        status[path] = letter
+
+        # Mark the parent folders up to the repository root
+        parent = os.path.dirname(path)
+        while len(parent) >= len(top) and parent not in status:
+            status[parent] = "•"
+            parent = os.path.dirname(parent)
+    return status
+
+class StatWorker:
+    """Stats files on a small thread pool.
+
+    `request()` stats individual paths (the rows on screen) and
+    `prefetch()` a whole directory in one scandir pass (for sorting);
+    both fill the shared StatCache. Changed stats are reported as
+    (path, FileStat or None) pairs, collected from the Tk thread with
+    `results()`.
+    """
+
+    def __init__(self, cache=None, max_workers=2, batch_size=64):
+        self.cache = cache or StatCache()
+        self.batch_size = batch_size
+        self._queue = queue.Queue()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="Stat")
+
+    def request(self, paths):
+        """Stat `paths` in the background and return the Futures of the batches"""
+        paths = list(paths)
+        return [
+            self._executor.submit(self._stat_paths, paths[start:start + self.batch_size])
+            for start in range(0, len(paths), self.batch_size)
+        ]
+
+    def prefetch(self, dir_path, names):
+        """Stat the entries `names` of `dir_path` missing from the cache.
+
+        Returns a Future that completes once they are all cached.
+        """
+        return self._executor.submit(self._stat_directory, dir_path, set(names))
+
+    def git_status(self, root):
+        """Return a Future for read_git_status(root)"""
+        return self._executor.submit(read_git_status, root)
+
+    def results(self):
+        """Return the (path, FileStat or None) pairs that are ready"""
+        ready = []
+        while True:
+            try:
+                ready.append(self._queue.get_nowait())
+            except queue.Empty:
+                return ready
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _stat_paths(self, paths):
+        for path in paths:
+            try:
+                st = os.stat(path)
+                stat = FileStat(st.st_ino, st.st_mtime_ns, st.st_size)
+            except OSError:
+                stat = None
+            if stat is None:
+                self.cache.invalidate(path)
+                self._queue.put((path, None))
+            elif self.cache.put(path, stat):
+                self._queue.put((path, stat))
+
+    def _stat_directory(self, dir_path, names):
+        missing = {name for name in names if self.cache.get(os.path.join(dir_path, name)) is None}
+        if not missing:
+            return
+        try:
+            with os.scandir(dir_path) as it:
+                for entry in it:
+                    if entry.name not in missing:
+                        continue
+                    try:
+                        st = entry.stat()
+                    except OSError:
+                        continue
+                    stat = FileStat(st.st_ino, st.st_mtime_ns, st.st_size)
+                    if self.cache.put(entry.path, stat):
+                        self._queue.put((entry.path, stat))
+        except OSError as e:
+            logger.debug(f"Failed to stat entries of {dir_path}: {e}")
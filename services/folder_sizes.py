@@ -0,0 +1,136 @@
+import os
+import queue
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+class FolderSizeJob:
+    """Handle for one folder size computation.
+
+    `totals` maps each folder below the root to the bytes found under it
+    so far; it grows while worker threads walk the tree, so readers get
+    partial totals. `done` is set when the walk is complete.
+    """
+
+    def __init__(self, root):
+        self.root = root
+        self.totals = {}
+        self.done = threading.Event()
+        self.cancelled = False
+        self.folder_count = 0
+        self._pending = 1  # Folders queued but not visited yet
+        self._lock = threading.Lock()
+
+    def cancel(self):
+        self.cancelled = True
+
+    def total(self, path):
+        """Return the bytes found under `path` so far, or None"""
+        return self.totals.get(path)
+
+    def _add(self, path, size):
+        """Add the bytes of the files directly in `path` to it and its parents"""
+        with self._lock:
+            self.folder_count += 1
+            while True:
+                self.totals[path] = self.totals.get(path, 0) + size
+                if path == self.root:
+                    break
+                parent = os.path.dirname(path)
+                if parent == path:
+                    break
+                path = parent
+
+class FolderSizes:
+    """Recursive folder sizes computed by a parallel scandir walk.
+
+    Each folder's own bytes and subfolders are cached with the folder's
+    mtime. A rerun stats every folder but only lists the ones whose mtime
+    changed or that were invalidated; the files of the others are not
+    touched. A file rewritten in place leaves its folder's mtime alone,
+    so its new size shows once the folder changes or is invalidated.
+    """
+
+    def __init__(self, max_workers=4):
+        self.max_workers = max_workers
+        self._cache = {}  # {folder: (mtime_ns, own bytes, subfolders)}
+        self._lock = threading.Lock()
+
+    def compute(self, root):
+        """Start computing the sizes below `root` and return its job"""
+        root = os.path.abspath(root)
+        job = FolderSizeJob(root)
+        pending = queue.Queue()
+        pending.put(root)
+        for index in range(self.max_workers):
+            threading.Thread(
+                target=self._work, args=(job, pending),
+                name=f"FolderSizes-{index}", daemon=True
+            ).start()
+        return job
+
+    def invalidate(self, path=None):
+        """Forget the cached listing of folder `path`, or of every folder"""
+        with self._lock:
+            if path is None:
+                self._cache.clear()
+            else:
+                self._cache.pop(os.path.abspath(path), None)
+
+    def _work(self, job, pending):
+        while True:
+            path = pending.get()
+            if path is None:
+                return
+            subfolders = ()
+            try:
+                if not job.cancelled:
+                    subfolders = self._visit(job, path)
+            except Exception as e:
+                logger.error(f"Failed to size folder {path}: {e}")
+            with job._lock:
+                job._pending += len(subfolders) - 1
+                finished = job._pending == 0
+            for subfolder in subfolders:
+                pending.put(subfolder)
+            if finished:
+                job.done.set()
+                # Wake every worker so they all exit
+                for _ in range(self.max_workers):
+                    pending.put(None)
+
+    def _visit(self, job, path):
+        """Add the own bytes of `path` to the job and return its subfolders"""
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            return ()
+
+        with self._lock:
+            cached = self._cache.get(path)
+        if cached is not None and cached[0] == mtime:
+            _, size, subfolders = cached
+        else:
+            size = 0
+            subfolders = []
+            try:
+                with os.scandir(path) as it:
+                    for entry in it:
+                        try:
+                            # Symlinked folders are counted as links, not followed
+                            if entry.is_dir(follow_symlinks=False):
+                                subfolders.append(entry.path)
+                            else:
+                                size += entry.stat(follow_symlinks=False).st_size
+                        except OSError:
+                            continue
+            except OSError as e:
+                logger.debug(f"Skipping unreadable folder {path}: {e}")
+                return ()
+            subfolders = tuple(subfolders)
+            with self._lock:
+                self._cache[path] = (mtime, size, subfolders)
+
+        job._add(path, size)
+        return subfolders
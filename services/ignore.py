@@ -0,0 +1,258 @@
+import os
+import re
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Never listed or crawled, whatever the ignore files say
+ALWAYS_EXCLUDED = (".git/",)
+
+# User excludes when none are configured: hidden files, as the explorer always did
+DEFAULT_EXCLUDES = (".*",)
+
+_GLOB_CHARS = re.compile(r"[*?\[\\]")
+
+def _translate_segment(segment):
+    """Translate one path segment of a gitignore glob to a regex"""
+    out = []
+    i, n = 0, len(segment)
+    while i < n:
+        c = segment[i]
+        i += 1
+        if c == "*":
+            out.append("[^/]*")
+        elif c == "?":
+            out.append("[^/]")
+        elif c == "\\" and i < n:
+            out.append(re.escape(segment[i]))
+            i += 1
+        elif c == "[":
+            j = i
+            if j < n and segment[j] in "!^":
+                j += 1
+            if j < n and segment[j] == "]":
+                j += 1
+            j = segment.find("]", j)
+            if j < 0:
+                out.append(re.escape(c))
+                continue
+            body = segment[i:j].replace("\\", "\\\\")
+            if body[:1] in ("!", "^"):
+                body = "^" + body[1:]
+            out.append(f"[{body}]")
+            i = j + 1
+        else:
+            out.append(re.escape(c))
+    return "".join(out)
+
+def translate(pattern):
+    """Translate a gitignore pattern body (no '!', no trailing '/') to a regex"""
+    segments = pattern.split("/")
+    if segments == ["**"]:
+        return ".*"
+    out = []
+    last = len(segments) - 1
+    for index, segment in enumerate(segments):
+        if segment == "**":
+            if index == 0:
+                out.append("(?:.*/)?")
+            elif index == last:
+                out.append("/.*")
+            else:
+                out.append("/(?:.*/)?")
+        else:
+            if index > 0 and segments[index - 1] != "**":
+                out.append("/")
+            out.append(_translate_segment(segment))
+    return "".join(out)
+
+class IgnoreRule:
+    """A single parsed gitignore line"""
+
+    __slots__ = ("pattern", "base", "negated", "dir_only", "literal", "regex")
+
+    def __init__(self, pattern, base=""):
+        self.pattern = pattern
+        self.base = base  # Workspace relative directory the rule applies to
+
+        line = pattern
+        self.negated = line.startswith("!")
+        if self.negated:
+            line = line[1:]
+        self.dir_only = line.endswith("/")
+        line = line.rstrip("/")
+
+        # A slash anywhere but the end anchors the pattern to its base
+        anchored = "/" in line
+        line = line.lstrip("/")
+
+        # Plain names like node_modules are looked up in a dict instead
+        self.literal = None
+        if not anchored and not _GLOB_CHARS.search(line):
+            self.literal = line
+
+        prefix = re.escape(base + "/") if base else ""
+        if anchored:
+            self.regex = prefix + translate(line)
+        else:
+            self.regex = prefix + "(?:.*/)?" + translate(line)
+
+def parse_ignore_lines(lines, base=""):
+    """Parse the lines of a gitignore style file into rules"""
+    rules = []
+    for line in lines:
+        line = line.rstrip("\n\r")
+        # Trailing spaces are ignored unless escaped
+        stripped = line.rstrip(" ")
+        if stripped.endswith("\\") and len(stripped) < len(line):
+            stripped += " "
+        line = stripped
+        if not line or line.startswith("#"):
+            continue
+        # A leading "\#" or "\!" stays escaped and is matched literally
+        rules.append(IgnoreRule(line, base))
+    return rules
+
+def read_ignore_file(path, base=""):
+    """Read a gitignore style file, returning [] if it does not exist"""
+    try:
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            return parse_ignore_lines(f, base)
+    except OSError:
+        return []
+
+class CompiledRules:
+    """All rules that apply inside one directory, compiled for matching.
+
+    Plain names go into a dict; everything else is folded into one regex
+    per entry kind, with alternatives ordered so the first alternative to
+    match is the last rule in file order (which is the one git honours).
+    """
+
+    def __init__(self, rules):
+        self.rules = rules
+        self._literals = {}
+        file_alternatives = []
+        dir_alternatives = []
+        for index, rule in enumerate(rules):
+            if rule.literal is not None:
+                self._literals.setdefault(rule.literal, []).append((index, rule.negated, rule.dir_only))
+                continue
+            alternative = f"(?P<r{index}>{rule.regex})"
+            dir_alternatives.append(alternative)
+            if not rule.dir_only:
+                file_alternatives.append(alternative)
+        self._file_regex = self._compile(file_alternatives)
+        self._dir_regex = self._compile(dir_alternatives)
+
+    @staticmethod
+    def _compile(alternatives):
+        if not alternatives:
+            return None
+        return re.compile("|".join(reversed(alternatives)), re.DOTALL)
+
+    def match(self, rel_path, name, is_dir):
+        """Return True if the entry at workspace relative `rel_path` is ignored"""
+        best = -1
+        negated = False
+        for index, rule_negated, dir_only in self._literals.get(name, ()):
+            if index > best and (is_dir or not dir_only):
+                best, negated = index, rule_negated
+
+        regex = self._dir_regex if is_dir else self._file_regex
+        if regex is not None:
+            m = regex.fullmatch(rel_path)
+            if m:
+                index = int(m.lastgroup[1:])
+                if index > best:
+                    best, negated = index, self.rules[index].negated
+
+        return best >= 0 and not negated
+
+class IgnoreMatcher:
+    """Gitignore engine for one workspace.
+
+    Rules come from the user excludes, `.git/info/exclude` and every
+    `.gitignore` from the workspace root down, in increasing priority.
+    Compiled rules are cached per directory, and directories without
+    their own `.gitignore` share their parent's. Walkers should filter
+    each directory with `filter_entries()` before descending, so ignored
+    trees are never visited.
+    """
+
+    def __init__(self, root, excludes=()):
+        self.root = os.path.abspath(root)
+        self.excludes = tuple(excludes)
+        self._cache = {}
+
+    def _root_rules(self):
+        rules = parse_ignore_lines(ALWAYS_EXCLUDED)
+        rules += parse_ignore_lines(self.excludes)
+        rules += read_ignore_file(os.path.join(self.root, ".git", "info", "exclude"))
+        rules += read_ignore_file(os.path.join(self.root, ".gitignore"))
+        return CompiledRules(rules)
+
+    def relpath(self, path):
+        """Return `path` relative to the workspace with '/' separators"""
+        rel = os.path.relpath(path, self.root)
+        if rel == ".":
+            return ""
+        return rel.replace(os.sep, "/")
+
+    def for_directory(self, path):
+        """Return the compiled rules that apply to entries of directory `path`"""
+        path = os.path.abspath(path)
+        compiled = self._cache.get(path)
+        if compiled is not None:
+            return compiled
+
+        if path == self.root:
+            compiled = self._root_rules()
+        else:
+            parent = os.path.dirname(path)
+            if parent == path or not path.startswith(self.root.rstrip(os.sep) + os.sep):
+                # Outside the workspace only the user excludes apply
+                compiled = CompiledRules(parse_ignore_lines(ALWAYS_EXCLUDED + self.excludes))
+            else:
+                compiled = self.for_directory(parent)
+                nested = read_ignore_file(os.path.join(path, ".gitignore"), self.relpath(path))
+                if nested:
+                    compiled = CompiledRules(compiled.rules + nested)
+
+        self._cache[path] = compiled
+        return compiled
+
+    def invalidate(self, path=None):
+        """Drop cached rules for `path` and below, or everything"""
+        if path is None:
+            self._cache.clear()
+            return
+        path = os.path.abspath(path)
+        prefix = path.rstrip(os.sep) + os.sep
+        for cached in list(self._cache):
+            if cached == path or cached.startswith(prefix):
+                self._cache.pop(cached, None)
+
+    def is_ignored(self, path, is_dir=False):
+        """Return True if `path` is ignored by the rules of its directory.
+
+        Only the entry itself is checked; walkers prune ignored parents.
+        """
+        path = os.path.abspath(path)
+        rules = self.for_directory(os.path.dirname(path))
+        return rules.match(self.relpath(path), os.path.basename(path), is_dir)
+
+    def filter_entries(self, dir_path, entries):
+        """Return the os.DirEntry objects of `dir_path` that are not ignored"""
+        rules = self.for_directory(dir_path)
+        prefix = self.relpath(dir_path)
+        prefix = prefix + "/" if prefix else ""
+        kept = []
+        for entry in entries:
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                is_dir = False
+            if not rules.match(prefix + entry.name, entry.name, is_dir):
+                kept.append(entry)
+        return kept
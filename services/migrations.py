@@ -0,0 +1,184 @@
+import sqlite3
+import logging
+
+logger = logging.getLogger(__name__)
+
+_NOW_MS = "CAST((julianday('now') - 2440587.5) * 86400000 AS INTEGER)"
+
+def _add_column(conn, table, column, declaration):
+    """Add a column unless an older init already did"""
+    columns = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+    if column not in columns:
+        conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {declaration}")
+
+def _create_todos(conn):
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS todos (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            task TEXT NOT NULL,
+            done BOOLEAN DEFAULT 0,
+            created_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            completed_date TIMESTAMP,
+            synced BOOLEAN DEFAULT 0
+        )
+    ''')
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_todos_done_created ON todos (done, created_date)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_todos_created ON todos (created_date)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_todos_synced ON todos (synced) WHERE synced = 0")
+
+def _create_search_index(conn):
+    # External content table: the text lives in todos and the index only
+    # keeps which tasks contain each token. Prefix indexes answer the word
+    # being typed without merging the doclists of every word it starts;
+    # positions are not needed since snippets are built in Python
+    exists = conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'todos_fts'").fetchone()
+    try:
+        conn.execute(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS todos_fts USING fts5("
+            "task, content='todos', content_rowid='id', prefix='1 2 3 4 5 6', detail=none)"
+        )
+    except sqlite3.OperationalError as e:
+        # SQLite without FTS5; search falls back to LIKE scans
+        logger.warning(f"Task search index not available: {e}")
+        return
+    conn.execute(
+        "CREATE TRIGGER IF NOT EXISTS todos_fts_insert AFTER INSERT ON todos BEGIN "
+        "INSERT INTO todos_fts (rowid, task) VALUES (new.id, new.task); END"
+    )
+    conn.execute(
+        "CREATE TRIGGER IF NOT EXISTS todos_fts_delete AFTER DELETE ON todos BEGIN "
+        "INSERT INTO todos_fts (todos_fts, rowid, task) VALUES ('delete', old.id, old.task); END"
+    )
+    # Toggling a task does not touch the index, only edits of its text do
+    conn.execute(
+        "CREATE TRIGGER IF NOT EXISTS todos_fts_update AFTER UPDATE OF task ON todos BEGIN "
+        "INSERT INTO todos_fts (todos_fts, rowid, task) VALUES ('delete', old.id, old.task); "
+        "INSERT INTO todos_fts (rowid, task) VALUES (new.id, new.task); END"
+    )
+    if not exists:
+        conn.execute("INSERT INTO todos_fts (todos_fts) VALUES ('rebuild')")
+
+def _add_sync_schema(conn):
+    _add_column(conn, "todos", "uuid", "TEXT")
+    _add_column(conn, "todos", "updated_at", "INTEGER")  # Milliseconds
+    # Tasks gone from todos, kept so an older copy elsewhere is not brought back
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS todo_tombstones ("
+        "uuid TEXT PRIMARY KEY, deleted_at INTEGER NOT NULL, synced BOOLEAN DEFAULT 0)"
+    )
+    conn.execute("CREATE TABLE IF NOT EXISTS sync_state (key TEXT PRIMARY KEY, value)")
+    conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_todos_uuid ON todos (uuid)")
+    # New tasks get a global id and a change time
+    conn.execute(
+        "CREATE TRIGGER IF NOT EXISTS todos_sync_insert AFTER INSERT ON todos "
+        "WHEN new.uuid IS NULL OR new.updated_at IS NULL BEGIN "
+        "UPDATE todos SET uuid = COALESCE(new.uuid, lower(hex(randomblob(16)))), "
+        f"updated_at = COALESCE(new.updated_at, {_NOW_MS}) WHERE id = new.id; END"
+    )
+    # Local edits, which leave updated_at alone, are stamped and queued for
+    # pushing; changes pulled from the server set updated_at themselves
+    conn.execute(
+        "CREATE TRIGGER IF NOT EXISTS todos_sync_update AFTER UPDATE OF task, done, completed_date ON todos "
+        "WHEN new.updated_at IS old.updated_at BEGIN "
+        f"UPDATE todos SET updated_at = {_NOW_MS}, synced = 0 WHERE id = new.id; END"
+    )
+    conn.execute(
+        "CREATE TRIGGER IF NOT EXISTS todos_sync_delete AFTER DELETE ON todos "
+        "WHEN old.uuid IS NOT NULL BEGIN "
+        f"INSERT OR REPLACE INTO todo_tombstones (uuid, deleted_at, synced) VALUES (old.uuid, {_NOW_MS}, 0); END"
+    )
+    # Existing tasks predate the triggers
+    conn.execute(
+        "UPDATE todos SET uuid = COALESCE(uuid, lower(hex(randomblob(16)))), "
+        "updated_at = COALESCE(updated_at, CAST((julianday(created_date) - 2440587.5) * 86400000 AS INTEGER), "
+        f"{_NOW_MS}) WHERE uuid IS NULL OR updated_at IS NULL"
+    )
+
+def _add_task_details(conn):
+    _add_column(conn, "todos", "priority", "INTEGER NOT NULL DEFAULT 0")
+    _add_column(conn, "todos", "due_date", "DATE")
+    _add_column(conn, "todos", "tags", "TEXT NOT NULL DEFAULT ''")  # Comma separated
+    _add_column(conn, "todos", "deleted_at", "INTEGER")  # Milliseconds, NULL while live
+
+    # Deleting is now an update, which the sync engine pushes like an edit
+    conn.execute("DROP TRIGGER IF EXISTS todos_sync_update")
+    conn.execute(
+        "CREATE TRIGGER todos_sync_update AFTER UPDATE OF "
+        "task, done, completed_date, priority, due_date, tags, deleted_at ON todos "
+        "WHEN new.updated_at IS old.updated_at BEGIN "
+        f"UPDATE todos SET updated_at = {_NOW_MS}, synced = 0 WHERE id = new.id; END"
+    )
+
+    # Lists only show live tasks; the partial indexes leave deleted ones out
+    conn.execute("DROP INDEX IF EXISTS idx_todos_done_created")
+    conn.execute("DROP INDEX IF EXISTS idx_todos_created")
+    conn.execute("CREATE INDEX idx_todos_live_done ON todos (done, created_date) WHERE deleted_at IS NULL")
+    conn.execute("CREATE INDEX idx_todos_live ON todos (created_date) WHERE deleted_at IS NULL")
+    conn.execute(
+        "CREATE INDEX idx_todos_due ON todos (due_date) "
+        "WHERE deleted_at IS NULL AND done = 0 AND due_date IS NOT NULL"
+    )
+
+# (version, description, upgrade(conn)); a database at version n has had
+# the first n applied. Never edit a released entry, append a new one. The
+# upgrades spell out their SQL rather than call into the services, so a
+# released version keeps doing what it did when the services change.
+MIGRATIONS = (
+    (1, "todos table", _create_todos),
+    (2, "task search index", _create_search_index),
+    (3, "sync columns and tombstones", _add_sync_schema),
+    (4, "priority, due date, tags and soft delete", _add_task_details),
+)
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+def schema_version(conn):
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+def _ensure_search_index(conn):
+    """Create the task search index if migration 2 ran on an SQLite without FTS5.
+
+    The version moved on without the index, so it is checked on every
+    start and built from the existing tasks once FTS5 is there.
+    """
+    if conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'todos_fts'").fetchone():
+        return
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        _create_search_index(conn)
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    conn.execute("COMMIT")
+
+def migrate(conn):
+    """Upgrade the database of `conn` to LATEST_VERSION and return the version it had.
+
+    Each migration runs in its own transaction together with the bump of
+    PRAGMA user_version, so an interrupted upgrade resumes where it
+    stopped. An up to date database costs a pragma read and a look for
+    the search index, which is built late when FTS5 was missing. Databases
+    created before versioning are at version 0; the early migrations
+    tolerate the tables the old startup code already made.
+    """
+    version = schema_version(conn)
+    if version >= LATEST_VERSION:
+        if version > LATEST_VERSION:
+            logger.warning(f"Database schema version {version} is newer than this Minux ({LATEST_VERSION})")
+        _ensure_search_index(conn)
+        return version
+
+    for target, description, upgrade in MIGRATIONS[version:]:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # Another process may have upgraded while this one waited for the lock
+            if schema_version(conn) < target:
+                upgrade(conn)
+                conn.execute(f"PRAGMA user_version = {target}")
+                logger.info(f"Migrated database to version {target}: {description}")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+    _ensure_search_index(conn)
+    return version
@@ -0,0 +1,311 @@
+import os
+import re
+import heapq
+import logging
+import threading
+from array import array
+from collections import deque
+from itertools import islice
+from .ignore import IgnoreMatcher, DEFAULT_EXCLUDES
+
+logger = logging.getLogger(__name__)
+
+# Maps the 0/1 bytes of a per-character membership row to ASCII binary digits
+_BINARY_DIGITS = bytes.maketrans(b"\x00\x01", b"01")
+_ONE_BIT = re.compile("1")
+
+class PathIndex:
+    """Compact index of every file below a workspace root.
+
+    Path segments are interned once and files are stored as (directory id,
+    segment id) pairs in flat arrays, so a 500k file tree costs a few MB.
+    For matching, the index also keeps one bitset per character telling
+    which files contain it, plus the lowercased relative paths as a single
+    string. The index is built by a background crawler; `ready` is set
+    when done. Ignored directories are pruned before they are entered.
+    """
+
+    def __init__(self, root, ignore=None):
+        self.root = os.path.abspath(root)
+        self.ignore = ignore or IgnoreMatcher(self.root, DEFAULT_EXCLUDES)
+        self.ready = threading.Event()
+        self.file_count = 0
+
+        # Published by the crawler once the walk is complete
+        self._segments = []
+        self._dir_parent = array('l')
+        self._dir_name = array('l')
+        self._file_dir = array('l')
+        self._file_name = array('l')
+        self._haystack = ""
+        self._line_starts = array('q', [0])
+        self._char_bits = {}
+
+        self._cancelled = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Start crawling the workspace on a background thread"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._crawl, name="PathIndexCrawler", daemon=True)
+            self._thread.start()
+        return self
+
+    def cancel(self):
+        """Stop a running crawl"""
+        self._cancelled.set()
+
+    def _crawl(self):
+        """Walk the workspace breadth first and build the index"""
+        segments = []
+        segment_ids = {}
+
+        def intern(name):
+            segment_id = segment_ids.get(name)
+            if segment_id is None:
+                segment_id = segment_ids[name] = len(segments)
+                segments.append(name)
+            return segment_id
+
+        dir_parent = array('l', [-1])
+        dir_name = array('l', [intern("")])
+        file_dir = array('l')
+        file_name = array('l')
+
+        # Lowercased relative path of every directory, only needed while crawling
+        dir_rel = [""]
+        lines = []
+
+        # Files of one directory get consecutive ids, so the characters of
+        # the directory part are recorded once per id range
+        dir_ranges = []
+        name_chars = {}
+
+        pending = deque([(self.root, 0)])
+        while pending and not self._cancelled.is_set():
+            path, dir_id = pending.popleft()
+            prefix = dir_rel[dir_id]
+            try:
+                with os.scandir(path) as it:
+                    entries = self.ignore.filter_entries(path, it)
+            except OSError as e:
+                logger.debug(f"Skipping unreadable directory {path}: {e}")
+                continue
+
+            first_file = len(file_dir)
+            for entry in entries:
+                try:
+                    is_dir = entry.is_dir(follow_symlinks=False)
+                except OSError:
+                    continue
+                lowered = entry.name.lower()
+                if is_dir:
+                    dir_rel.append(prefix + lowered + "/")
+                    dir_parent.append(dir_id)
+                    dir_name.append(intern(entry.name))
+                    pending.append((entry.path, len(dir_parent) - 1))
+                else:
+                    file_id = len(file_dir)
+                    file_dir.append(dir_id)
+                    file_name.append(intern(entry.name))
+                    lines.append(f"{file_id:x}\x00{prefix}{lowered}")
+                    for ch in set(lowered):
+                        ids = name_chars.get(ch)
+                        if ids is None:
+                            ids = name_chars[ch] = array('l')
+                        ids.append(file_id)
+                    self.file_count = file_id + 1
+            if prefix and len(file_dir) > first_file:
+                dir_ranges.append((first_file, len(file_dir), set(prefix)))
+
+        if self._cancelled.is_set():
+            return
+
+        self._segments = segments
+        self._dir_parent = dir_parent
+        self._dir_name = dir_name
+        self._file_dir = file_dir
+        self._file_name = file_name
+        self._haystack = "\n".join(lines)
+        self._line_starts = self._build_line_starts(lines)
+        self._char_bits = self._build_char_bits(len(file_dir), name_chars, dir_ranges)
+        self.ready.set()
+        logger.debug(f"Indexed {len(file_dir)} files in {len(dir_parent)} directories under {self.root}")
+
+    @staticmethod
+    def _build_line_starts(lines):
+        starts = array('q', [0])
+        offset = 0
+        for line in lines:
+            offset += len(line) + 1
+            starts.append(offset)
+        return starts
+
+    @staticmethod
+    def _build_char_bits(count, name_chars, dir_ranges):
+        rows = {}
+        for ch, ids in name_chars.items():
+            row = rows[ch] = bytearray(count)
+            for file_id in ids:
+                row[file_id] = 1
+        for start, end, chars in dir_ranges:
+            ones = b"\x01" * (end - start)
+            for ch in chars:
+                row = rows.get(ch)
+                if row is None:
+                    row = rows[ch] = bytearray(count)
+                row[start:end] = ones
+        # Bit i of each int is set when file i contains the character
+        return {ch: int(row.translate(_BINARY_DIGITS)[::-1], 2) for ch, row in rows.items()}
+
+    @property
+    def haystack(self):
+        """Newline separated '<hex id>\\0<lowercased relative path>' lines"""
+        return self._haystack
+
+    def __len__(self):
+        return len(self._file_dir)
+
+    def char_mask(self, chars):
+        """Return a bitset of the files containing every character in `chars`"""
+        mask = (1 << len(self)) - 1
+        for ch in set(chars):
+            mask &= self._char_bits.get(ch, 0)
+            if not mask:
+                break
+        return mask
+
+    def lines(self, file_ids):
+        """Return the haystack lines for the given file ids"""
+        haystack = self._haystack
+        starts = self._line_starts
+        return [haystack[starts[i]:starts[i + 1] - 1] for i in file_ids]
+
+    def _dir_parts(self, dir_id):
+        parts = []
+        while dir_id > 0:
+            parts.append(self._segments[self._dir_name[dir_id]])
+            dir_id = self._dir_parent[dir_id]
+        parts.reverse()
+        return parts
+
+    def name(self, file_id):
+        """Return the file name of an indexed file"""
+        return self._segments[self._file_name[file_id]]
+
+    def relpath(self, file_id):
+        """Return the workspace relative path of an indexed file"""
+        parts = self._dir_parts(self._file_dir[file_id])
+        parts.append(self.name(file_id))
+        return os.path.join(*parts)
+
+    def path(self, file_id):
+        """Return the absolute path of an indexed file"""
+        return os.path.join(self.root, self.relpath(file_id))
+
+def _compile_query(query):
+    """Compile a fuzzy query into a regex matching whole haystack lines.
+
+    Each query character is preceded by a negated class of itself, so the
+    scan is linear and never backtracks.
+    """
+    parts = [r"^[0-9a-f]+\x00"]
+    for ch in query:
+        escaped = re.escape(ch)
+        parts.append(f"[^{escaped}\\n]*{escaped}")
+    parts.append(r"[^\n]*")
+    return re.compile("".join(parts), re.MULTILINE)
+
+def _score(query, line):
+    """Score a matching haystack line, higher is better"""
+    path = line[line.index("\x00") + 1:]
+    name_start = path.rfind("/") + 1
+    name = path[name_start:]
+
+    score = 0
+    if name.startswith(query):
+        score += 150
+    elif query in name:
+        score += 100
+    elif query in path:
+        score += 50
+
+    # Reward consecutive hits, hits on word boundaries and hits in the file name
+    pos, prev = -1, -2
+    for ch in query:
+        pos = path.find(ch, pos + 1)
+        if pos == prev + 1:
+            score += 5
+        if pos == 0 or path[pos - 1] in "/_-. ":
+            score += 3
+        if pos >= name_start:
+            score += 2
+        prev = pos
+    return score - len(path) // 10
+
+def _bit_positions(bits, limit=None):
+    """Return the indices of the set bits in `bits`, lowest first"""
+    digits = format(bits, "b")[::-1]
+    return [m.start() for m in islice(_ONE_BIT.finditer(digits), limit)]
+
+class FuzzyMatcher:
+    """Incremental fuzzy matcher over a PathIndex.
+
+    A fresh query starts from the AND of the per-character bitsets and
+    only checks character order on the files left over. Once a query is
+    selective enough its exact candidate lines are kept, so typing another
+    character only rescans those and backspace reuses an earlier result.
+    Very unselective queries (one or two letters over a huge tree) are
+    answered from the first `sample_size` candidates in breadth first order.
+    """
+
+    def __init__(self, index, max_candidates=20000, sample_size=2000, max_scored=3000):
+        self.index = index
+        self.max_candidates = max_candidates
+        self.sample_size = sample_size
+        self.max_scored = max_scored
+        self._history = []  # [(query, candidate lines)] with growing queries
+
+    def reset(self):
+        """Forget cached candidates, e.g. after the index was rebuilt"""
+        self._history = []
+
+    def _candidates(self, query):
+        # Drop cached queries that are not a prefix of the new one
+        while self._history and not query.startswith(self._history[-1][0]):
+            self._history.pop()
+
+        pattern = _compile_query(query)
+        if self._history:
+            last_query, lines = self._history[-1]
+            if last_query == query:
+                return lines
+            lines = pattern.findall("\n".join(lines))
+            self._history.append((query, lines))
+            return lines
+
+        mask = self.index.char_mask(query)
+        if mask.bit_count() > self.max_candidates:
+            file_ids = _bit_positions(mask, self.sample_size)
+            return pattern.findall("\n".join(self.index.lines(file_ids)))
+
+        lines = pattern.findall("\n".join(self.index.lines(_bit_positions(mask))))
+        self._history.append((query, lines))
+        return lines
+
+    def match(self, query, limit=50):
+        """Return up to `limit` file ids best matching `query`"""
+        query = query.lower().replace("\\", "/").replace(" ", "")
+        if not query:
+            self._history = []
+            return list(range(min(limit, len(self.index))))
+
+        lines = self._candidates(query)
+
+        # Only score a bounded number of candidates, preferring short paths
+        if len(lines) > self.max_scored:
+            lines = heapq.nsmallest(self.max_scored, lines, key=len)
+
+        # Equal scores go to the shorter path
+        best = heapq.nlargest(limit, lines, key=lambda line: (_score(query, line), -len(line)))
+        return [int(line[:line.index("\x00")], 16) for line in best]
@@ -0,0 +1,135 @@
+import os
+import queue
+import sqlite3
+import logging
+import threading
+from collections import namedtuple
+
+logger = logging.getLogger(__name__)
+
+# One open tab as stored in the session; `has_buffer` tells whether
+# unsaved text was kept for it, without loading that text
+SessionTab = namedtuple("SessionTab", ("path", "cursor", "yview", "xview", "has_buffer"))
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tabs (
+    path TEXT PRIMARY KEY,
+    position INTEGER NOT NULL,
+    cursor TEXT NOT NULL DEFAULT '1.0',
+    yview REAL NOT NULL DEFAULT 0,
+    xview REAL NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS buffers (
+    path TEXT PRIMARY KEY,
+    text BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS state (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+class SessionStore:
+    """Open tabs, their view state and unsaved buffers, kept in SQLite.
+
+    Every change is a small row update, queued from the Tk thread and
+    written by a writer thread that applies whatever has piled up in one
+    transaction, so saving never waits on the disk. A change that fails
+    is rolled back to its savepoint without losing the others. Buffers
+    are stored zlib compressed, the same way hibernated documents hold
+    them, and are only read back when their editor is built.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._lock = threading.Lock()
+        self._changes = queue.Queue()
+        self._thread = threading.Thread(target=self._write, name="SessionWriter", daemon=True)
+        self._thread.start()
+
+    def load(self):
+        """Return (tabs in strip order, active path) of the last session"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT t.path, t.cursor, t.yview, t.xview, b.path IS NOT NULL "
+                "FROM tabs t LEFT JOIN buffers b ON b.path = t.path ORDER BY t.position"
+            ).fetchall()
+            active = self._conn.execute("SELECT value FROM state WHERE key = 'active'").fetchone()
+        return [SessionTab(path, cursor, yview, xview, bool(has_buffer))
+                for path, cursor, yview, xview, has_buffer in rows], active[0] if active else None
+
+    def load_buffer(self, path):
+        """Return the compressed unsaved text of `path`, or None"""
+        with self._lock:
+            row = self._conn.execute("SELECT text FROM buffers WHERE path = ?", (path,)).fetchone()
+        return row[0] if row else None
+
+    def add_tab(self, path):
+        """Append a tab to the end of the strip"""
+        self._changes.put((
+            "INSERT OR IGNORE INTO tabs (path, position) "
+            "SELECT ?, COALESCE(MAX(position), 0) + 1 FROM tabs", (path,)))
+
+    def rename_tab(self, old, new):
+        """Show `new` in the place of `old`, as the preview tab does"""
+        self._changes.put(("DELETE FROM buffers WHERE path = ?", (old,)))
+        self._changes.put((
+            "UPDATE tabs SET path = ?, cursor = '1.0', yview = 0, xview = 0 WHERE path = ?", (new, old)))
+
+    def remove_tab(self, path):
+        self._changes.put(("DELETE FROM tabs WHERE path = ?", (path,)))
+        self._changes.put(("DELETE FROM buffers WHERE path = ?", (path,)))
+
+    def set_view(self, path, cursor, yview, xview):
+        self._changes.put((
+            "UPDATE tabs SET cursor = ?, yview = ?, xview = ? WHERE path = ?", (cursor, yview, xview, path)))
+
+    def set_buffer(self, path, compressed):
+        """Keep the unsaved text of `path`, or forget it when None"""
+        if compressed is None:
+            self._changes.put(("DELETE FROM buffers WHERE path = ?", (path,)))
+        else:
+            self._changes.put((
+                "INSERT OR REPLACE INTO buffers (path, text) VALUES (?, ?)", (path, compressed)))
+
+    def set_active(self, path):
+        self._changes.put(("INSERT OR REPLACE INTO state (key, value) VALUES ('active', ?)", (path,)))
+
+    def flush(self):
+        """Wait until every queued change is written"""
+        self._changes.join()
+
+    def _write(self):
+        while True:
+            changes = [self._changes.get()]
+            while True:
+                try:
+                    changes.append(self._changes.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                with self._lock:
+                    self._conn.execute("BEGIN")
+                    try:
+                        for sql, params in changes:
+                            # A failed change is undone alone; the rest of the batch still lands
+                            self._conn.execute("SAVEPOINT change")
+                            try:
+                                self._conn.execute(sql, params)
+                            except sqlite3.Error as e:
+                                self._conn.execute("ROLLBACK TO change")
+                                logger.error(f"Failed to write session change: {e}")
+                            self._conn.execute("RELEASE change")
+                        self._conn.execute("COMMIT")
+                    except BaseException:
+                        self._conn.execute("ROLLBACK")
+                        raise
+            except Exception as e:
+                logger.error(f"Failed to write session: {e}")
+            for _ in changes:
+                self._changes.task_done()
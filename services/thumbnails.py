@@ -0,0 +1,207 @@
+import os
+import queue
+import hashlib
+import logging
+import tempfile
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from PIL import Image
+
+logger = logging.getLogger(__name__)
+
+class ThumbnailCache:
+    """Size capped on-disk cache of scaled images.
+
+    Entries are keyed by (path, mtime, size, target size), so an edited
+    image simply misses. The least recently used files are evicted once
+    the directory grows past `max_bytes`; recency survives restarts
+    because hits touch the file mtime.
+    """
+
+    def __init__(self, directory, max_bytes=256 * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # {name: bytes} in LRU order
+        self._total = 0
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    def _load(self):
+        """Read existing cache files, oldest first"""
+        if self._loaded:
+            return
+        self._loaded = True
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with os.scandir(self.directory) as it:
+                files = [(entry.stat().st_mtime, entry.name, entry.stat().st_size)
+                         for entry in it if entry.name.endswith(".thumb")]
+        except OSError as e:
+            logger.error(f"Failed to read thumbnail cache {self.directory}: {e}")
+            return
+        for _, name, size in sorted(files):
+            self._entries[name] = size
+            self._total += size
+
+    @staticmethod
+    def key(path, size):
+        """Return the cache key for `path` scaled to fit `size`"""
+        st = os.stat(path)
+        raw = f"{os.path.abspath(path)}\0{st.st_mtime_ns}\0{st.st_size}\0{size[0]}x{size[1]}"
+        return hashlib.sha1(raw.encode("utf-8", "surrogateescape")).hexdigest() + ".thumb"
+
+    def get(self, key):
+        """Return the cached image for `key` or None"""
+        with self._lock:
+            self._load()
+            if key not in self._entries:
+                return None
+            self._entries.move_to_end(key)
+
+        file_path = os.path.join(self.directory, key)
+        try:
+            with Image.open(file_path) as image:
+                image.load()
+            os.utime(file_path)
+            return image
+        except OSError:
+            with self._lock:
+                self._total -= self._entries.pop(key, 0)
+            return None
+
+    def put(self, key, image):
+        """Store `image` under `key` and evict old entries if over budget"""
+        if image.mode in ("RGBA", "LA", "P"):
+            fmt = "PNG"
+        else:
+            fmt = "JPEG"
+            if image.mode not in ("RGB", "L", "CMYK"):
+                image = image.convert("RGB")
+
+        try:
+            with self._lock:
+                self._load()
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                image.save(f, format=fmt, quality=90)
+            os.replace(tmp_path, os.path.join(self.directory, key))
+            size = os.path.getsize(os.path.join(self.directory, key))
+        except OSError as e:
+            logger.error(f"Failed to write thumbnail {key}: {e}")
+            return
+
+        with self._lock:
+            self._total += size - self._entries.pop(key, 0)
+            self._entries[key] = size
+            while self._total > self.max_bytes and len(self._entries) > 1:
+                name, old_size = self._entries.popitem(last=False)
+                self._total -= old_size
+                try:
+                    os.remove(os.path.join(self.directory, name))
+                except OSError:
+                    pass
+
+class ThumbnailJob:
+    """Handle for one preview request.
+
+    Results arrive as (stage, image, info) tuples where stage is
+    "preview" (quick low resolution pass, JPEG only), "final" or "error". They are
+    produced on worker threads and must be collected from the Tk thread
+    with `results()`.
+    """
+
+    def __init__(self, path, size):
+        self.path = path
+        self.size = size
+        self.cancelled = False
+        self._queue = queue.Queue()
+
+    def cancel(self):
+        self.cancelled = True
+
+    def _put(self, stage, image, info):
+        if not self.cancelled:
+            self._queue.put((stage, image, info))
+
+    def results(self):
+        """Return the results that are ready, without blocking"""
+        ready = []
+        while True:
+            try:
+                ready.append(self._queue.get_nowait())
+            except queue.Empty:
+                return ready
+
+class ThumbnailLoader:
+    """Decodes and scales images on a small worker pool"""
+
+    def __init__(self, cache=None, max_workers=2):
+        self.cache = cache
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="Thumbnail")
+
+    def request(self, path, size):
+        """Start loading `path` scaled to fit `size` and return its job"""
+        job = ThumbnailJob(path, size)
+        self._executor.submit(self._run, job)
+        return job
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _run(self, job):
+        try:
+            self._render(job)
+        except Exception as e:
+            logger.error(f"Failed to render thumbnail for {job.path}: {e}")
+            job._put("error", None, str(e))
+
+    def _render(self, job):
+        width, height = job.size
+        key = self.cache.key(job.path, job.size) if self.cache else None
+
+        with Image.open(job.path) as image:
+            info = {
+                "format": image.format,
+                "width": image.width,
+                "height": image.height,
+                "mode": image.mode
+            }
+            is_jpeg = image.format == "JPEG"
+
+            cached = self.cache.get(key) if self.cache else None
+            if cached is not None:
+                job._put("final", cached, info)
+                return
+
+            if job.cancelled:
+                return
+
+            # Quick low resolution pass; JPEG draft mode decodes at 1/2..1/8 scale
+            if is_jpeg:
+                with Image.open(job.path) as draft:
+                    draft.draft("RGB", (max(1, width // 4), max(1, height // 4)))
+                    preview = draft.copy()
+                preview.thumbnail((width // 4 or 1, height // 4 or 1), Image.Resampling.BILINEAR)
+                job._put("preview", self._fit(preview, info, job.size), info)
+                image.draft("RGB", job.size)
+
+            if job.cancelled:
+                return
+
+            # Other formats have no reduced decode, so a preview would only
+            # come after the full decode the final image needs anyway
+            image.load()
+            final = image.copy()
+
+        final.thumbnail(job.size, Image.Resampling.LANCZOS)
+        job._put("final", final, info)
+        if self.cache:
+            self.cache.put(key, final)
+
+    @staticmethod
+    def _fit(preview, info, size):
+        """Stretch a low resolution preview to the final display size"""
+        ratio = min(1, size[0] / info["width"], size[1] / info["height"])
+        target = (max(1, int(info["width"] * ratio)), max(1, int(info["height"] * ratio)))
+        return preview.resize(target, Image.Resampling.BILINEAR)
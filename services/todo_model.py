@@ -0,0 +1,241 @@
+import re
+import datetime
+import itertools
+
+# Groups tasks can be shown in, in display order; tag groups are sorted
+# by name with untagged tasks last
+STATUS_GROUPS = ("To do", "Done")
+DUE_GROUPS = ("Overdue", "Today", "This week", "Later", "No date")
+UNTAGGED = "Untagged"
+
+# Shared one group key tuples
+_STATUS_KEYS = tuple((group,) for group in STATUS_GROUPS)
+_DUE_KEYS = {group: (group,) for group in DUE_GROUPS}
+_UNTAGGED_KEYS = (UNTAGGED,)
+
+_QUICK_ADD = re.compile(r"(?:^|\s)(?:#(\w[\w-]*)|due:(\S+)|!([1-3]))(?=\s|$)")
+
+def parse_quick_add(text, today=None):
+    """Split "#tags", "due:<date>" and "!<priority>" off a typed task.
+
+    The date is "today", "tomorrow" or YYYY-MM-DD; priority runs from 1
+    to 3, most urgent. Returns (text, fields) where fields holds the
+    task keys that were given.
+    """
+    today = today or datetime.date.today()
+    fields = {}
+    tags = []
+
+    def take(match):
+        tag, due, priority = match.groups()
+        if tag:
+            tag = tag.lower()
+            if tag not in tags:
+                tags.append(tag)
+        elif priority:
+            fields["priority"] = int(priority)
+        elif due.lower() in ("today", "tomorrow"):
+            fields["due_date"] = (today + datetime.timedelta(days=due.lower() == "tomorrow")).isoformat()
+        else:
+            try:
+                fields["due_date"] = datetime.date.fromisoformat(due).isoformat()
+            except ValueError:
+                return match.group(0)  # Not a date, keep it as text
+        return " "
+
+    text = " ".join(_QUICK_ADD.sub(take, text).split())
+    if tags:
+        fields["tags"] = tuple(tags)
+    return text, fields
+
+def due_bounds(today):
+    """Return (today, end of the week) as ISO dates, the edges of the due groups"""
+    return today.isoformat(), (today + datetime.timedelta(days=6 - today.weekday())).isoformat()
+
+def due_group(due_date, bounds):
+    """Return the DUE_GROUPS entry of an ISO date, given due_bounds()"""
+    # ISO dates compare as strings
+    if not due_date:
+        return "No date"
+    today, week_end = bounds
+    if due_date < today:
+        return "Overdue"
+    if due_date == today:
+        return "Today"
+    if due_date <= week_end:
+        return "This week"
+    return "Later"
+
+class TaskModel:
+    """The tasks of the TODO panel in list order, with grouping indexes.
+
+    Tasks are the panel's {"id", "text", "done", "priority", "due_date",
+    "tags"} dicts. Next to the list the model keeps, for each grouping
+    ("status", "tag" and "due"), which tasks are in which group. The
+    indexes are updated per task as tasks are added, changed or removed,
+    so a board or tree never regroups the whole list. Each group also has
+    a revision that changes whenever its tasks do, letting views skip
+    groups that look the same as last time.
+    """
+
+    GROUPINGS = ("status", "tag", "due")
+
+    def __init__(self, today=None):
+        self._today = today
+        self._clock = itertools.count(1)
+        self.load([])
+
+    def load(self, tasks):
+        """Replace every task"""
+        self.tasks = list(tasks)
+        self._members = {grouping: {} for grouping in self.GROUPINGS}  # {key: {id(task): task}}
+        self._keys = {grouping: {} for grouping in self.GROUPINGS}  # {id(task): keys}
+        self._revisions = {}  # {(grouping, key): int} of groups changed since the load
+        self._unsorted = set()  # (grouping, key) of groups whose members left list order
+        self._order = {id(task): index for index, task in enumerate(self.tasks)}  # Grows along the list
+        self._next_order = len(self.tasks)
+        self._loaded = next(self._clock)
+        self._day = self.today()
+        self._bounds = due_bounds(self._day)
+        ids = [id(task) for task in self.tasks]
+        for grouping in self.GROUPINGS:
+            members = self._members[grouping]
+            keys_of = self._keys[grouping]
+            for task_id, task in zip(ids, self.tasks):
+                keys = keys_of[task_id] = self.keys(grouping, task)
+                for key in keys:
+                    group = members.get(key)
+                    if group is None:
+                        group = members[key] = {}
+                    group[task_id] = task
+
+    def today(self):
+        return self._today or datetime.date.today()
+
+    def keys(self, grouping, task):
+        """Return the groups `task` belongs to under `grouping`"""
+        if grouping == "status":
+            return _STATUS_KEYS[bool(task["done"])]
+        if grouping == "tag":
+            return tuple(task.get("tags") or ()) or _UNTAGGED_KEYS
+        return _DUE_KEYS[due_group(task.get("due_date"), self._bounds)]
+
+    def add(self, task):
+        """Append a task to the list"""
+        self.insert_many(len(self.tasks), [task])
+
+    def insert(self, index, task):
+        """Put a task back at a position, e.g. after a failed delete"""
+        self.insert_many(index, [task])
+
+    def insert_many(self, index, tasks):
+        """Insert tasks at a position, e.g. a page loaded after tasks added since"""
+        appended = index >= len(self.tasks)
+        self.tasks[index:index] = tasks
+        if appended:
+            for task in tasks:
+                self._order[id(task)] = self._next_order
+                self._next_order += 1
+        else:
+            # Rare: a page in front of added tasks, a failed delete put back
+            self._order = {id(task): position for position, task in enumerate(self.tasks)}
+            self._next_order = len(self.tasks)
+        for task in tasks:
+            self._index(task)
+
+    def remove(self, task):
+        # By identity: two tasks may read the same
+        del self.tasks[next(i for i, other in enumerate(self.tasks) if other is task)]
+        self._unindex(task)
+        del self._order[id(task)]
+
+    def __contains__(self, task):
+        return id(task) in self._keys["status"]
+
+    def update(self, task, **fields):
+        """Change fields of a task, moving it only in the groupings they affect"""
+        task.update(fields)
+        for grouping in self.GROUPINGS:
+            keys_of = self._keys[grouping]
+            old, new = keys_of[id(task)], self.keys(grouping, task)
+            if new != old:
+                self._move(task, grouping, old, new)
+                keys_of[id(task)] = new
+            for key in set(old) & set(new):
+                # Still a member, but the group shows it differently now
+                self._revisions[grouping, key] = next(self._clock)
+
+    def groups(self, grouping, tasks=None):
+        """Return [(group, tasks)] in display order.
+
+        Without `tasks`, groups come from the index and keep list order;
+        otherwise the given tasks, e.g. search results, are grouped in
+        their own order. Status and due groups are always all present,
+        empty or not, so a board keeps its columns.
+        """
+        if tasks is None:
+            return [(key, self.members(grouping, key)) for key in self.group_keys(grouping)]
+        members = {}
+        for task in tasks:
+            for key in self.keys(grouping, task):
+                members.setdefault(key, []).append(task)
+        return [(key, members.get(key, [])) for key in self.group_keys(grouping, members)]
+
+    def group_keys(self, grouping, present=None):
+        """Return the groups of `grouping` in display order"""
+        if self._day != self.today():
+            # Due groups are relative to today; regroup after midnight
+            self.load(self.tasks)
+        if grouping == "status":
+            return list(STATUS_GROUPS)
+        if grouping == "due":
+            return list(DUE_GROUPS)
+        present = self._members[grouping] if present is None else present
+        keys = sorted(key for key in present if key != UNTAGGED)
+        if UNTAGGED in present:
+            keys.append(UNTAGGED)
+        return keys
+
+    def members(self, grouping, key):
+        """Return the tasks in a group, in list order"""
+        group = self._members[grouping].get(key, {})
+        if (grouping, key) in self._unsorted:
+            self._unsorted.discard((grouping, key))
+            order = self._order
+            # Nearly sorted: one or a few tasks joined out of place
+            group = self._members[grouping][key] = dict(sorted(group.items(), key=lambda item: order[item[0]]))
+        return list(group.values())
+
+    def revision(self, grouping, key):
+        """Return a number that changes whenever a group's tasks do"""
+        return self._revisions.get((grouping, key), self._loaded)
+
+    def _index(self, task):
+        for grouping in self.GROUPINGS:
+            keys = self._keys[grouping][id(task)] = self.keys(grouping, task)
+            self._move(task, grouping, (), keys)
+
+    def _unindex(self, task):
+        for grouping in self.GROUPINGS:
+            self._move(task, grouping, self._keys[grouping].pop(id(task)), ())
+
+    def _move(self, task, grouping, old, new):
+        members = self._members[grouping]
+        for key in old:
+            if key not in new:
+                group = members[key]
+                del group[id(task)]
+                if not group:
+                    del members[key]
+                    self._unsorted.discard((grouping, key))
+                self._revisions[grouping, key] = next(self._clock)
+        for key in new:
+            if key not in old:
+                # Groups keep insertion order, which is list order for
+                # appended tasks; a task that joins before the last member
+                # marks the group for sorting when it is next read
+                group = members.setdefault(key, {})
+                if group and self._order[next(reversed(group))] > self._order[id(task)]:
+                    self._unsorted.add((grouping, key))
+                group[id(task)] = task
+                self._revisions[grouping, key] = next(self._clock)
@@ -0,0 +1,125 @@
+import threading
+
+from services.todo_model import STATUS_GROUPS, UNTAGGED, due_bounds
+
+# Tasks fetched per page of the TODO panel
+PAGE_SIZE = 200
+
+# Columns of a page row
+TASK_COLUMNS = "id, task, done, priority, due_date, tags, created_date"
+
+def fetch_page(db, cursor=None, limit=PAGE_SIZE, done=None):
+    """Return (rows, next cursor) of live tasks, newest first.
+
+    Pages are keyed on (created_date, id) rather than an OFFSET, so every
+    page is a seek into the live task index however deep it is. `cursor`
+    is what the previous page returned; the next cursor is None after the
+    last page.
+    """
+    where = "deleted_at IS NULL"
+    params = []
+    if done is not None:
+        where += " AND done = ?"
+        params.append(int(done))
+    if cursor is not None:
+        where += " AND (created_date, id) < (?, ?)"
+        params.extend(cursor)
+    rows = db.fetchall(
+        f"SELECT {TASK_COLUMNS} FROM todos WHERE {where} "
+        "ORDER BY created_date DESC, id DESC LIMIT ?", params + [limit]
+    )
+    next_cursor = (rows[-1][6], rows[-1][0]) if len(rows) == limit else None
+    return rows, next_cursor
+
+class TaskSummary:
+    """The pending task count and newest pending tasks, cached until the database changes.
+
+    Any commit invalidates the cache: PRAGMA data_version moves when
+    another connection writes and total_changes when this one does, so
+    writes from the TODO panel, the sync engine or another Minux all
+    count without anyone having to report them. Call `get()` on the
+    database worker thread.
+    """
+
+    def __init__(self, limit=5):
+        self.limit = limit
+        self._cached = None
+        self._key = None
+
+    def get(self, db):
+        """Return (pending count, [(id, task, created_date)] newest first)"""
+        conn = db.connection()
+        key = (threading.get_ident(), conn.execute("PRAGMA data_version").fetchone()[0], conn.total_changes)
+        if key != self._key:
+            count = conn.execute("SELECT COUNT(*) FROM todos WHERE done = 0 AND deleted_at IS NULL").fetchone()[0]
+            newest = conn.execute(
+                "SELECT id, task, created_date FROM todos WHERE done = 0 AND deleted_at IS NULL "
+                "ORDER BY created_date DESC, id DESC LIMIT ?", (self.limit,)
+            ).fetchall()
+            self._cached = (count, newest)
+            self._key = key
+        return self._cached
+
+class GroupCounts:
+    """Live task counts per board and tree group, cached until the database changes.
+
+    The TODO panel only holds the pages loaded so far; these are the
+    counts of every task. Each group's count is split into (to do, done)
+    so any filter can be applied to it. Invalidated like TaskSummary;
+    call `get()` on the database worker thread.
+    """
+
+    def __init__(self):
+        self._cached = {}  # {(grouping, today): counts}
+        self._key = None
+
+    def get(self, db, grouping, today):
+        """Return {group: [to do, done]} of the live tasks under `grouping`"""
+        conn = db.connection()
+        key = (threading.get_ident(), conn.execute("PRAGMA data_version").fetchone()[0], conn.total_changes)
+        if key != self._key:
+            self._cached = {}
+            self._key = key
+        counts = self._cached.get((grouping, today))
+        if counts is None:
+            counts = self._cached[grouping, today] = self._count(conn, grouping, today)
+        return counts
+
+    @staticmethod
+    def _count(conn, grouping, today):
+        if grouping == "status":
+            rows = [
+                (STATUS_GROUPS[bool(done)], done, count) for done, count in
+                conn.execute("SELECT done, COUNT(*) FROM todos WHERE deleted_at IS NULL GROUP BY done")
+            ]
+        elif grouping == "due":
+            # The due_group() edges, in SQL; ISO dates compare as strings
+            start, week_end = due_bounds(today)
+            rows = conn.execute(
+                "SELECT CASE WHEN due_date IS NULL OR due_date = '' THEN 'No date' WHEN due_date < ? THEN 'Overdue' "
+                "WHEN due_date = ? THEN 'Today' WHEN due_date <= ? THEN 'This week' ELSE 'Later' END, "
+                "done, COUNT(*) FROM todos WHERE deleted_at IS NULL GROUP BY 1, 2", (start, start, week_end)
+            ).fetchall()
+        else:
+            # Few distinct tag lists; split them here
+            rows = []
+            for tags, done, count in conn.execute(
+                "SELECT tags, done, COUNT(*) FROM todos WHERE deleted_at IS NULL GROUP BY tags, done"
+            ):
+                for tag in dict.fromkeys(tag for tag in tags.split(",") if tag) or (UNTAGGED,):
+                    rows.append((tag, done, count))
+        counts = {}
+        for group, done, count in rows:
+            counts.setdefault(group, [0, 0])[bool(done)] += count
+        return counts
+
+_summaries = {}
+_summaries_lock = threading.Lock()
+
+def get_summary(db):
+    """Return the shared TaskSummary of a Database"""
+    with _summaries_lock:
+        summary = _summaries.get(db.path)
+        if summary is None:
+            summary = _summaries[db.path] = TaskSummary()
+        return summary
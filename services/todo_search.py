@@ -0,0 +1,87 @@
+import re
+import sqlite3
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Matches at most this many tasks, newest first, before ranking
+CANDIDATE_LIMIT = 500
+
+# Markers around the matched words of a snippet
+HIGHLIGHT_START = "«"
+HIGHLIGHT_END = "»"
+
+# Words of a snippet around its first match
+SNIPPET_WORDS = 12
+
+_WORD = re.compile(r"\w+")
+
+def query_tokens(text):
+    """Return the lowercased words of a search box text"""
+    return _WORD.findall(text.lower())
+
+def match_expression(tokens):
+    """Build an FTS5 query matching tasks with words starting with every token"""
+    # Quoting keeps FTS5 operators typed by the user literal
+    return " ".join(f'"{token}"*' for token in tokens)
+
+def _score(tokens, text):
+    """Rank a task: whole word hits beat prefix hits, short tasks beat long ones"""
+    words = _WORD.findall(text.lower())
+    score = 0.0
+    for token in tokens:
+        for position, word in enumerate(words):
+            if word == token:
+                score += 2.0
+            elif word.startswith(token):
+                score += 1.0
+            else:
+                continue
+            if position == 0:
+                score += 0.5
+    return score / (1 + len(words) / 10)
+
+def snippet(tokens, text):
+    """Return `text` around its first match with the matched words marked"""
+    pattern = re.compile(r"\b(?:" + "|".join(re.escape(t) for t in tokens) + r")\w*", re.IGNORECASE)
+    words = list(re.finditer(r"\S+", text))
+    if len(words) > SNIPPET_WORDS:
+        first = pattern.search(text)
+        start = 0
+        if first:
+            start = next(i for i, w in enumerate(words) if w.end() > first.start())
+            start = max(0, min(start - 2, len(words) - SNIPPET_WORDS))
+        end = start + SNIPPET_WORDS
+        text = ("…" if start else "") + text[words[start].start():words[end - 1].end()] + ("…" if end < len(words) else "")
+    return pattern.sub(lambda m: f"{HIGHLIGHT_START}{m.group(0)}{HIGHLIGHT_END}", text)
+
+def search_tasks(db, text, done=None, limit=100):
+    """Return [(id, task, done, snippet)] best matching `text`, best first.
+
+    The FTS index yields up to CANDIDATE_LIMIT matches, newest first,
+    which are ranked here. FTS5's own bm25 ranking counts every match of
+    each term to weigh it, which for a one letter prefix over 500k tasks
+    costs hundreds of milliseconds; this keeps each keystroke bounded.
+    """
+    tokens = query_tokens(text)
+    if not tokens:
+        return []
+    done_filter = "" if done is None else " AND t.done = ?"
+    params = () if done is None else (int(done),)
+    try:
+        rows = db.fetchall(
+            "SELECT t.id, t.task, t.done FROM todos_fts JOIN todos t ON t.id = todos_fts.rowid "
+            f"WHERE todos_fts MATCH ? AND t.deleted_at IS NULL{done_filter} ORDER BY todos_fts.rowid DESC LIMIT ?",
+            (match_expression(tokens),) + params + (CANDIDATE_LIMIT,)
+        )
+    except sqlite3.OperationalError as e:
+        # No FTS5 in this SQLite build
+        logger.debug(f"Falling back to LIKE search: {e}")
+        likes = " AND ".join("t.task LIKE ? ESCAPE '\\'" for _ in tokens)
+        patterns = tuple("%" + re.sub(r"([%_\\])", r"\\\1", token) + "%" for token in tokens)
+        rows = db.fetchall(
+            f"SELECT t.id, t.task, t.done FROM todos t WHERE {likes} AND t.deleted_at IS NULL{done_filter} ORDER BY t.id DESC LIMIT ?",
+            patterns + params + (CANDIDATE_LIMIT,)
+        )
+    rows.sort(key=lambda row: _score(tokens, row[1]), reverse=True)
+    return [(task_id, task, done, snippet(tokens, task)) for task_id, task, done in rows[:limit]]
@@ -0,0 +1,278 @@
+import json
+import random
+import logging
+import datetime
+import threading
+
+logger = logging.getLogger(__name__)
+
+_EPOCH = datetime.datetime(1970, 1, 1, tzinfo=datetime.timezone.utc)
+
+class FirestoreTransport:
+    """Moves task changes to and from a Firestore collection.
+
+    Documents are keyed by task uuid and carry an `updated_at` field in
+    milliseconds, set by the client that made the change; deleted tasks
+    are kept as documents with `deleted` set. Each write also gets a
+    `synced_at` server timestamp, which pulls page on: unlike
+    `updated_at` it only grows in the order changes reach the server,
+    however late or with whatever clock they were made.
+    """
+
+    MAX_BATCH = 500  # Firestore's limit of writes per batch
+
+    def __init__(self, client, collection="todos"):
+        from firebase_admin import firestore
+        self.client = client
+        self.collection = client.collection(collection)
+        self._server_timestamp = firestore.SERVER_TIMESTAMP
+
+    def push(self, changes):
+        """Write task changes with as few batched commits as possible"""
+        for start in range(0, len(changes), self.MAX_BATCH):
+            batch = self.client.batch()
+            for change in changes[start:start + self.MAX_BATCH]:
+                batch.set(self.collection.document(change["uuid"]), dict(change, synced_at=self._server_timestamp))
+            batch.commit()
+
+    def pull(self, after, limit):
+        """Return up to `limit` changes written after the (synced_at, uuid) cursor `after`.
+
+        `synced_at` is returned in microseconds since the epoch.
+        """
+        query = self.collection.order_by("synced_at").order_by("uuid")
+        if after is not None:
+            synced_at = _EPOCH + datetime.timedelta(microseconds=after[0])
+            query = query.start_after({"synced_at": synced_at, "uuid": after[1]})
+        docs = []
+        for snapshot in query.limit(limit).stream():
+            doc = snapshot.to_dict()
+            doc["synced_at"] = (doc["synced_at"] - _EPOCH) // datetime.timedelta(microseconds=1)
+            docs.append(doc)
+        return docs
+
+class FakeFirestore:
+    """In-process stand-in for FirestoreTransport, for trying the sync engine offline.
+
+    Set `offline` to make every call fail like a dropped connection.
+    """
+
+    def __init__(self):
+        self.documents = {}
+        self.offline = False
+        self.commits = 0
+        self._sequence = 0  # Stands in for the server timestamp of a write
+        self._lock = threading.Lock()
+
+    def push(self, changes):
+        self._check()
+        with self._lock:
+            for start in range(0, len(changes), FirestoreTransport.MAX_BATCH):
+                for change in changes[start:start + FirestoreTransport.MAX_BATCH]:
+                    self._sequence += 1
+                    self.documents[change["uuid"]] = dict(change, synced_at=self._sequence)
+                self.commits += 1
+
+    def pull(self, after, limit):
+        self._check()
+        with self._lock:
+            docs = sorted(self.documents.values(), key=lambda doc: (doc["synced_at"], doc["uuid"]))
+        if after is not None:
+            docs = [doc for doc in docs if (doc["synced_at"], doc["uuid"]) > tuple(after)]
+        return [dict(doc) for doc in docs[:limit]]
+
+    def _check(self):
+        if self.offline:
+            raise ConnectionError("Fake Firestore is offline")
+
+def _content(deleted, *fields):
+    """Return a task version as a string two machines compare the same way, to break updated_at ties"""
+    return json.dumps([True] if deleted else [False, fields[0], bool(fields[1])] + list(fields[2:]))
+
+class SyncEngine:
+    """Keeps the todos of minux.db in sync with a remote store.
+
+    Each round pulls the remote changes written since a stored
+    (synced_at, uuid) cursor, synced_at being assigned by the server, then
+    pushes local rows marked unsynced and unsent tombstones in batches.
+    Conflicts are resolved last writer wins on updated_at, ties going to
+    the greater of the two versions' contents so every machine picks the
+    same one; a deletion is a change like any other, so a task deleted on
+    one machine stays deleted unless it is edited later elsewhere. The
+    transport is anything with push(changes) and pull(after, limit), see
+    FirestoreTransport and FakeFirestore.
+
+    Rounds run on a "TodoSync" thread every `interval` seconds; when the
+    transport fails the wait doubles from `retry_delay` up to `max_delay`.
+    """
+
+    def __init__(self, db, transport, batch_size=400, interval=60, retry_delay=2, max_delay=600):
+        self.db = db
+        self.transport = transport
+        self.batch_size = batch_size
+        self.interval = interval
+        self.retry_delay = retry_delay
+        self.max_delay = max_delay
+        self.failures = 0
+        self.last_error = None
+        self.revision = 0  # Bumped whenever pulled changes altered local tasks
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="TodoSync", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stopped.set()
+        self._wake.set()
+
+    def sync_now(self):
+        """Run a round as soon as possible, e.g. after local edits"""
+        self._wake.set()
+
+    def next_delay(self):
+        """Seconds to wait before the next round"""
+        if not self.failures:
+            return self.interval
+        delay = min(self.max_delay, self.retry_delay * 2 ** (self.failures - 1))
+        return delay * random.uniform(0.5, 1.0)  # Spread out retries of many clients
+
+    def _run(self):
+        while not self._stopped.is_set():
+            try:
+                self.sync_once()
+                self.failures = 0
+                self.last_error = None
+            except Exception as e:
+                self.failures += 1
+                self.last_error = e
+                logger.warning(f"Todo sync failed ({self.failures} in a row): {e}")
+            self._wake.wait(self.next_delay())
+            self._wake.clear()
+
+    def sync_once(self):
+        """Pull then push; returns (changes pulled, changes pushed)"""
+        pulled = self.pull()
+        pushed = self.push()
+        return pulled, pushed
+
+    def pull(self):
+        row = self.db.fetchone("SELECT value FROM sync_state WHERE key = 'pull_cursor'")
+        after = None
+        if row:
+            synced_at, uuid = row[0].split(":", 1)
+            after = (int(synced_at), uuid)
+        total = 0
+        while True:
+            docs = self.transport.pull(after, self.batch_size)
+            if not docs:
+                return total
+            with self.db.transaction() as conn:
+                changed = sum(self._apply(conn, doc) for doc in docs)
+                last = docs[-1]
+                after = (last["synced_at"], last["uuid"])
+                conn.execute(
+                    "INSERT OR REPLACE INTO sync_state (key, value) VALUES ('pull_cursor', ?)",
+                    (f"{after[0]}:{after[1]}",)
+                )
+            if changed:
+                self.revision += 1
+            total += len(docs)
+            if len(docs) < self.batch_size:
+                return total
+
+    def _apply(self, conn, doc):
+        """Merge one remote change, returning True if a local task changed"""
+        uuid, updated_at = doc["uuid"], doc["updated_at"]
+        local = conn.execute(
+            "SELECT updated_at, task, done, completed_date, priority, due_date, tags, deleted_at IS NOT NULL "
+            "FROM todos WHERE uuid = ?", (uuid,)
+        ).fetchone()
+        tombstone = conn.execute("SELECT deleted_at FROM todo_tombstones WHERE uuid = ?", (uuid,)).fetchone()
+        if local:
+            local_time, task, done, completed, priority, due_date, tags, deleted = local
+            mine = _content(deleted, task, done, completed, priority, due_date, tags)
+        elif tombstone:
+            local_time, mine = tombstone[0], _content(True)
+        else:
+            local_time = mine = None
+        if local_time is not None:
+            theirs = _content(doc.get("deleted"), doc.get("task"), doc.get("done"), doc.get("completed_date"),
+                              doc.get("priority", 0), doc.get("due_date"), doc.get("tags", ""))
+            if (local_time, mine) == (updated_at, theirs):
+                return False
+            if (local_time, mine) > (updated_at, theirs):
+                # Ours wins, but the server now holds the other version; send ours again
+                table = "todos" if local else "todo_tombstones"
+                conn.execute(f"UPDATE {table} SET synced = 0 WHERE uuid = ?", (uuid,))
+                return False
+
+        if doc.get("deleted"):
+            if local:
+                conn.execute(
+                    "UPDATE todos SET deleted_at = ?, updated_at = ?, synced = 1 WHERE uuid = ?",
+                    (updated_at, updated_at, uuid)
+                )
+            else:
+                # Never seen here; remember it so an older copy is not resurrected
+                conn.execute(
+                    "INSERT OR REPLACE INTO todo_tombstones (uuid, deleted_at, synced) VALUES (?, ?, 1)",
+                    (uuid, updated_at)
+                )
+            return local is not None
+
+        values = (doc["task"], bool(doc.get("done")), doc.get("completed_date"), doc.get("priority", 0),
+                  doc.get("due_date"), doc.get("tags", ""), updated_at, uuid)
+        if local:
+            conn.execute(
+                "UPDATE todos SET task = ?, done = ?, completed_date = ?, priority = ?, due_date = ?, tags = ?, "
+                "deleted_at = NULL, updated_at = ?, synced = 1 WHERE uuid = ?", values
+            )
+        else:
+            conn.execute("DELETE FROM todo_tombstones WHERE uuid = ?", (uuid,))
+            conn.execute(
+                "INSERT INTO todos (task, done, completed_date, priority, due_date, tags, updated_at, uuid, "
+                "created_date, synced) VALUES (?, ?, ?, ?, ?, ?, ?, ?, COALESCE(?, CURRENT_TIMESTAMP), 1)",
+                values + (doc.get("created_date"),)
+            )
+        return True
+
+    def push(self):
+        total = 0
+        while True:
+            rows = self.db.fetchall(
+                "SELECT uuid, task, done, created_date, completed_date, priority, due_date, tags, "
+                "deleted_at, updated_at FROM todos WHERE synced = 0 LIMIT ?", (self.batch_size,)
+            )
+            tombstones = self.db.fetchall(
+                "SELECT uuid, deleted_at FROM todo_tombstones WHERE synced = 0 LIMIT ?", (self.batch_size,)
+            )
+            if not rows and not tombstones:
+                return total
+            changes = [
+                {"uuid": uuid, "task": task, "done": bool(done), "created_date": created,
+                 "completed_date": completed, "priority": priority, "due_date": due_date, "tags": tags,
+                 "updated_at": updated_at, "deleted": deleted_at is not None}
+                for uuid, task, done, created, completed, priority, due_date, tags, deleted_at, updated_at in rows
+            ]
+            changes.extend(
+                {"uuid": uuid, "updated_at": deleted_at, "deleted": True}
+                for uuid, deleted_at in tombstones
+            )
+            self.transport.push(changes)
+
+            # Rows edited again while pushing keep their unsynced mark
+            with self.db.transaction() as conn:
+                conn.executemany(
+                    "UPDATE todos SET synced = 1 WHERE uuid = ? AND updated_at = ?",
+                    ((row[0], row[-1]) for row in rows)
+                )
+                conn.executemany(
+                    "UPDATE todo_tombstones SET synced = 1 WHERE uuid = ? AND deleted_at = ?",
+                    tombstones
+                )
+            total += len(changes)
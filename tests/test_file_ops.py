@@ -0,0 +1,38 @@
+import os
+
+from services import file_ops
+from services.file_ops import FileOperation, FileOperationQueue
+
+def run(op):
+    FileOperationQueue().submit(op)
+    assert op.done.wait(10)
+    return op
+
+def test_copy_into_itself_is_refused(tmp_path):
+    src = tmp_path / "folder"
+    (src / "sub").mkdir(parents=True)
+    (src / "a.txt").write_text("a")
+    op = run(FileOperation("copy", [str(src)], str(src / "sub")))
+    assert isinstance(op.error, ValueError)
+    assert os.listdir(src / "sub") == []
+
+def test_cancelled_copy_leaves_nothing_behind(tmp_path, monkeypatch):
+    src = tmp_path / "folder"
+    src.mkdir()
+    for name in ("a.txt", "b.txt", "c.txt"):
+        (src / name).write_text(name)
+    target = tmp_path / "target"
+    target.mkdir()
+
+    op = FileOperation("copy", [str(src)], str(target))
+    copy_file = file_ops.copy_file
+
+    def copy_then_cancel(src, dst, op):
+        copy_file(src, dst, op)
+        op.cancel()
+
+    monkeypatch.setattr(file_ops, "copy_file", copy_then_cancel)
+    run(op)
+    assert op.cancelled and op.error is None
+    assert os.listdir(target) == []
+    assert sorted(os.listdir(src)) == ["a.txt", "b.txt", "c.txt"]
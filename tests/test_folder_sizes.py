@@ -0,0 +1,25 @@
+import os
+
+from services import folder_sizes
+from services.folder_sizes import FolderSizes
+
+def compute(sizes, root):
+    job = sizes.compute(str(root))
+    assert job.done.wait(10)
+    return job
+
+def test_rerun_lists_only_changed_folders(tmp_path, monkeypatch):
+    for name in ("a", "b", "c"):
+        (tmp_path / name / "deep").mkdir(parents=True)
+        (tmp_path / name / "deep" / "file").write_bytes(b"x" * 100)
+    sizes = FolderSizes()
+    assert compute(sizes, tmp_path).total(str(tmp_path)) == 300
+
+    listed = []
+    scandir = os.scandir
+    monkeypatch.setattr(folder_sizes.os, "scandir", lambda path: listed.append(path) or scandir(path))
+    (tmp_path / "b" / "deep" / "new").write_bytes(b"y" * 50)
+    job = compute(sizes, tmp_path)
+    assert job.total(str(tmp_path)) == 350
+    assert job.total(str(tmp_path / "b")) == 150
+    assert listed == [str(tmp_path / "b" / "deep")]
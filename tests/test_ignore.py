@@ -0,0 +1,37 @@
+from services.ignore import IgnoreMatcher
+
+def matcher(tmp_path, rules, nested=None):
+    (tmp_path / ".gitignore").write_text(rules)
+    if nested:
+        (tmp_path / "sub").mkdir()
+        (tmp_path / "sub" / ".gitignore").write_text(nested)
+    return IgnoreMatcher(str(tmp_path))
+
+def ignored(m, tmp_path, rel, is_dir=False):
+    return m.is_ignored(str(tmp_path / rel), is_dir)
+
+def test_negation(tmp_path):
+    m = matcher(tmp_path, "*.log\n!keep.log\n", "!important.log\n")
+    assert ignored(m, tmp_path, "a.log")
+    assert ignored(m, tmp_path, "deep/a.log")
+    assert not ignored(m, tmp_path, "keep.log")
+    assert not ignored(m, tmp_path, "deep/keep.log")
+    # A nested .gitignore overrides its parents
+    assert ignored(m, tmp_path, "sub/a.log")
+    assert not ignored(m, tmp_path, "sub/important.log")
+
+def test_anchoring(tmp_path):
+    m = matcher(tmp_path, "/build\ndocs/*.md\nnode_modules\n")
+    assert ignored(m, tmp_path, "build", True)
+    assert not ignored(m, tmp_path, "src/build", True)
+    assert ignored(m, tmp_path, "docs/a.md")
+    assert not ignored(m, tmp_path, "docs/sub/a.md")
+    assert not ignored(m, tmp_path, "src/docs/a.md")
+    assert ignored(m, tmp_path, "src/node_modules", True)
+
+def test_directory_only_rules(tmp_path):
+    m = matcher(tmp_path, "cache/\nout/\n!out/\n")
+    assert ignored(m, tmp_path, "cache", True)
+    assert ignored(m, tmp_path, "src/cache", True)
+    assert not ignored(m, tmp_path, "cache")
+    assert not ignored(m, tmp_path, "out", True)
@@ -0,0 +1,56 @@
+import pytest
+
+from services.database import Database
+from services.migrations import MIGRATIONS, LATEST_VERSION, migrate, schema_version, _create_todos
+
+def columns(db):
+    return {row[1] for row in db.fetchall("PRAGMA table_info(todos)")}
+
+def test_fresh_database(tmp_path):
+    db = Database(str(tmp_path / "fresh.db"))
+    assert migrate(db.connection()) == 0
+    assert schema_version(db.connection()) == LATEST_VERSION
+    assert {"uuid", "updated_at", "priority", "due_date", "tags", "deleted_at"} <= columns(db)
+    db.close()
+
+# The schema Minux shipped with before versioning, and what the
+# unversioned init_database() made on top of it
+@pytest.mark.parametrize("upgraded", [(), MIGRATIONS[1:3]], ids=["baseline", "unversioned"])
+def test_upgrade_keeps_tasks(tmp_path, upgraded):
+    db = Database(str(tmp_path / "old.db"))
+    conn = db.connection()
+    _create_todos(conn)
+    for _, _, upgrade in upgraded:
+        upgrade(conn)
+    conn.executemany(
+        "INSERT INTO todos (task, done, created_date) VALUES (?, ?, ?)",
+        [("write report", 0, "2024-01-02 10:00:00"), ("ship it", 1, "2024-01-03 11:00:00")]
+    )
+    assert migrate(conn) == 0
+    rows = db.fetchall("SELECT task, done, priority, tags, deleted_at, uuid IS NOT NULL FROM todos ORDER BY id")
+    assert rows == [("write report", 0, 0, "", None, 1), ("ship it", 1, 0, "", None, 1)]
+    assert db.fetchall("SELECT rowid FROM todos_fts WHERE todos_fts MATCH 'rep*'") == [(1,)]
+
+    # Soft deletes are stamped for sync like any edit
+    db.execute("UPDATE todos SET synced = 1")
+    db.execute("UPDATE todos SET deleted_at = 1 WHERE id = 1")
+    assert db.fetchall("SELECT id FROM todos WHERE synced = 0") == [(1,)]
+    assert migrate(conn) == LATEST_VERSION
+    db.close()
+
+def test_search_index_is_built_once_fts5_is_available(tmp_path):
+    db = Database(str(tmp_path / "nofts.db"))
+    conn = db.connection()
+    migrate(conn)
+    # What migration 2 leaves behind on an SQLite without FTS5
+    with db.transaction() as tx:
+        for trigger in ("insert", "delete", "update"):
+            tx.execute(f"DROP TRIGGER todos_fts_{trigger}")
+        tx.execute("DROP TABLE todos_fts")
+    db.execute("INSERT INTO todos (task) VALUES ('write report')")
+
+    assert migrate(conn) == LATEST_VERSION
+    assert db.fetchall("SELECT rowid FROM todos_fts WHERE todos_fts MATCH 'rep*'") == [(1,)]
+    db.execute("INSERT INTO todos (task) VALUES ('reply')")
+    assert db.fetchall("SELECT rowid FROM todos_fts WHERE todos_fts MATCH 'rep*'") == [(1,), (2,)]
+    db.close()
@@ -0,0 +1,19 @@
+from services.path_index import PathIndex, FuzzyMatcher, _score
+
+def test_first_query_character_is_scored():
+    # "a" starts "a_c.py" on a word boundary but sits inside "ba_c.py"
+    assert _score("ac", "0\x00a_c.py") > _score("ac", "1\x00ba_c.py")
+
+def test_quick_open_ranking(tmp_path):
+    (tmp_path / "src").mkdir()
+    for name in ("abc.py", "src/abc", "src/xabc.txt", "a_c.py", "ba_c.py"):
+        (tmp_path / name).write_text("")
+    index = PathIndex(str(tmp_path)).start()
+    assert index.ready.wait(10)
+    matcher = FuzzyMatcher(index)
+
+    def ranked(query):
+        return [index.relpath(file_id).replace("\\", "/") for file_id in matcher.match(query)]
+
+    assert ranked("abc")[:3] == ["abc.py", "src/abc", "src/xabc.txt"]
+    assert ranked("ac").index("a_c.py") < ranked("ac").index("ba_c.py")
@@ -0,0 +1,42 @@
+import zlib
+
+from services.session import SessionStore, SessionTab
+
+def test_session_round_trip(tmp_path):
+    path = str(tmp_path / "session" / "session.db")
+    store = SessionStore(path)
+    for tab in ("/a.py", "/b.py", "/c.py"):
+        store.add_tab(tab)
+    store.set_view("/b.py", "12.4", 0.5, 0.25)
+    store.set_buffer("/b.py", zlib.compress(b"unsaved"))
+    store.set_buffer("/c.py", zlib.compress(b"dropped"))
+    store.set_buffer("/c.py", None)
+    store.rename_tab("/a.py", "/d.py")
+    store.set_active("/b.py")
+    store.flush()
+
+    tabs, active = SessionStore(path).load()
+    assert tabs == [
+        SessionTab("/d.py", "1.0", 0, 0, False),
+        SessionTab("/b.py", "12.4", 0.5, 0.25, True),
+        SessionTab("/c.py", "1.0", 0, 0, False),
+    ]
+    assert active == "/b.py"
+    assert zlib.decompress(store.load_buffer("/b.py")) == b"unsaved"
+
+def test_failed_change_keeps_the_rest_of_the_batch(tmp_path):
+    path = str(tmp_path / "session.db")
+    store = SessionStore(path)
+    # Hold the writer so the changes are applied in one batch
+    with store._lock:
+        store.add_tab("/a.py")
+        store.add_tab("/b.py")
+        # /b.py is already open, so the renamed row collides with it
+        store.rename_tab("/a.py", "/b.py")
+        store.set_view("/b.py", "3.0", 0, 0)
+        store.set_active("/b.py")
+    store.flush()
+
+    tabs, active = SessionStore(path).load()
+    assert [(tab.path, tab.cursor) for tab in tabs] == [("/a.py", "1.0"), ("/b.py", "3.0")]
+    assert active == "/b.py"
@@ -0,0 +1,32 @@
+import os
+
+from PIL import Image
+
+from services.thumbnails import ThumbnailCache
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = ThumbnailCache(str(tmp_path / "thumbs"))
+    image = Image.new("RGB", (64, 64), "red")
+    cache.put("a.thumb", image)
+    size = os.path.getsize(tmp_path / "thumbs" / "a.thumb")
+    cache.max_bytes = size * 2
+
+    cache.put("b.thumb", image)
+    assert cache.get("a.thumb") is not None
+    cache.put("c.thumb", image)
+    assert cache.get("b.thumb") is None
+    assert cache.get("a.thumb") is not None
+    assert sorted(os.listdir(tmp_path / "thumbs")) == ["a.thumb", "c.thumb"]
+
+def test_recency_survives_a_restart(tmp_path):
+    directory = str(tmp_path / "thumbs")
+    cache = ThumbnailCache(directory)
+    image = Image.new("RGB", (64, 64), "blue")
+    for name in ("a.thumb", "b.thumb"):
+        cache.put(name, image)
+    os.utime(os.path.join(directory, "a.thumb"), (1, 1))
+
+    size = os.path.getsize(os.path.join(directory, "a.thumb"))
+    reopened = ThumbnailCache(directory, max_bytes=size * 2)
+    reopened.put("c.thumb", image)
+    assert sorted(os.listdir(directory)) == ["b.thumb", "c.thumb"]
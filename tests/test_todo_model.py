@@ -0,0 +1,57 @@
+import random
+import datetime
+
+from services.todo_model import TaskModel
+
+TODAY = datetime.date(2024, 5, 15)
+
+def snapshot(model):
+    return {grouping: [(key, [task["id"] for task in tasks]) for key, tasks in model.groups(grouping)]
+            for grouping in TaskModel.GROUPINGS}
+
+def test_incremental_updates_match_a_full_regroup():
+    random.seed(3)
+    tags = ("work", "home", "errands")
+    tasks = [{
+        "id": i, "text": f"task {i}", "done": i % 3 == 0, "priority": 0,
+        "due_date": (TODAY + datetime.timedelta(days=i % 12 - 3)).isoformat() if i % 2 else None,
+        "tags": tuple(random.sample(tags, i % 3)),
+    } for i in range(200)]
+    model = TaskModel(TODAY)
+    model.load(tasks[:150])
+    next_id = 200
+
+    for step in range(300):
+        action = step % 4
+        if action == 0:
+            task = random.choice(model.tasks)
+            model.update(task, done=not task["done"], tags=tuple(random.sample(tags, random.randint(0, 2))))
+        elif action == 1:
+            task = random.choice(model.tasks)
+            due = (TODAY + datetime.timedelta(days=random.randint(-5, 20))).isoformat()
+            model.update(task, due_date=random.choice((due, None)))
+        elif action == 2:
+            model.remove(random.choice(model.tasks))
+        else:
+            task = {"id": next_id, "text": "new", "done": False, "priority": 0, "due_date": None,
+                    "tags": (random.choice(tags),)}
+            next_id += 1
+            model.insert(random.randint(0, len(model.tasks)), task)
+
+        if step % 25 == 0:
+            rebuilt = TaskModel(TODAY)
+            rebuilt.load(list(model.tasks))
+            assert snapshot(model) == snapshot(rebuilt)
+
+def test_revision_changes_only_for_touched_groups():
+    model = TaskModel(TODAY)
+    tasks = [{"id": i, "text": "t", "done": False, "priority": 0, "due_date": None, "tags": ()}
+             for i in range(3)]
+    model.load(tasks)
+    todo, done, untagged = (model.revision("status", "To do"), model.revision("status", "Done"),
+                            model.revision("tag", "Untagged"))
+    model.update(tasks[1], done=True)
+    assert model.revision("status", "To do") != todo
+    assert model.revision("status", "Done") != done
+    assert model.revision("tag", "Untagged") != untagged
+    assert [task["id"] for task in model.members("status", "To do")] == [0, 2]
@@ -0,0 +1,22 @@
+import datetime
+
+from services.database import Database
+from services.migrations import migrate
+from services.todo_pages import GroupCounts
+
+def test_group_counts_follow_the_database(tmp_path):
+    db = Database(str(tmp_path / "pages.db"))
+    migrate(db.connection())
+    db.executemany(
+        "INSERT INTO todos (task, done, tags, due_date) VALUES (?, ?, ?, ?)",
+        [("a", 0, "work,home", "2024-05-14"), ("b", 1, "", "2024-05-15"), ("c", 0, "home", None)]
+    )
+    counts = GroupCounts()
+    today = datetime.date(2024, 5, 15)
+    assert counts.get(db, "status", today) == {"To do": [2, 0], "Done": [0, 1]}
+    assert counts.get(db, "tag", today) == {"work": [1, 0], "home": [2, 0], "Untagged": [0, 1]}
+    assert counts.get(db, "due", today) == {"Overdue": [1, 0], "Today": [0, 1], "No date": [1, 0]}
+
+    db.execute("UPDATE todos SET deleted_at = 1 WHERE task = 'c'")
+    assert counts.get(db, "tag", today) == {"work": [1, 0], "home": [1, 0], "Untagged": [0, 1]}
+    db.close()
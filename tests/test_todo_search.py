@@ -0,0 +1,39 @@
+from services.database import Database
+from services.migrations import migrate
+from services.todo_search import search_tasks
+
+def database(tmp_path):
+    db = Database(str(tmp_path / "search.db"))
+    migrate(db.connection())
+    db.executemany("INSERT INTO todos (task, done) VALUES (?, ?)", [
+        ("write the report", 0), ("review budget report", 1), ("call the bank", 0), ("100% done_ish", 0),
+    ])
+    return db
+
+def found(db, text, **kwargs):
+    return sorted(task for _, task, _, _ in search_tasks(db, text, **kwargs))
+
+def check_search(db):
+    assert found(db, "rep") == ["review budget report", "write the report"]
+    assert found(db, "rep bud") == ["review budget report"]
+    assert found(db, "rep", done=False) == ["write the report"]
+    assert found(db, "") == []
+    db.execute("UPDATE todos SET deleted_at = 1 WHERE task = 'call the bank'")
+    assert found(db, "bank") == []
+
+def test_prefix_search(tmp_path):
+    db = database(tmp_path)
+    check_search(db)
+    assert search_tasks(db, "budg")[0][3] == "review «budget» report"
+    db.close()
+
+def test_like_fallback_without_fts(tmp_path):
+    db = database(tmp_path)
+    with db.transaction() as conn:
+        for trigger in ("insert", "delete", "update"):
+            conn.execute(f"DROP TRIGGER todos_fts_{trigger}")
+        conn.execute("DROP TABLE todos_fts")
+    check_search(db)
+    # LIKE wildcards typed by the user are matched literally
+    assert found(db, "done_") == ["100% done_ish"]
+    db.close()
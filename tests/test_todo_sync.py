@@ -0,0 +1,38 @@
+from services.database import Database
+from services.migrations import migrate
+from services.todo_sync import FakeFirestore, SyncEngine
+
+def machines(tmp_path, remote, *names):
+    engines = []
+    for name in names:
+        db = Database(str(tmp_path / f"{name}.db"))
+        migrate(db.connection())
+        engines.append(SyncEngine(db, remote))
+    return engines
+
+def tasks(engine):
+    return engine.db.fetchall("SELECT task FROM todos WHERE deleted_at IS NULL ORDER BY task")
+
+def test_changes_pushed_late_are_pulled(tmp_path):
+    remote = FakeFirestore()
+    a, b, c = machines(tmp_path, remote, "a", "b", "c")
+    # a's task is older than b's but reaches the server after c has seen b's
+    a.db.execute("INSERT INTO todos (task, updated_at) VALUES ('from a', 1000)")
+    b.db.execute("INSERT INTO todos (task, updated_at) VALUES ('from b', 2000)")
+    b.sync_once()
+    c.sync_once()
+    a.sync_once()
+    c.sync_once()
+    assert tasks(c) == [("from a",), ("from b",)]
+
+def test_equal_update_times_converge(tmp_path):
+    remote = FakeFirestore()
+    a, b = machines(tmp_path, remote, "a", "b")
+    a.db.execute("INSERT INTO todos (task, uuid, updated_at) VALUES ('task', 'same', 1000)")
+    a.sync_once()
+    b.sync_once()
+    a.db.execute("UPDATE todos SET task = 'edited on a', updated_at = 2000, synced = 0 WHERE uuid = 'same'")
+    b.db.execute("UPDATE todos SET task = 'edited on b', updated_at = 2000, synced = 0 WHERE uuid = 'same'")
+    for engine in (a, b, a, b):
+        engine.sync_once()
+    assert tasks(a) == tasks(b)
@@ -0,0 +1,77 @@
+import time
+import tkinter as tk
+
+import pytest
+
+ctk = pytest.importorskip("customtkinter")
+
+from services.database import Database, get_database
+from services.migrations import migrate
+from services.todo_pages import PAGE_SIZE
+from services.todo_sync import FakeFirestore, SyncEngine
+from ui.widgets.todo import TodoWidget
+
+@pytest.fixture
+def root():
+    try:
+        root = ctk.CTk()
+    except tk.TclError as e:
+        pytest.skip(f"No display: {e}")
+    yield root
+    root.destroy()
+
+def wait(root, condition, timeout=10):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline
+        root.update()
+        time.sleep(0.005)
+
+def test_delete_search_result_not_loaded_yet(tmp_path, root):
+    path = str(tmp_path / "todos.db")
+    db = get_database(path)
+    migrate(db.connection())
+    # The oldest task is past the first page
+    db.execute("INSERT INTO todos (task) VALUES ('find the needle')")
+    db.executemany("INSERT INTO todos (task) VALUES (?)", ((f"task {i}",) for i in range(PAGE_SIZE)))
+
+    widget = TodoWidget(root, None, path)
+    wait(root, lambda: widget.model.tasks)
+    widget.search_entry.insert(0, "needle")
+    widget.update_search()
+    wait(root, lambda: widget._search)
+    hit = widget._search[0]
+    assert hit not in widget.model
+
+    widget.delete_task(hit)
+    assert widget._search == []
+    done = []
+    widget._flush_journal(lambda: done.append(True))
+    wait(root, lambda: done)
+    assert db.fetchone("SELECT deleted_at IS NOT NULL FROM todos WHERE id = ?", (hit["id"],)) == (1,)
+    widget.destroy()
+
+def test_tasks_pulled_by_sync_are_shown(tmp_path, root, monkeypatch):
+    monkeypatch.setattr("ui.widgets.todo.SYNC_POLL_INTERVAL", 10)
+    remote = FakeFirestore()
+    path = str(tmp_path / "todos.db")
+    here, there = get_database(path), Database(str(tmp_path / "other.db"))
+    for db in (here, there):
+        migrate(db.connection())
+    sync, other = SyncEngine(here, remote), SyncEngine(there, remote)
+    here.execute("INSERT INTO todos (task) VALUES ('task')")
+    sync.sync_once()
+    other.sync_once()
+
+    widget = TodoWidget(root, None, path, sync=sync)
+    wait(root, lambda: widget.model.tasks)
+    there.execute("UPDATE todos SET task = 'edited elsewhere'")
+    other.sync_once()
+    sync.sync_once()
+    wait(root, lambda: [task["text"] for task in widget.model.tasks] == ["edited elsewhere"])
+
+    # Local changes ask for a sync round once written
+    widget.toggle_task(widget.model.tasks[0], True)
+    wait(root, lambda: sync._wake.is_set())
+    widget.destroy()
+    there.close()
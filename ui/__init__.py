@@ -4,6 +4,7 @@ from .sidebar import SideBar
 from .explorer import FileExplorer
 from .tabs import VSCodeTabView
 from .file_viewer import FileViewer
+from .quick_open import QuickOpen
 
 __all__ = [
     'WelcomeScreen',
@@ -11,5 +12,6 @@ __all__ = [
     'SideBar',
     'FileExplorer',
     'VSCodeTabView',
-    'FileViewer'
+    'FileViewer',
+    'QuickOpen'
 ] 
\ No newline at end of file
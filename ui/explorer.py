@@ -1,10 +1,116 @@
 import os
+import json
+import time
+import queue
+import threading
+from itertools import islice
 import customtkinter as ctk
 from PIL import Image, ImageTk
 import tkinter as tk
+from tkinter import messagebox
+from services.ignore import IgnoreMatcher, DEFAULT_EXCLUDES
+from services.file_stats import StatWorker, format_size
+from services.folder_sizes import FolderSizes
+from services.file_ops import FileOperation, FileOperationQueue
+
+# Rows rendered per page when expanding a directory
+PAGE_SIZE = 200
+
+# Larger listings are not written to the persisted snapshot
+SNAPSHOT_MAX_ENTRIES = 2000
+
+# Optional metadata columns: (name, menu label, width), left to right
+COLUMNS = (
+    ("size", "Size", 64),
+    ("mtime", "Modified", 104),
+    ("git", "Git Status", 16),
+)
+
+SORT_KEYS = (
+    ("name", "Sort by Name"),
+    ("size", "Sort by Size"),
+    ("mtime", "Sort by Modified"),
+)
+
+# Status bar verbs for running file operations
+OPERATION_VERBS = {
+    "create_file": "Creating",
+    "create_folder": "Creating",
+    "copy": "Copying",
+    "move": "Moving",
+    "delete": "Deleting",
+}
+
+GIT_STATUS_COLORS = {
+    "M": "#E2C08D",
+    "U": "#73C991",
+    "A": "#81B88B",
+    "D": "#C74E39",
+    "R": "#73C991",
+    "!": "#C74E39",
+}
+
+def _sort_entries(entries):
+    # Sort directories first, then files, both in alphabetical order
+    entries.sort(key=lambda e: (not e[1], e[0].lower()))
+
+def _read_entries(path, ignore, it, limit=None):
+    """Read (name, is_dir) tuples from a scandir iterator, skipping ignored entries.
+
+    Returns the entries and whether the iterator was exhausted.
+    """
+    entries = []
+    while limit is None or len(entries) < limit:
+        batch = list(islice(it, 256 if limit is None else min(256, limit - len(entries))))
+        if not batch:
+            return entries, True
+        # Skip ignored entries (.gitignore, user excludes)
+        for entry in ignore.filter_entries(path, batch):
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                is_dir = False
+            entries.append((entry.name, is_dir))
+    return entries, False
+
+def scan_directory(path, ignore):
+    """List a directory as {"mtime": ns, "entries": [(name, is_dir)], "complete": True}"""
+    # Read the mtime first so changes made while listing are caught next time
+    mtime = os.stat(path).st_mtime_ns
+    with os.scandir(path) as it:
+        entries, _ = _read_entries(path, ignore, it)
+    _sort_entries(entries)
+    return {"mtime": mtime, "entries": entries, "complete": True}
+
+def scan_directory_page(path, ignore, limit):
+    """Read and sort only the first `limit` entries of a directory.
+
+    Returns the (possibly incomplete) listing and the open scandir
+    iterator to finish it with, or None if the directory was read fully.
+    """
+    mtime = os.stat(path).st_mtime_ns
+    it = os.scandir(path)
+    try:
+        entries, exhausted = _read_entries(path, ignore, it, limit)
+    except OSError:
+        it.close()
+        raise
+    if exhausted:
+        it.close()
+        it = None
+    _sort_entries(entries)
+    return {"mtime": mtime, "entries": entries, "complete": it is None}, it
+
+def finish_directory_scan(path, ignore, listing, it):
+    """Read the rest of a paged listing and return the complete, sorted listing"""
+    with it:
+        rest, _ = _read_entries(path, ignore, it)
+    entries = listing["entries"] + rest
+    _sort_entries(entries)
+    return {"mtime": listing["mtime"], "entries": entries, "complete": True}
 
 class FileExplorer(ctk.CTkFrame):
-    def __init__(self, master, app):
+    def __init__(self, master, app, state=None):
         super().__init__(master, fg_color="#252526", corner_radius=0)
         self.app = app  # Store reference to main app
         
@@ -32,7 +138,8 @@ class FileExplorer(ctk.CTkFrame):
             ("New File", "add.png", self.create_new_file),
             ("New Folder", "folder.png", self.create_new_folder),
             ("Refresh", "refresh.png", self.refresh_tree),
-            ("Collapse", "collapse.png", self.collapse_all)
+            ("Collapse", "collapse.png", self.collapse_all),
+            ("Columns and Sort", "list.png", self.show_view_menu)
         ]
         
         for text, icon_name, command in toolbar_buttons:
@@ -68,12 +175,81 @@ class FileExplorer(ctk.CTkFrame):
             scrollbar_button_hover_color="#4F4F4F"
         )
         self.tree_container.pack(fill="both", expand=True)
+        self.tree_container.bind("<Button-3>", lambda e: self.show_context_menu(e, None))
+        
+        # Rows that scroll into view get their metadata columns filled in
+        canvas = self.tree_container._parent_canvas
+        scrollbar = self.tree_container._scrollbar
+        
+        def on_yview(first, last):
+            scrollbar.set(first, last)
+            self._schedule_column_check()
+            
+        canvas.configure(yscrollcommand=on_yview)
+        canvas.bind("<Configure>", lambda e: self._schedule_column_check(), add="+")
+        
+        # Progress of background file operations, shown while any are running
+        self.operations_bar = ctk.CTkFrame(self, fg_color="#252526", corner_radius=0)
+        self.operation_label = ctk.CTkLabel(
+            self.operations_bar,
+            text="",
+            font=ctk.CTkFont(size=11),
+            anchor="w",
+            text_color="#CCCCCC"
+        )
+        self.operation_label.pack(fill="x", padx=8, pady=(4, 0))
+        progress_row = ctk.CTkFrame(self.operations_bar, fg_color="transparent")
+        progress_row.pack(fill="x", padx=8, pady=(2, 6))
+        self.operation_progress = ctk.CTkProgressBar(progress_row, height=6, progress_color="#007ACC")
+        self.operation_progress.pack(side="left", fill="x", expand=True)
+        ctk.CTkButton(
+            progress_row,
+            text="Cancel",
+            width=56,
+            height=20,
+            fg_color="transparent",
+            hover_color="#404040",
+            text_color="#CCCCCC",
+            font=ctk.CTkFont(size=11),
+            command=self.cancel_operations
+        ).pack(side="left", padx=(6, 0))
         
         # Initialize empty tree
         self.current_path = None
         self.tree_items = {}
-        self.selected_item = None
-        self.refresh_tree()
+        self.selected_item = None  # Last clicked row
+        self.selected_items = set()  # All selected rows, for batch operations
+        self.listings = {}  # {dir path: scan_directory() result}, the tree model
+        self.ignore = None
+        self._more_rows = {}  # {dir path: "load more" row} for partially shown directories
+        self._paging_check = None
+        
+        # Metadata columns and sorting; stats are read lazily for the rows on screen
+        self.columns = []
+        self.sort_key = "name"
+        self.stats = StatWorker()
+        self.git_status = {}  # {path: status letter}
+        self._stat_fresh = set()  # Paths stated since their directory last changed
+        self._sorted = {}  # {dir path: (listing, sort key, entries)}
+        self._prefetching = {}  # {dir path: (listing, future)} stats read for sorting
+        self._column_check = None
+        self._column_signature = None
+        self._stat_jobs = []  # Futures of the stats requested for rows on screen
+        
+        # Recursive folder sizes, computed on demand
+        self.folder_sizes = FolderSizes()
+        self.folder_size_job = None
+        
+        # Create, copy, move and delete run on a worker thread
+        self.file_ops = FileOperationQueue()
+        self._operations_poll = None  # after() id of the progress poll while operations run
+        self.clipboard = None  # ("copy" or "move", [paths])
+        self._drag = None
+        
+        if state and os.path.isdir(state.get("root") or ""):
+            self.restore_state(state)
+        else:
+            self.refresh_tree()
         
     def create_tree_item(self, parent, name, path, is_dir, level):
         # Create frame for this item
@@ -159,8 +335,23 @@ class FileExplorer(ctk.CTkFrame):
         )
         name_label.pack(side="left", fill="x", expand=True, padx=0, pady=0)
         
+        # Add the enabled metadata columns, filled in once the row is stated
+        column_labels = {}
+        for column, _, width in reversed(COLUMNS):
+            if column in self.columns:
+                label = ctk.CTkLabel(
+                    item_frame,
+                    text="",
+                    font=ctk.CTkFont(size=11),
+                    width=width,
+                    anchor="e",
+                    text_color="#858585"
+                )
+                label.pack(side="right", padx=(0, 4), pady=0)
+                column_labels[column] = label
+        
         # Store item info
-        self.tree_items[path] = {
+        item = {
             "frame": item_frame,
             "is_dir": is_dir,
             "level": level,
@@ -168,35 +359,65 @@ class FileExplorer(ctk.CTkFrame):
             "children_container": None,
             "arrow_label": arrow_label if is_dir else None,
             "name_label": name_label,
-            "icon_label": icon_label
+            "icon_label": icon_label,
+            "columns": column_labels,
+            "column_values": {}
         }
+        self.tree_items[path] = item
+        if column_labels:
+            self._update_columns(path, item)
+        
+        # Drop the entry as soon as its row is destroyed (collapse, refresh)
+        def on_destroy(e):
+            if self.tree_items.get(path) is item:
+                del self.tree_items[path]
+                
+        item_frame.bind("<Destroy>", on_destroy, add="+")
+        
+        # Restore the highlight when a selected row is re-created
+        if path in self.selected_items:
+            item_frame.configure(fg_color="#37373D")
         
         # Define event handlers
         def on_click(e):
-            self.item_clicked(path, is_dir)
+            self._drag = {"sources": None, "x": e.x_root, "y": e.y_root, "path": path}
+            if e.state & 0x0004:  # Control extends the selection
+                self.toggle_selection(path)
+            else:
+                self.item_clicked(path, is_dir)
             return "break"  # Prevent event propagation
             
         def on_double_click(e):
             if is_dir:
                 self.toggle_directory(path)
-            else:
-                self.item_clicked(path, is_dir)
+            elif not self.is_image_file(path) and hasattr(self.app, 'open_file'):
+                # Keep the file open instead of previewing it
+                self.app.open_file(path)
             return "break"  # Prevent event propagation
             
         def on_enter(e):
-            if self.selected_item != path:
+            if path not in self.selected_items:
                 item_frame.configure(fg_color="#2A2D2E")
             
         def on_leave(e):
-            if self.selected_item != path:
+            if path not in self.selected_items:
                 item_frame.configure(fg_color="transparent")
+                
+        def on_right_click(e):
+            if path not in self.selected_items:
+                self.select_item(path)
+            self.show_context_menu(e, path)
+            return "break"
         
         # Bind events to all components
-        for widget in [item_frame, name_label, icon_label]:
+        for widget in [item_frame, name_label, icon_label, *column_labels.values()]:
             widget.bind("<Button-1>", on_click)
             widget.bind("<Double-Button-1>", on_double_click)
             widget.bind("<Enter>", on_enter)
             widget.bind("<Leave>", on_leave)
+            widget.bind("<Button-3>", on_right_click)
+            widget.bind("<B1-Motion>", self._on_drag_motion)
+            widget.bind("<ButtonRelease-1>", self._on_drag_release)
         
     def get_file_icon(self, filename):
         """Get the appropriate icon for a file based on its extension"""
@@ -272,27 +493,22 @@ class FileExplorer(ctk.CTkFrame):
                 self.expand_directory(path, item)
                 
     def expand_directory(self, path, item):
-        """Expand a directory and show its contents"""
+        """Expand a directory and show the first page of its contents"""
         if not item["is_dir"]:
             return
             
-        # Create container for children that comes after the current item
-        container = ctk.CTkFrame(self.tree_container, fg_color="transparent")
+        # Create container for children that comes after the current item,
+        # in the same parent so collapsing an ancestor destroys it too
+        container = ctk.CTkFrame(item["frame"].master, fg_color="transparent")
         container.pack(fill="x", after=item["frame"])
         item["children_container"] = container
         item["expanded"] = True
+        item["shown"] = 0
+        item["children"] = []  # Child paths in display order
         
         try:
-            # List directory contents
-            entries = os.listdir(path)
-            # Sort directories first, then files, both in alphabetical order
-            entries.sort(key=lambda x: (not os.path.isdir(os.path.join(path, x)), x.lower()))
-            
-            for entry in entries:
-                if not entry.startswith('.'):  # Skip hidden files
-                    entry_path = os.path.join(path, entry)
-                    is_dir = os.path.isdir(entry_path)
-                    self.create_tree_item(container, entry, entry_path, is_dir, item["level"] + 1)
+            self.list_directory(path)
+            self.show_more(path)
         except Exception as e:
             print(f"Error expanding directory: {e}")
             if item["arrow_label"]:
@@ -302,39 +518,191 @@ class FileExplorer(ctk.CTkFrame):
                 item["children_container"] = None
             item["expanded"] = False
             
+    def list_directory(self, path):
+        """Return the entries of a directory, from the cached listing when available.
+        
+        A cached listing is served only while the directory's mtime still
+        matches. Huge directories return only their first sorted page at
+        first; the rest is read and sorted on a worker thread.
+        """
+        listing = self.listings.get(path)
+        if listing is not None and listing["complete"] and os.stat(path).st_mtime_ns != listing["mtime"]:
+            # Changed since it was cached, e.g. by another program
+            del self.listings[path]
+            self._mark_stale(path)
+            listing = None
+        if listing is None:
+            listing, remaining = scan_directory_page(path, self.ignore, PAGE_SIZE)
+            self.listings[path] = listing
+            if remaining is not None:
+                self._finish_listing(path, listing, remaining)
+        return listing["entries"]
+        
+    def _finish_listing(self, path, listing, iterator):
+        """Complete a paged listing on a worker thread"""
+        results = queue.Queue()
+        ignore = self.ignore
+        
+        def work():
+            try:
+                results.put(finish_directory_scan(path, ignore, listing, iterator))
+            except OSError as e:
+                print(f"Error listing directory: {e}")
+                results.put(dict(listing, complete=True))
+                
+        threading.Thread(target=work, name="ExplorerListing", daemon=True).start()
+        self._poll_listing(path, results)
+        
+    def _poll_listing(self, path, results):
+        """Swap in the complete listing once the worker is done"""
+        if not self.winfo_exists():
+            return
+        try:
+            listing = results.get_nowait()
+        except queue.Empty:
+            self.after(50, lambda: self._poll_listing(path, results))
+            return
+        self.listings[path] = listing
+        # Rows shown so far came from a partial sort, render them again
+        self.reload_directory(path)
+        
+    def show_more(self, path):
+        """Render the next page of an expanded directory"""
+        item = self.tree_items.get(path)
+        listing = self.listings.get(path)
+        if not item or not item["expanded"] or listing is None:
+            return
+            
+        more_row = self._more_rows.pop(path, None)
+        if more_row is not None:
+            more_row.destroy()
+            
+        entries = self._ordered_entries(path)
+        start = item["shown"]
+        end = min(len(entries), start + PAGE_SIZE)
+        container = item["children_container"]
+        for name, is_dir in entries[start:end]:
+            child = os.path.join(path, name)
+            self.create_tree_item(container, name, child, is_dir, item["level"] + 1)
+            item["children"].append(child)
+        item["shown"] = end
+        
+        if end < len(entries) or not listing["complete"]:
+            self._create_more_row(container, path, item["level"] + 1, listing)
+        self._schedule_column_check()
+            
+    def _create_more_row(self, parent, path, level, listing):
+        """Add a row that loads the next page when clicked or scrolled into view"""
+        if listing["complete"]:
+            remaining = len(listing["entries"]) - self.tree_items[path]["shown"]
+            text = f"Show more ({remaining} remaining)"
+        else:
+            text = "Loading..."
+            
+        row = ctk.CTkLabel(
+            parent,
+            text=text,
+            font=ctk.CTkFont(size=12),
+            anchor="w",
+            height=22,
+            text_color="#858585",
+            cursor="hand2"
+        )
+        row.pack(fill="x", padx=(level * 16 + 18, 0), pady=0)
+        row.bind("<Button-1>", lambda e: self.show_more(path))
+        
+        def on_destroy(e):
+            if self._more_rows.get(path) is row:
+                del self._more_rows[path]
+                
+        row.bind("<Destroy>", on_destroy, add="+")
+        self._more_rows[path] = row
+        self._schedule_paging_check()
+        
+    def _schedule_paging_check(self):
+        if self._paging_check is None:
+            self._paging_check = self.after(150, self._check_paging)
+            
+    def _check_paging(self):
+        """Load the next page of directories whose "more" row scrolled into view"""
+        self._paging_check = None
+        if not self.winfo_exists() or not self._more_rows:
+            return
+            
+        if self.winfo_ismapped():
+            canvas = self.tree_container._parent_canvas
+            bottom = canvas.winfo_rooty() + canvas.winfo_height()
+            for path, row in list(self._more_rows.items()):
+                listing = self.listings.get(path)
+                if listing and listing["complete"] and row.winfo_ismapped() and row.winfo_rooty() < bottom:
+                    self.show_more(path)
+                    
+        if self._more_rows:
+            self._schedule_paging_check()
+            
+    def reload_directory(self, path):
+        """Re-render an expanded directory from its current listing"""
+        item = self.tree_items.get(path)
+        if not item or not item["expanded"]:
+            return
+        prefix = path.rstrip(os.sep) + os.sep
+        expanded = [p for p, i in self.tree_items.items() if i["expanded"] and p.startswith(prefix)]
+        shown = item["shown"]
+        self.toggle_directory(path)
+        self.toggle_directory(path)
+        # Keep as many rows as were shown before
+        item = self.tree_items.get(path)
+        while item and item["expanded"] and item["shown"] < shown and path in self._more_rows:
+            self.show_more(path)
+        # Re-expand nested folders that still exist, parents first
+        for nested in sorted(expanded, key=lambda p: p.count(os.sep)):
+            nested_item = self.tree_items.get(nested)
+            if nested_item and not nested_item["expanded"]:
+                self.toggle_directory(nested)
+                
     def item_clicked(self, path, is_dir):
         """Handle item click"""
-        # Update selection
-        if self.selected_item:
-            old_item = self.tree_items.get(self.selected_item)
-            if old_item and old_item["frame"].winfo_exists():
-                try:
-                    old_item["frame"].configure(fg_color="transparent")
-                except tk.TclError:
-                    # Remove invalid item from tree_items
-                    del self.tree_items[self.selected_item]
-                
-        # Clean up any destroyed items from tree_items
-        invalid_paths = []
-        for item_path, item_data in self.tree_items.items():
-            if not item_data["frame"].winfo_exists():
-                invalid_paths.append(item_path)
-        for invalid_path in invalid_paths:
-            del self.tree_items[invalid_path]
+        self.select_item(path)
+        
+        if path in self.tree_items and not is_dir:
+            if self.is_image_file(path):
+                # Show image preview for image files
+                self.show_image_preview(path)
+            else:
+                # Preview text files, reusing the preview tab
+                if hasattr(self.app, 'open_file'):
+                    self.app.open_file(path, preview=True)
+                    
+    def select_item(self, path):
+        """Select a single row, touching only the rows whose highlight changes"""
+        if self.selected_items == {path}:
+            self.selected_item = path
+            return
+            
+        for old_path in self.selected_items - {path}:
+            self._set_highlight(old_path, False)
                 
         self.selected_item = path
-        current_item = self.tree_items.get(path)
-        if current_item and current_item["frame"].winfo_exists():
-            current_item["frame"].configure(fg_color="#37373D")
-            
-            if not is_dir:
-                if self.is_image_file(path):
-                    # Show image preview for image files
-                    self.show_image_preview(path)
-                else:
-                    # Open file in editor for text files
-                    if hasattr(self.app, 'open_file'):
-                        self.app.open_file(path)
+        self.selected_items = {path}
+        self._set_highlight(path, True)
+        
+    def toggle_selection(self, path):
+        """Add a row to the selection or remove it"""
+        if path in self.selected_items:
+            self.selected_items.discard(path)
+            self._set_highlight(path, False)
+        else:
+            self.selected_items.add(path)
+            self._set_highlight(path, True)
+        self.selected_item = path
+        
+    def _set_highlight(self, path, selected):
+        item = self.tree_items.get(path)
+        if item:
+            try:
+                item["frame"].configure(fg_color="#37373D" if selected else "transparent")
+            except tk.TclError:
+                pass
                 
     def item_double_clicked(self, path, is_dir):
         """Handle item double click"""
@@ -343,51 +711,611 @@ class FileExplorer(ctk.CTkFrame):
             
     def create_new_file(self):
         """Create a new file"""
-        if self.selected_item and os.path.isdir(self.selected_item):
-            parent_dir = self.selected_item
-        else:
-            parent_dir = self.current_path
-            
+        parent_dir = self._target_directory()
         if parent_dir:
-            # TODO: Implement new file dialog
-            pass
+            name = self._ask_name("New File", "File name:")
+            if name:
+                self.file_ops.submit(FileOperation("create_file", [], os.path.join(parent_dir, name)))
+                self._watch_operations()
             
     def create_new_folder(self):
         """Create a new folder"""
+        parent_dir = self._target_directory()
+        if parent_dir:
+            name = self._ask_name("New Folder", "Folder name:")
+            if name:
+                self.file_ops.submit(FileOperation("create_folder", [], os.path.join(parent_dir, name)))
+                self._watch_operations()
+                
+    def _target_directory(self):
+        """Return the folder new or pasted items go to: the selection's folder"""
         if self.selected_item and os.path.isdir(self.selected_item):
-            parent_dir = self.selected_item
+            return self.selected_item
+        if self.selected_item:
+            return os.path.dirname(self.selected_item)
+        return self.current_path
+        
+    def _ask_name(self, title, prompt):
+        """Ask for a single file or folder name, or return None"""
+        name = ctk.CTkInputDialog(text=prompt, title=title).get_input()
+        name = (name or "").strip()
+        if not name:
+            return None
+        if name in (".", "..") or "/" in name or os.sep in name:
+            self._notify(f"Invalid name: {name}")
+            return None
+        return name
+        
+    def _selection(self):
+        """Return the selected paths, outermost first, dropping nested ones"""
+        paths = sorted(p for p in self.selected_items if p != self.current_path)
+        selection = []
+        for path in paths:
+            if not selection or not path.startswith(selection[-1].rstrip(os.sep) + os.sep):
+                selection.append(path)
+        return selection
+        
+    def copy_selection(self):
+        selection = self._selection()
+        if selection:
+            self.clipboard = ("copy", selection)
+            
+    def cut_selection(self):
+        selection = self._selection()
+        if selection:
+            self.clipboard = ("move", selection)
+            
+    def paste(self):
+        """Copy or move the clipboard into the selected folder"""
+        if not self.clipboard:
+            return
+        kind, paths = self.clipboard
+        target = self._target_directory()
+        if kind == "move":
+            # A cut is pasted once
+            self.clipboard = None
+        self.file_ops.submit(FileOperation(kind, paths, target))
+        self._watch_operations()
+        
+    def delete_selection(self):
+        """Delete the selected items after confirmation"""
+        selection = self._selection()
+        if not selection:
+            return
+        if len(selection) == 1:
+            question = f"Permanently delete '{os.path.basename(selection[0])}'?"
         else:
-            parent_dir = self.current_path
+            question = f"Permanently delete {len(selection)} items?"
+        if messagebox.askyesno("Delete", question, parent=self):
+            self.file_ops.submit(FileOperation("delete", selection))
+            self._watch_operations()
             
-        if parent_dir:
-            # TODO: Implement new folder dialog
-            pass
+    def show_context_menu(self, event, path):
+        """Show the file operations menu for a row, or for the workspace root"""
+        if path is None:
+            self.select_item(self.current_path)
+        has_selection = bool(self._selection())
+        menu = tk.Menu(self, tearoff=0)
+        menu.add_command(label="New File...", command=self.create_new_file)
+        menu.add_command(label="New Folder...", command=self.create_new_folder)
+        menu.add_separator()
+        menu.add_command(label="Cut", command=self.cut_selection, state="normal" if has_selection else "disabled")
+        menu.add_command(label="Copy", command=self.copy_selection, state="normal" if has_selection else "disabled")
+        menu.add_command(label="Paste", command=self.paste, state="normal" if self.clipboard else "disabled")
+        menu.add_separator()
+        menu.add_command(label="Delete", command=self.delete_selection, state="normal" if has_selection else "disabled")
+        menu.tk_popup(event.x_root, event.y_root)
+        
+    def _on_drag_motion(self, event):
+        """Start dragging the selection once the pointer moved a few pixels"""
+        drag = self._drag
+        if drag is None:
+            return
+        if drag["sources"] is None:
+            if abs(event.x_root - drag["x"]) + abs(event.y_root - drag["y"]) < 6:
+                return
+            if drag["path"] not in self.selected_items:
+                self.select_item(drag["path"])
+            drag["sources"] = self._selection()
+            self.configure(cursor="fleur")
+            
+    def _on_drag_release(self, event):
+        """Move dragged items into the folder under the pointer"""
+        drag, self._drag = self._drag, None
+        if drag is None or drag["sources"] is None:
+            return
+        self.configure(cursor="")
+        target = self._row_at(event.x_root, event.y_root)
+        if target is None:
+            return
+        if not self.tree_items[target]["is_dir"]:
+            target = os.path.dirname(target)
+        sources = [p for p in drag["sources"] if os.path.dirname(p) != target and p != target]
+        if sources:
+            self.file_ops.submit(FileOperation("move", sources, target))
+            self._watch_operations()
+            
+    def _row_at(self, x_root, y_root):
+        """Return the path of the row under a screen position, or None"""
+        widget = self.winfo_containing(x_root, y_root)
+        frames = {item["frame"]: path for path, item in self.tree_items.items()}
+        while widget is not None:
+            if widget in frames:
+                return frames[widget]
+            widget = widget.master
+        return None
+        
+    def cancel_operations(self):
+        """Cancel the running and queued file operations"""
+        for op in self.file_ops.active:
+            op.cancel()
+            
+    def _watch_operations(self):
+        """Start polling the file operations unless a poll loop is already running"""
+        if self._operations_poll is None:
+            self._poll_operations()
+            
+    def _poll_operations(self):
+        """Show progress of file operations and refresh folders they changed"""
+        self._operations_poll = None
+        if not self.winfo_exists():
+            return
+        for op in self.file_ops.finished():
+            self._operation_finished(op)
+            
+        active = self.file_ops.active
+        if not active:
+            self.operations_bar.pack_forget()
+            return
+            
+        op = active[0]
+        text = f"{OPERATION_VERBS[op.kind]} {os.path.basename(op.current or op.target or '')}"
+        if len(active) > 1:
+            text += f" (+{len(active) - 1} queued)"
+        self.operation_label.configure(text=text)
+        self.operation_progress.set(op.progress)
+        if not self.operations_bar.winfo_ismapped():
+            self.operations_bar.pack(fill="x", side="bottom", before=self.tree_container)
+        self._operations_poll = self.after(100, self._poll_operations)
+        
+    def _operation_finished(self, op):
+        # Forget listings and stats of everything the operation touched
+        for path in op.sources + op.created:
+            self.stats.cache.invalidate(path)
+            prefix = path.rstrip(os.sep) + os.sep
+            for listed in [p for p in self.listings if p == path or p.startswith(prefix)]:
+                del self.listings[listed]
+        for folder in op.affected_directories():
+            self._mark_stale(folder)
+            self.listings.pop(folder, None)
+            item = self.tree_items.get(folder)
+            if item and item["expanded"]:
+                self.reload_directory(folder)
+                
+        self.selected_items = {p for p in self.selected_items if os.path.lexists(p)}
+        if (op.created or op.kind in ("move", "delete")) and hasattr(self.app, 'invalidate_path_index'):
+            self.app.invalidate_path_index()
+        if op.error is not None:
+            self._notify(f"{OPERATION_VERBS[op.kind]} failed: {op.error}")
+        elif op.kind == "create_file" and not op.cancelled:
+            self.select_item(op.target)
+            if hasattr(self.app, 'open_file'):
+                self.app.open_file(op.target)
+                
+    def _notify(self, message):
+        if hasattr(self.app, 'show_error_notification'):
+            self.app.show_error_notification(message)
+        else:
+            print(message)
             
     def collapse_all(self):
         """Collapse all expanded directories"""
-        for path, item in self.tree_items.items():
-            if item["is_dir"] and item["expanded"]:
+        # Collapsing destroys rows, which removes them from tree_items
+        for path, item in list(self.tree_items.items()):
+            if path in self.tree_items and item["is_dir"] and item["expanded"]:
                 self.toggle_directory(path)
                 
     def refresh_tree(self):
         """Refresh the file tree"""
-        # Clear existing tree items
-        for widget in self.tree_container.winfo_children():
-            widget.destroy()
-        self.tree_items.clear()
+        self.listings.clear()
         self.selected_item = None
+        self.selected_items = set()
         
         # Get current working directory
         if self.current_path is None:
             self.current_path = os.getcwd()
             
+        self.ignore = self._get_ignore_matcher()
+        self.ignore.invalidate()
+        self.stats.cache.invalidate()
+        self._stat_fresh.clear()
+        self._sorted.clear()
+        self._prefetching.clear()
+        self._build_tree()
+        self._refresh_git_status()
+        
+        # Quick Open crawls the workspace again when next shown
+        if hasattr(self.app, 'invalidate_path_index'):
+            self.app.invalidate_path_index()
+        
+    def _get_ignore_matcher(self):
+        """Return the ignore rules for the workspace, shared with the app when possible"""
+        if hasattr(self.app, 'get_ignore_matcher'):
+            return self.app.get_ignore_matcher(self.current_path)
+        return IgnoreMatcher(self.current_path, DEFAULT_EXCLUDES)
+        
+    def _build_tree(self, expanded=()):
+        """Rebuild the rows from the tree model, expanding the given folders"""
+        # Clear existing tree items
+        for widget in self.tree_container.winfo_children():
+            widget.destroy()
+        self.tree_items.clear()
+            
         # Create root item
         root_name = os.path.basename(self.current_path) or self.current_path
         self.create_tree_item(self.tree_container, root_name, self.current_path, True, 0)
         
         # Expand root
         self.toggle_directory(self.current_path)
+        
+        # Expand the remaining folders, parents first
+        for path in sorted(expanded, key=lambda p: p.count(os.sep)):
+            item = self.tree_items.get(path)
+            if item and item["is_dir"] and not item["expanded"]:
+                self.toggle_directory(path)
+                
+    def get_state(self):
+        """Return a JSON serializable snapshot of the tree"""
+        expanded = [p for p, i in self.tree_items.items() if i["is_dir"] and i["expanded"]]
+        try:
+            scroll = self.tree_container._parent_canvas.yview()[0]
+        except (AttributeError, tk.TclError):
+            scroll = 0.0
+        return {
+            "root": self.current_path,
+            "expanded": expanded,
+            "selected": self.selected_item,
+            "scroll": scroll,
+            "columns": self.columns,
+            "sort": self.sort_key,
+            "listings": {
+                p: {"mtime": self.listings[p]["mtime"], "entries": self.listings[p]["entries"]}
+                for p in expanded
+                if p in self.listings and self.listings[p]["complete"]
+                and len(self.listings[p]["entries"]) <= SNAPSHOT_MAX_ENTRIES
+            }
+        }
+        
+    def restore_state(self, state):
+        """Show a snapshot from get_state() instantly, then revalidate it"""
+        self.current_path = state["root"]
+        self.ignore = self._get_ignore_matcher()
+        self.selected_item = state.get("selected")
+        self.selected_items = {self.selected_item} if self.selected_item else set()
+        self.columns = [c for c, _, _ in COLUMNS if c in state.get("columns", ())]
+        self.sort_key = state.get("sort", "name")
+        self.listings = {
+            p: {"mtime": l["mtime"], "entries": [tuple(e) for e in l["entries"]], "complete": True}
+            for p, l in state.get("listings", {}).items()
+        }
+        self._build_tree(state.get("expanded", ()))
+        
+        scroll = state.get("scroll", 0.0)
+        if scroll:
+            self.after_idle(lambda: self.tree_container._parent_canvas.yview_moveto(scroll))
+            
+        self.revalidate()
+        self._refresh_git_status()
+        
+    def save_state(self, state_path):
+        """Write the tree snapshot to disk"""
+        os.makedirs(os.path.dirname(state_path), exist_ok=True)
+        tmp_path = state_path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.get_state(), f)
+        os.replace(tmp_path, state_path)
+        
+    @staticmethod
+    def load_state(state_path):
+        """Read a tree snapshot written by save_state(), or None"""
+        try:
+            with open(state_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+            
+    def revalidate(self):
+        """Re-list cached directories whose mtime changed, on a worker thread"""
+        cached = [(path, listing["mtime"]) for path, listing in self.listings.items()]
+        ignore = self.ignore
+        results = queue.Queue()
+        
+        def work():
+            for path, mtime in cached:
+                try:
+                    if os.stat(path).st_mtime_ns != mtime:
+                        results.put((path, scan_directory(path, ignore)))
+                except OSError:
+                    results.put((path, None))
+            results.put(None)
+            
+        threading.Thread(target=work, name="ExplorerRevalidate", daemon=True).start()
+        self._refresh_git_status()
+        self._poll_revalidation(results)
+        
+    def _poll_revalidation(self, results):
+        """Apply revalidated listings on the Tk thread"""
+        if not self.winfo_exists():
+            return
+        while True:
+            try:
+                result = results.get_nowait()
+            except queue.Empty:
+                self.after(50, lambda: self._poll_revalidation(results))
+                return
+            if result is None:
+                return
+            path, listing = result
+            if listing is None:
+                # Directory is gone, collapse it
+                self.listings.pop(path, None)
+                item = self.tree_items.get(path)
+                if item and item["expanded"]:
+                    self.toggle_directory(path)
+            else:
+                self.listings[path] = listing
+                self._mark_stale(path)
+                self.reload_directory(path)
 
+    def show_view_menu(self):
+        """Pop up the column and sort options under the pointer"""
+        menu = tk.Menu(self, tearoff=0)
+        column_vars = []
+        for column, label, _ in COLUMNS:
+            var = tk.BooleanVar(value=column in self.columns)
+            column_vars.append(var)
+            menu.add_checkbutton(label=label, variable=var, command=lambda c=column: self.toggle_column(c))
+        menu.add_separator()
+        sort_var = tk.StringVar(value=self.sort_key)
+        for key, label in SORT_KEYS:
+            menu.add_radiobutton(label=label, variable=sort_var, value=key, command=lambda k=key: self.set_sort(k))
+        menu.add_separator()
+        menu.add_command(label="Compute Folder Sizes", command=self.compute_folder_sizes)
+        # Keep the variables alive while the menu is shown
+        menu._vars = (column_vars, sort_var)
+        menu.tk_popup(self.winfo_pointerx(), self.winfo_pointery())
+        
+    def toggle_column(self, column):
+        """Show or hide a metadata column"""
+        enabled = set(self.columns) ^ {column}
+        self.columns = [c for c, _, _ in COLUMNS if c in enabled]
+        if column == "git" and column in enabled:
+            self._refresh_git_status()
+        self._rebuild_rows()
+        
+    def set_sort(self, sort_key):
+        """Change the order of entries within each folder"""
+        if sort_key != self.sort_key:
+            self.sort_key = sort_key
+            self._rebuild_rows()
+            
+    def compute_folder_sizes(self):
+        """Total the size of every folder in the workspace, streaming results into the tree"""
+        if not self.current_path:
+            return
+        if self.folder_size_job is not None:
+            self.folder_size_job.cancel()
+        self.folder_size_job = self.folder_sizes.compute(self.current_path)
+        if "size" not in self.columns:
+            self.toggle_column("size")
+        self._poll_folder_sizes(self.folder_size_job)
+        
+    def _poll_folder_sizes(self, job):
+        """Show the partial totals of a running folder size job"""
+        if not self.winfo_exists() or job is not self.folder_size_job:
+            return
+        done = job.done.is_set()
+        for path, item in self.tree_items.items():
+            if item["is_dir"] and "size" in item["columns"]:
+                self._update_columns(path, item)
+        if not done:
+            self.after(250, lambda: self._poll_folder_sizes(job))
+        elif self.sort_key == "size":
+            # Folders can now be ordered by their totals
+            self._sorted.clear()
+            self._rebuild_rows()
+            
+    def _folder_total(self, path):
+        """Return the computed size of a folder and whether it is final"""
+        job = self.folder_size_job
+        if job is None or job.cancelled:
+            return None, False
+        return job.total(path), job.done.is_set()
+        
+    def _rebuild_rows(self):
+        expanded = [p for p, i in self.tree_items.items() if i["is_dir"] and i["expanded"]]
+        self._column_signature = None
+        self._build_tree(expanded)
+        
+    def _ordered_entries(self, path):
+        """Return the entries of a listed directory in the current sort order.
+        
+        Sorting by size or time needs a stat of every entry; the missing
+        ones are read on the stat pool first and the folder is re-rendered
+        when they are in. Entries already in the stat cache are reused.
+        """
+        listing = self.listings[path]
+        entries = listing["entries"]
+        if self.sort_key == "name" or not listing["complete"]:
+            return entries
+            
+        cached = self._sorted.get(path)
+        if cached is not None and cached[0] is listing and cached[1] == self.sort_key:
+            return cached[2]
+            
+        prefetch = self._prefetching.get(path)
+        if prefetch is None or prefetch[0] is not listing:
+            missing = [name for name, _ in entries if self.stats.cache.get(os.path.join(path, name)) is None]
+            if missing:
+                self._prefetch_stats(path, listing, missing)
+                return entries
+        elif not prefetch[1].done():
+            return entries
+            
+        ordered = sorted(entries, key=lambda e: (
+            not e[1], -self._sort_value(os.path.join(path, e[0]), e[1]), e[0].lower()
+        ))
+        self._sorted[path] = (listing, self.sort_key, ordered)
+        return ordered
+        
+    def _sort_value(self, path, is_dir):
+        if self.sort_key == "size" and is_dir:
+            return self._folder_total(path)[0] or 0
+        st = self.stats.cache.get(path)
+        if st is None:
+            return 0
+        return st.mtime_ns if self.sort_key == "mtime" else st.size
+        
+    def _prefetch_stats(self, path, listing, names):
+        future = self.stats.prefetch(path, names)
+        self._prefetching[path] = (listing, future)
+        self._poll_prefetch(path, future)
+        
+    def _poll_prefetch(self, path, future):
+        """Re-render a folder in its sort order once its entries are stated"""
+        if not self.winfo_exists():
+            return
+        if not future.done():
+            self.after(50, lambda: self._poll_prefetch(path, future))
+            return
+        # The prefetch stated these rows, no need to stat them again on screen
+        self._stat_fresh.update(os.path.join(path, name) for name, _ in self.listings.get(path, {}).get("entries", ()))
+        self.reload_directory(path)
+        
+    def _mark_stale(self, path):
+        """Forget that the entries of a changed directory were stated"""
+        prefix = path.rstrip(os.sep) + os.sep
+        self._stat_fresh = {p for p in self._stat_fresh if not (p.startswith(prefix) and os.sep not in p[len(prefix):])}
+        self._sorted.pop(path, None)
+        self._column_signature = None
+        self.folder_sizes.invalidate(path)
+        
+    def _update_columns(self, path, item):
+        """Show the cached metadata of a row, touching only changed labels"""
+        labels = item["columns"]
+        st = self.stats.cache.get(path)
+        values = {}
+        if "size" in labels:
+            if item["is_dir"]:
+                total, final = self._folder_total(path)
+                values["size"] = "" if total is None else format_size(total) + ("" if final else "…")
+            else:
+                values["size"] = format_size(st.size) if st else ""
+        if "mtime" in labels:
+            values["mtime"] = time.strftime("%Y-%m-%d %H:%M", time.localtime(st.mtime_ns / 1e9)) if st else ""
+        if "git" in labels:
+            values["git"] = self.git_status.get(path, "")
+            
+        for column, value in values.items():
+            if item["column_values"].get(column) != value:
+                item["column_values"][column] = value
+                if column == "git":
+                    labels[column].configure(text=value, text_color=GIT_STATUS_COLORS.get(value, "#858585"))
+                else:
+                    labels[column].configure(text=value)
+                    
+    def _schedule_column_check(self):
+        if self._column_check is None and self.columns:
+            self._column_check = self.after(50, self._check_columns)
+            
+    def _check_columns(self):
+        """Request stats for rows that came into view.
+        
+        Runs on scroll, resize and new rows rather than on a timer. Rows
+        are all the same height, so the rows on screen follow from the
+        scroll offset without asking Tk where each one is.
+        """
+        self._column_check = None
+        if not self.winfo_exists() or not self.columns or not self.winfo_ismapped():
+            return
+            
+        canvas = self.tree_container._parent_canvas
+        signature = (canvas.yview(), len(self.tree_items))
+        if signature == self._column_signature:
+            return
+        root = self.tree_items.get(self.current_path)
+        row_height = root["frame"].winfo_height() if root else 0
+        if row_height <= 1:
+            return  # Not laid out yet; the layout scrolls the canvas and checks again
+        self._column_signature = signature
+        
+        top = canvas.canvasy(0)
+        first = int(top // row_height)
+        last = int((top + canvas.winfo_height()) // row_height) + 1
+        visible = [path for path in self._rows_between(first, last) if path not in self._stat_fresh]
+        if visible:
+            idle = not self._stat_jobs
+            self._stat_fresh.update(visible)
+            self._stat_jobs.extend(self.stats.request(visible))
+            if idle:
+                self._poll_stats()
+                
+    def _rows_between(self, first, last):
+        """Return the paths of display rows `first` to `last`, "load more" rows left out"""
+        rows = []
+        index = 0
+        stack = [self.current_path]
+        while stack and index <= last:
+            path = stack.pop()
+            if path is not None:
+                item = self.tree_items.get(path)
+                if item is None:
+                    continue
+                if index >= first:
+                    rows.append(path)
+                if item["expanded"]:
+                    if path in self._more_rows:
+                        stack.append(None)
+                    stack.extend(reversed(item["children"]))
+            index += 1
+        return rows
+        
+    def _poll_stats(self):
+        """Apply finished stats until the requested ones are all in"""
+        if not self.winfo_exists():
+            return
+        # Check the jobs first: a finished job has queued all its results
+        self._stat_jobs = [job for job in self._stat_jobs if not job.done()]
+        for path, _ in self.stats.results():
+            item = self.tree_items.get(path)
+            if item is not None:
+                self._update_columns(path, item)
+        if self._stat_jobs:
+            self.after(50, self._poll_stats)
+            
+    def _refresh_git_status(self):
+        """Read `git status` for the workspace in the background"""
+        if "git" not in self.columns or not self.current_path:
+            return
+        future = self.stats.git_status(self.current_path)
+        
+        def poll():
+            if not self.winfo_exists():
+                return
+            if not future.done():
+                self.after(100, poll)
+                return
+            self.git_status = future.result()
+            for path, item in self.tree_items.items():
+                if "git" in item["columns"]:
+                    self._update_columns(path, item)
+                    
+        poll()
+        
+    def destroy(self):
+        self.stats.shutdown()
+        super().destroy()
+        
     def show_image_preview(self, path):
         """Show image preview in a new tab"""
         try:
@@ -396,8 +1324,12 @@ class FileExplorer(ctk.CTkFrame):
             
             # Create new tab using the app's tab view
             if hasattr(self.app, 'tab_view'):
-                # Create tab
-                tab = self.app.tab_view.add(file_name)
+                if path in self.app.tab_view._tab_dict:
+                    self.app.tab_view.set(path)
+                    return
+                    
+                # Create tab, keyed by path so equally named images don't collide
+                tab = self.app.tab_view.add(path, title=file_name)
                 
                 # Create scrollable frame in the tab
                 scroll_frame = ctk.CTkScrollableFrame(
@@ -407,48 +1339,28 @@ class FileExplorer(ctk.CTkFrame):
                 )
                 scroll_frame.pack(fill="both", expand=True, padx=0, pady=0)
                 
-                # Load and display image
-                image = Image.open(path)
-                
-                # Calculate new size while maintaining aspect ratio
-                # Use tab size instead of fixed size
-                tab.update_idletasks()  # Ensure we have correct dimensions
-                max_width = tab.winfo_width() - 40  # Account for padding and scrollbar
-                max_height = tab.winfo_height() - 40
-                ratio = min(max_width/image.width, max_height/image.height)
-                new_width = int(image.width * ratio)
-                new_height = int(image.height * ratio)
-                
-                # Resize image if needed
-                if ratio < 1:
-                    image = image.resize((new_width, new_height), Image.Resampling.LANCZOS)
-                
-                # Convert to PhotoImage
-                photo = ImageTk.PhotoImage(image)
+                # Fit the image to the tab without forcing a layout pass;
+                # decoding and scaling happen on the thumbnail workers
+                content_area = self.app.tab_view.content_area
+                max_width = max(content_area.winfo_width() - 40, 200)  # Account for padding and scrollbar
+                max_height = max(content_area.winfo_height() - 40, 200)
                 
                 # Create container for image and info
                 content_frame = ctk.CTkFrame(scroll_frame, fg_color="transparent")
                 content_frame.pack(fill="both", expand=True)
                 
-                # Create and pack image label
+                # Create and pack image label, filled in once a thumbnail arrives
                 image_label = ctk.CTkLabel(
                     content_frame,
-                    text="",
-                    image=photo
+                    text="Loading...",
+                    text_color="#858585"
                 )
-                image_label.image = photo  # Keep a reference to prevent garbage collection
                 image_label.pack(padx=5, pady=5)
                 
                 # Add image info with monospace font
-                info_text = (
-                    f"Image: {file_name}\n"
-                    f"Format: {image.format}\n"
-                    f"Size: {image.width}x{image.height} pixels\n"
-                    f"Mode: {image.mode}"
-                )
                 info_label = ctk.CTkLabel(
                     content_frame,
-                    text=info_text,
+                    text=f"Image: {file_name}",
                     font=("Cascadia Code", 11),
                     text_color="#CCCCCC",
                     justify="left"
@@ -456,16 +1368,47 @@ class FileExplorer(ctk.CTkFrame):
                 info_label.pack(pady=5, anchor="w", padx=5)
                 
                 # Switch to the new tab
-                self.app.tab_view.set(file_name)
+                self.app.tab_view.set(path)
                 
                 # Store reference to prevent garbage collection
                 tab._image_preview = {
-                    'photo': photo,
+                    'photo': None,
                     'image_label': image_label,
                     'info_label': info_label
                 }
                 
+                job = self.app.thumbnails.request(path, (max_width, max_height))
+                self._poll_image_preview(tab, job)
+                
         except Exception as e:
             print(f"Error showing image preview: {e}")
             if hasattr(self.app, 'show_error_notification'):
-                self.app.show_error_notification(f"Error showing image preview: {e}") 
\ No newline at end of file
+                self.app.show_error_notification(f"Error showing image preview: {e}")
+
+    def _poll_image_preview(self, tab, job):
+        """Show thumbnail results as the workers produce them"""
+        if not tab.winfo_exists():
+            job.cancel()
+            return
+            
+        preview = tab._image_preview
+        for stage, image, info in job.results():
+            if stage == "error":
+                preview['image_label'].configure(text=f"Error loading image: {info}", text_color="#FF6B68")
+                return
+                
+            # Convert to PhotoImage
+            photo = ImageTk.PhotoImage(image)
+            preview['photo'] = photo
+            preview['image_label'].configure(image=photo, text="")
+            preview['image_label'].image = photo  # Keep a reference to prevent garbage collection
+            preview['info_label'].configure(text=(
+                f"Image: {os.path.basename(job.path)}\n"
+                f"Format: {info['format']}\n"
+                f"Size: {info['width']}x{info['height']} pixels\n"
+                f"Mode: {info['mode']}"
+            ))
+            if stage == "final":
+                return
+                
+        tab.after(30, lambda: self._poll_image_preview(tab, job))
@@ -0,0 +1,129 @@
+import os
+import customtkinter as ctk
+import tkinter as tk
+from services.path_index import FuzzyMatcher
+
+class QuickOpen(ctk.CTkToplevel):
+    """Ctrl+P palette for jumping to any file in the workspace"""
+
+    def __init__(self, app, index, max_results=50):
+        super().__init__(app)
+        self.app = app
+        self.index = index
+        self.matcher = FuzzyMatcher(index)
+        self.max_results = max_results
+        self._results = []
+        self._pending_refresh = None
+
+        self.title("Go to File")
+        self.configure(fg_color="#252526")
+        self.transient(app)
+
+        # Position the palette at the top centre of the main window
+        width, height = 600, 360
+        x = app.winfo_rootx() + (app.winfo_width() - width) // 2
+        y = app.winfo_rooty() + 40
+        self.geometry(f"{width}x{height}+{x}+{y}")
+
+        self.entry = ctk.CTkEntry(
+            self,
+            placeholder_text="Search files by name",
+            height=30,
+            corner_radius=0,
+            fg_color="#3c3c3c",
+            border_color="#007acc",
+            border_width=1,
+            text_color="#cccccc"
+        )
+        self.entry.pack(fill="x", padx=6, pady=6)
+
+        self.results = tk.Listbox(
+            self,
+            background="#252526",
+            foreground="#cccccc",
+            selectbackground="#04395e",
+            selectforeground="#ffffff",
+            activestyle="none",
+            highlightthickness=0,
+            borderwidth=0,
+            font=("Segoe UI", 11)
+        )
+        self.results.pack(fill="both", expand=True, padx=6, pady=(0, 4))
+
+        self.status_label = ctk.CTkLabel(
+            self,
+            text="",
+            anchor="w",
+            font=ctk.CTkFont(size=11),
+            text_color="#858585"
+        )
+        self.status_label.pack(fill="x", padx=8)
+
+        # Bind events
+        self.entry.bind("<KeyRelease>", self._on_key_release)
+        self.entry.bind("<Return>", self._open_selected)
+        self.entry.bind("<Down>", lambda e: self._move_selection(1))
+        self.entry.bind("<Up>", lambda e: self._move_selection(-1))
+        self.results.bind("<Double-Button-1>", self._open_selected)
+        self.results.bind("<Return>", self._open_selected)
+        self.bind("<Escape>", lambda e: self.destroy())
+
+        self.after(10, self.entry.focus_set)
+        self._wait_for_index()
+
+    def _wait_for_index(self):
+        """Poll the background crawler until the index is ready"""
+        if not self.winfo_exists():
+            return
+        if self.index.ready.is_set():
+            self.matcher.reset()
+            self._refresh()
+        else:
+            self.status_label.configure(text=f"Indexing workspace... {self.index.file_count} files")
+            self.after(200, self._wait_for_index)
+
+    def _on_key_release(self, event):
+        if event.keysym in ("Up", "Down", "Return", "Escape"):
+            return
+        # Coalesce fast typing into a single refresh per idle cycle
+        if self._pending_refresh is None:
+            self._pending_refresh = self.after_idle(self._refresh)
+
+    def _refresh(self):
+        """Update the result list for the current query"""
+        self._pending_refresh = None
+        if not self.index.ready.is_set():
+            return
+
+        self._results = self.matcher.match(self.entry.get(), self.max_results)
+
+        self.results.delete(0, "end")
+        for file_id in self._results:
+            folder = os.path.dirname(self.index.relpath(file_id))
+            label = self.index.name(file_id)
+            if folder:
+                label = f"{label}    {folder}"
+            self.results.insert("end", label)
+        if self._results:
+            self.results.selection_set(0)
+
+        self.status_label.configure(text=f"{len(self.index)} files indexed")
+
+    def _move_selection(self, step):
+        if not self._results:
+            return "break"
+        selection = self.results.curselection()
+        current = selection[0] if selection else 0
+        new = max(0, min(len(self._results) - 1, current + step))
+        self.results.selection_clear(0, "end")
+        self.results.selection_set(new)
+        self.results.see(new)
+        return "break"
+
+    def _open_selected(self, event=None):
+        selection = self.results.curselection()
+        if selection and selection[0] < len(self._results):
+            path = self.index.path(self._results[selection[0]])
+            self.destroy()
+            self.app.open_file(path)
+        return "break"
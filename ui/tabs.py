@@ -1,15 +1,42 @@
 import customtkinter as ctk
 import tkinter as tk
-from PIL import Image
+import tkinter.font as tkfont
 import logging
 import os
 import tkinter.ttk as ttk
+from bisect import bisect_right
+from collections import OrderedDict
 
 logger = logging.getLogger(__name__)
 
+# Space around a tab's text: left padding plus the close button area
+TAB_PADDING = 40
+
+# Pixels scrolled per mouse wheel notch on the tab strip
+SCROLL_STEP = 60
+
 class VSCodeTabView(ctk.CTkFrame):
-    def __init__(self, master, **kwargs):
+    """Editor tab strip and content area.
+    
+    The strip is virtualized: tab widths come from cached font
+    measurements, and button widgets exist only for the tabs inside the
+    visible part of the strip. They are recycled as it scrolls. Every tab
+    is reachable through the overflow dropdown at the right.
+    
+    Lazily built tabs whose builder returns an object with `hibernate()`
+    and `memory_usage()` (the text editor) are hibernated least recently
+    used first once more than `max_live_tabs` of them exist or together
+    they use more than `memory_budget` bytes: `hibernate()` saves their
+    state, the frame is destroyed and the builder runs again when the tab
+    is shown next. A tab's usage is measured when it is built and again
+    when `update_usage()` is called after its content changed.
+    
+    `command` is called without arguments whenever the active tab changes.
+    """
+    
+    def __init__(self, master, max_live_tabs=12, memory_budget=64 * 1024 * 1024, command=None, **kwargs):
         super().__init__(master, **kwargs)
+        self._command = command
         
         # Configure main frame
         self.configure(fg_color="#1e1e1e", corner_radius=0)
@@ -75,13 +102,36 @@ class VSCodeTabView(ctk.CTkFrame):
         except tk.TclError:
             logger.debug("Horizontal scrollbar elements already exist")
         
-        # Initialize state
-        self._tabs = {}  # {name: {"frame": frame, "button_container": container, "button": button, "close_button": button}}
-        self._tab_dict = {}  # For compatibility with existing code
+        # Initialize state. Tabs are keyed by name, or by absolute path for files
+        self._tabs = {}  # {name: {"frame": frame, "builder": callable, "title": str, "label": str, "width": px, "slot": button set or None}}
+        self._tab_dict = {}  # For compatibility with existing code, frame is None until built
         self._tab_order = []  # List to maintain tab order
         self._current_tab = None
         self._last_active_tab = None
         
+        # Hibernation policy
+        self.max_live_tabs = max_live_tabs
+        self.memory_budget = memory_budget
+        self._live = OrderedDict()  # {name: bytes used} of built tabs that can hibernate, least recently used first
+        self._live_bytes = 0  # Sum of the usage in _live
+        
+        # Virtualized strip layout
+        self._titles = {}  # {title: [names]} to disambiguate equal titles
+        self._text_widths = {}  # {label: measured pixels}
+        self._offsets = [0]  # Left edge of each tab in strip order, then the total width
+        self._positions = {}  # {name: index in the strip}
+        self._layout_dirty = False
+        self._layout_job = None
+        self._scroll_x = 0
+        self._scroll_target = 0
+        self._scroll_job = None
+        self._slots = {}  # {name: button set} for tabs that have widgets
+        self._free_slots = []
+        self._overflow_menu = None
+        
+        # The preview tab shows the next previewed file too, until it is pinned
+        self.preview_tab = None
+        
         # Create tab bar
         self._create_tab_bar()
         
@@ -99,9 +149,25 @@ class VSCodeTabView(ctk.CTkFrame):
         self.tab_bar.grid(row=0, column=0, sticky="ew")
         self.tab_bar.grid_propagate(False)
         
-        # Container for tabs
-        self.tab_container = ctk.CTkFrame(self.tab_bar, fg_color="transparent")
-        self.tab_container.pack(side="left", fill="y")
+        # Dropdown with every tab, for tabs scrolled out of view
+        self.overflow_button = ctk.CTkButton(
+            self.tab_bar,
+            text="⌄",
+            width=28,
+            height=35,
+            fg_color="transparent",
+            hover_color="#404040",
+            text_color="#969696",
+            font=("Segoe UI", 13),
+            corner_radius=0,
+            command=self.show_overflow_menu
+        )
+        self.overflow_button.pack(side="right", fill="y")
+        
+        # Viewport the visible tab buttons are placed in
+        self.tab_container = ctk.CTkFrame(self.tab_bar, fg_color="transparent", corner_radius=0)
+        self.tab_container.pack(side="left", fill="both", expand=True)
+        self._font = tkfont.Font(root=self, family="Segoe UI", size=11)
         
         # Content area - ensure it fills the space
         self.content_area = ctk.CTkFrame(self, fg_color="#1e1e1e", corner_radius=0)
@@ -111,62 +177,33 @@ class VSCodeTabView(ctk.CTkFrame):
         self.content_area.grid_columnconfigure(0, weight=1)
         self.content_area.grid_rowconfigure(0, weight=1)
         
-    def add(self, name: str) -> ctk.CTkFrame:
-        """Add a new tab or focus existing one"""
+    def add(self, name: str, title: str = None, builder=None, on_close=None) -> ctk.CTkFrame:
+        """Add a new tab or focus existing one.
+        
+        `name` is the registry key (an absolute path for files) and `title`
+        the text shown on the tab, defaulting to `name`. With a `builder`,
+        the tab is only a placeholder until it is first shown; then its
+        frame is created and passed to `builder(frame)`, and None is
+        returned here. `on_close()` is called when the tab is deleted.
+        """
         if name in self._tabs:
             self.set(name)
             return self._tabs[name]["frame"]
             
-        # Create tab frame that fills the content area
-        tab_frame = ctk.CTkFrame(self.content_area, fg_color="#1e1e1e", corner_radius=0)
-        tab_frame.grid_columnconfigure(0, weight=1)
-        tab_frame.grid_rowconfigure(0, weight=1)
-        
-        # Create tab button container with less width
-        button_container = ctk.CTkFrame(self.tab_container, fg_color="transparent", height=35)
-        button_container.pack(side="left")
-        button_container.pack_propagate(False)
-        
-        # Create tab button with dynamic width
-        tab_button = ctk.CTkButton(
-            button_container,
-            text=name,
-            width=30,  # Small initial width, will expand based on text
-            height=35,
-            fg_color="#2d2d2d",
-            hover_color="#2d2d2d",
-            text_color="#969696",
-            font=("Segoe UI", 11),
-            corner_radius=0,
-            command=lambda: self.set(name)
-        )
-        tab_button.pack(side="left", fill="y", padx=(5, 25))  # Add padding for close button
-        
-        # Create close button closer to text
-        close_button = ctk.CTkButton(
-            button_container,
-            text="×",
-            width=16,
-            height=16,
-            fg_color="transparent",
-            hover_color="#404040",
-            text_color="#969696",
-            font=("Segoe UI", 13),
-            corner_radius=0,
-            command=lambda: self.delete(name)
-        )
-        
-        # Calculate text width and position close button accordingly
-        text_width = len(name) * 7  # Approximate width per character
-        button_container.configure(width=text_width + 40)  # Text width + padding + close button
-        close_button.place(x=text_width + 10, rely=0.5, anchor="w")  # Position right after text
+        # Create tab frame that fills the content area, unless built lazily
+        tab_frame = None if builder else self._create_frame()
         
-        # Store tab info
+        # Store tab info; widgets for the tab button are bound when it is visible
+        label = title or name
         self._tabs[name] = {
             "frame": tab_frame,
-            "button_container": button_container,
-            "button": tab_button,
-            "close_button": close_button,
+            "builder": builder,
+            "content": None,  # What the builder returned
+            "on_close": on_close,
+            "title": label,
+            "label": label,
+            "width": self._measure(label) + TAB_PADDING,
+            "slot": None,
             "modified": False
         }
         
@@ -175,6 +212,11 @@ class VSCodeTabView(ctk.CTkFrame):
         
         # Update tab order
         self._tab_order.append(name)
+        self._positions[name] = len(self._tab_order) - 1
+        self._offsets.append(self._offsets[-1] + self._tabs[name]["width"])
+        self._titles.setdefault(label, []).append(name)
+        self._update_labels(label)
+        self._request_layout()
         
         # Set as current if first tab
         if len(self._tabs) == 1:
@@ -182,6 +224,142 @@ class VSCodeTabView(ctk.CTkFrame):
         
         return tab_frame
         
+    def _create_frame(self):
+        frame = ctk.CTkFrame(self.content_area, fg_color="#1e1e1e", corner_radius=0)
+        frame.grid_columnconfigure(0, weight=1)
+        frame.grid_rowconfigure(0, weight=1)
+        return frame
+        
+    def _build(self, name):
+        """Create the frame of a placeholder tab and fill it"""
+        tab = self._tabs[name]
+        if tab["frame"] is not None:
+            return tab["frame"]
+        tab["frame"] = self._tab_dict[name] = self._create_frame()
+        try:
+            tab["content"] = tab["builder"](tab["frame"])
+        except Exception as e:
+            logger.error(f"Failed to build tab {name}: {str(e)}")
+        return tab["frame"]
+        
+    def hibernate(self, name):
+        """Save a built tab's state and destroy its widgets until it is shown again"""
+        tab = self._tabs.get(name)
+        if tab is None or tab["content"] is None or name == self._current_tab:
+            return
+        try:
+            tab["content"].hibernate()
+        except Exception as e:
+            logger.error(f"Failed to hibernate tab {name}: {str(e)}")
+            return
+        tab["frame"].destroy()
+        tab["frame"] = self._tab_dict[name] = None
+        tab["content"] = None
+        self._live_bytes -= self._live.pop(name, 0)
+        
+    def _enforce_budget(self):
+        """Hibernate least recently used tabs while over the count or memory budget"""
+        for name in list(self._live):
+            if len(self._live) <= self.max_live_tabs and self._live_bytes <= self.memory_budget:
+                break
+            if name != self._current_tab:
+                self.hibernate(name)
+                
+    def update_usage(self, name):
+        """Measure the memory a built tab uses again, e.g. after its text changed"""
+        if name not in self._live:
+            return
+        try:
+            usage = self._tabs[name]["content"].memory_usage()
+        except Exception as e:
+            logger.error(f"Failed to measure tab {name}: {str(e)}")
+            return
+        self._live_bytes += usage - self._live[name]
+        self._live[name] = usage
+        
+    def _measure(self, label):
+        """Return the pixel width of a tab label, measured once per label"""
+        width = self._text_widths.get(label)
+        if width is None:
+            width = self._text_widths[label] = self._font.measure(label)
+        return width
+        
+    def _update_labels(self, title):
+        """Disambiguate tabs sharing `title` by their parent folder, like __init__.py — ui"""
+        names = self._titles.get(title, ())
+        for name in names:
+            label = title
+            if len(names) > 1 and os.path.isabs(name):
+                label = f"{title} — {os.path.basename(os.path.dirname(name))}"
+            tab = self._tabs[name]
+            if tab["label"] != label:
+                tab["label"] = label
+                tab["width"] = self._measure(label) + TAB_PADDING
+                self._layout_dirty = True
+                self._render_tab(name)
+        if self._layout_dirty:
+            self._request_layout()
+            
+    def keys(self):
+        """Return the tab keys in strip order"""
+        return list(self._tab_order)
+        
+    def content(self, name):
+        """Return what the builder of a tab returned, None until built or when hibernated"""
+        tab = self._tabs.get(name)
+        return tab["content"] if tab else None
+        
+    def set_preview(self, name):
+        """Make `name` the preview tab, shown in italics"""
+        if name in self._tabs and name != self.preview_tab:
+            previous, self.preview_tab = self.preview_tab, name
+            self._update_tab_appearance(*(n for n in (previous, name) if n))
+            
+    def pin(self, name):
+        """Turn the preview tab into a normal tab"""
+        if name is not None and name == self.preview_tab:
+            self.preview_tab = None
+            self._update_tab_appearance(name)
+            
+    def rekey(self, old, new, title=None, builder=None, on_close=None):
+        """Move a tab, with its frame and content, to a new key and title.
+        
+        Used to show another document in the preview tab without creating
+        a new editor.
+        """
+        if old not in self._tabs or new in self._tabs:
+            return
+        tab = self._tabs.pop(old)
+        self._tabs[new] = tab
+        self._tab_dict[new] = self._tab_dict.pop(old)
+        self._tab_order[self._position(old)] = new
+        self._layout_dirty = True
+        if old in self._live:
+            self._live[new] = self._live.pop(old)
+        if old in self._slots:
+            slot = self._slots[new] = self._slots.pop(old)
+            slot["name"] = new
+        for attr in ("_current_tab", "_last_active_tab", "preview_tab"):
+            if getattr(self, attr) == old:
+                setattr(self, attr, new)
+        if builder is not None:
+            tab["builder"] = builder
+        tab["on_close"] = on_close
+        tab["modified"] = False
+        
+        # Move the tab to its new title, re-disambiguating both titles
+        old_title = tab["title"]
+        self._titles[old_title].remove(old)
+        if not self._titles[old_title]:
+            del self._titles[old_title]
+        tab["title"] = tab["label"] = title or new
+        tab["width"] = self._measure(tab["label"]) + TAB_PADDING
+        self._titles.setdefault(tab["title"], []).append(new)
+        self._update_labels(old_title)
+        self._update_labels(tab["title"])
+        self._render_tab(new)
+        self._request_layout()
+        
     def delete(self, name: str) -> None:
         """Delete a tab and clean up"""
         if name not in self._tabs:
@@ -191,13 +369,26 @@ class VSCodeTabView(ctk.CTkFrame):
         tab = self._tabs[name]
         
         # Clean up widgets
-        tab["frame"].destroy()
-        tab["button_container"].destroy()
+        if tab["frame"] is not None:
+            tab["frame"].destroy()
+        if tab["slot"] is not None:
+            self._release_slot(name)
         
         # Update state
         self._tab_order.remove(name)
         del self._tabs[name]
         del self._tab_dict[name]
+        self._live_bytes -= self._live.pop(name, 0)
+        self._titles[tab["title"]].remove(name)
+        if not self._titles[tab["title"]]:
+            del self._titles[tab["title"]]
+        self._layout_dirty = True
+        self._request_layout()
+        self._update_labels(tab["title"])
+        if name == self.preview_tab:
+            self.preview_tab = None
+        if tab["on_close"]:
+            tab["on_close"]()
         
         # Update current tab
         if name == self._current_tab:
@@ -208,8 +399,6 @@ class VSCodeTabView(ctk.CTkFrame):
             else:
                 self._current_tab = None
                 self._last_active_tab = None
-                
-        self._update_tab_appearance()
         
     def set(self, name: str) -> None:
         """Set the active tab"""
@@ -217,6 +406,7 @@ class VSCodeTabView(ctk.CTkFrame):
             return
             
         # Update last active tab
+        previous = self._current_tab
         if self._current_tab:
             self._last_active_tab = self._current_tab
             
@@ -225,77 +415,257 @@ class VSCodeTabView(ctk.CTkFrame):
             self._tabs[self._current_tab]["frame"].grid_remove()
             
         # Show new content - ensure it fills the space
-        self._tabs[name]["frame"].grid(row=0, column=0, sticky="nsew", padx=0, pady=0)
+        self._build(name).grid(row=0, column=0, sticky="nsew", padx=0, pady=0)
         self._current_tab = name
         
-        # Update appearance
-        self._update_tab_appearance()
+        # Track recency of tabs that can hibernate
+        content = self._tabs[name]["content"]
+        if hasattr(content, "hibernate"):
+            if name not in self._live:
+                # Just built; measured now and after changes, not on every switch
+                self._live[name] = 0
+                self.update_usage(name)
+            self._live.move_to_end(name)
+            self._enforce_budget()
+        
+        # Update appearance of the two tabs that changed
+        self._update_tab_appearance(*(n for n in (previous, name) if n))
+        self.scroll_into_view(name)
+        if self._command:
+            self._command()
         
     def get(self) -> str:
         """Get current tab name"""
         return self._current_tab
         
     def tab(self, name: str) -> ctk.CTkFrame:
-        """Get tab frame by name"""
+        """Get tab frame by name, None for tabs that were not shown yet"""
         return self._tabs[name]["frame"] if name in self._tabs else None
         
     def set_modified(self, name: str, modified: bool = True):
         """Set tab modified state"""
-        if name in self._tabs:
+        if name in self._tabs and self._tabs[name]["modified"] != modified:
             self._tabs[name]["modified"] = modified
-            self._update_tab_appearance()
-            
-    def _update_tab_appearance(self):
-        """Update the appearance of all tabs"""
-        for name, tab in self._tabs.items():
-            is_current = name == self._current_tab
+            self._update_tab_appearance(name)
             
+    def _update_tab_appearance(self, *names):
+        """Update the appearance of the given tabs, or of all tabs"""
+        for name in names or list(self._tabs):
+            if name in self._tabs:
+                self._render_tab(name)
+                
+    def _render_tab(self, name):
+        """Bring a visible tab's widgets in line with its state, configuring only what changed"""
+        tab = self._tabs[name]
+        slot = tab["slot"]
+        if slot is None:
+            return
+        rendered = slot["rendered"]
+        is_current = name == self._current_tab
+        
+        if rendered["active"] != is_current:
             # Update button appearance
-            tab["button"].configure(
+            slot["button"].configure(
                 fg_color="#1e1e1e" if is_current else "#2d2d2d",
                 text_color="#ffffff" if is_current else "#969696",
-                border_width=1,
                 border_color="#007acc" if is_current else "#252526"
             )
             
             # Update close button color
-            tab["close_button"].configure(
+            slot["close_button"].configure(
                 text_color="#cccccc" if is_current else "#969696"
             )
+            rendered["active"] = is_current
+            
+        # Add modified indicator if needed
+        text = tab["label"] + " •" if tab["modified"] else tab["label"]
+        if rendered["text"] != text:
+            slot["button"].configure(text=text)
+            rendered["text"] = text
+            
+        # The preview tab is shown in italics
+        is_preview = name == self.preview_tab
+        if rendered["preview"] != is_preview:
+            slot["button"].configure(font=("Segoe UI", 11, "italic") if is_preview else ("Segoe UI", 11))
+            rendered["preview"] = is_preview
             
-            # Add modified indicator if needed
-            text = name + " •" if tab["modified"] else name
-            tab["button"].configure(text=text)
+        if rendered["width"] != tab["width"]:
+            # Position the close button right after the text
+            slot["container"].configure(width=tab["width"])
+            slot["close_button"].place(x=tab["width"] - TAB_PADDING + 10, rely=0.5, anchor="w")
+            rendered["width"] = tab["width"]
             
+    def _create_slot(self):
+        """Create one reusable set of tab button widgets"""
+        slot = {"name": None, "x": None, "rendered": {"active": False, "text": None, "width": None, "preview": False}}
+        
+        container = ctk.CTkFrame(self.tab_container, fg_color="transparent", height=35, width=TAB_PADDING)
+        container.pack_propagate(False)
+        
+        button = ctk.CTkButton(
+            container,
+            text="",
+            width=30,  # Small initial width, will expand based on text
+            height=35,
+            fg_color="#2d2d2d",
+            hover_color="#2d2d2d",
+            text_color="#969696",
+            font=("Segoe UI", 11),
+            corner_radius=0,
+            border_width=1,
+            border_color="#252526",
+            command=lambda: self.set(slot["name"])
+        )
+        button.pack(side="left", fill="y", padx=(5, 25))  # Add padding for close button
+        
+        # Create close button closer to text
+        close_button = ctk.CTkButton(
+            container,
+            text="×",
+            width=16,
+            height=16,
+            fg_color="transparent",
+            hover_color="#404040",
+            text_color="#969696",
+            font=("Segoe UI", 13),
+            corner_radius=0,
+            command=lambda: self.delete(slot["name"])
+        )
+        
+        for widget in (container, button, close_button):
+            widget.bind("<Button-2>", lambda e: self.delete(slot["name"]))  # Middle click to close
+            self._bind_scroll(widget)
+        button.bind("<Double-Button-1>", lambda e: self.pin(slot["name"]))  # Double click keeps a preview
+            
+        slot.update(container=container, button=button, close_button=close_button)
+        return slot
+        
+    def _acquire_slot(self, name):
+        slot = self._free_slots.pop() if self._free_slots else self._create_slot()
+        slot["name"] = name
+        self._tabs[name]["slot"] = self._slots[name] = slot
+        return slot
+        
+    def _release_slot(self, name):
+        slot = self._slots.pop(name)
+        slot["container"].place_forget()
+        slot["name"] = slot["x"] = None
+        if name in self._tabs:
+            self._tabs[name]["slot"] = None
+        self._free_slots.append(slot)
+        
+    def _position(self, name):
+        if self._layout_dirty:
+            self._recompute_offsets()
+        return self._positions[name]
+        
+    def _recompute_offsets(self):
+        offsets = [0]
+        positions = {}
+        for index, name in enumerate(self._tab_order):
+            positions[name] = index
+            offsets.append(offsets[-1] + self._tabs[name]["width"])
+        self._offsets = offsets
+        self._positions = positions
+        self._layout_dirty = False
+        
+    def _request_layout(self):
+        if self._layout_job is None:
+            self._layout_job = self.after_idle(self._layout)
+            
+    def _layout(self):
+        """Give the tabs inside the viewport a button, recycling the buttons of the others"""
+        self._layout_job = None
+        if self._layout_dirty:
+            self._recompute_offsets()
+            
+        view_width = self.tab_container.winfo_width()
+        total = self._offsets[-1]
+        self._scroll_x = max(0, min(self._scroll_x, total - view_width))
+        self._scroll_target = max(0, min(self._scroll_target, total - view_width))
+        left, right = self._scroll_x, self._scroll_x + view_width
+        
+        # Tabs overlapping [left, right), found by bisecting the offsets
+        visible = {}
+        index = max(0, bisect_right(self._offsets, left) - 1)
+        while index < len(self._tab_order) and self._offsets[index] < right:
+            visible[self._tab_order[index]] = self._offsets[index] - left
+            index += 1
+            
+        for name in [n for n in self._slots if n not in visible]:
+            self._release_slot(name)
+        for name, x in visible.items():
+            slot = self._slots.get(name) or self._acquire_slot(name)
+            self._render_tab(name)
+            if slot["x"] != x:
+                slot["container"].place(x=x, y=0)
+                slot["x"] = x
+                
+    def scroll_into_view(self, name):
+        """Scroll the strip so the tab `name` is fully visible"""
+        index = self._position(name)
+        start, end = self._offsets[index], self._offsets[index + 1]
+        view_width = self.tab_container.winfo_width()
+        if start < self._scroll_target:
+            self.scroll_to(start)
+        elif end > self._scroll_target + view_width:
+            self.scroll_to(end - view_width)
+        else:
+            self._request_layout()
+            
+    def scroll_to(self, x):
+        """Scroll the strip smoothly so it starts at pixel `x`"""
+        self._scroll_target = max(0, min(x, self._offsets[-1] - self.tab_container.winfo_width()))
+        if self._scroll_job is None:
+            self._scroll_job = self.after(16, self._animate_scroll)
+            
+    def _animate_scroll(self):
+        self._scroll_job = None
+        distance = self._scroll_target - self._scroll_x
+        step = int(distance * 0.4) or distance
+        self._scroll_x += step
+        self._layout()
+        if self._scroll_x != self._scroll_target:
+            self._scroll_job = self.after(16, self._animate_scroll)
+            
+    def show_overflow_menu(self):
+        """Toggle the dropdown listing every tab"""
+        if self._overflow_menu is not None and self._overflow_menu.winfo_exists():
+            self._overflow_menu.destroy()
+            self._overflow_menu = None
+            return
+        self._overflow_menu = TabOverflowMenu(self)
+        
     def _bind_events(self):
         """Bind mouse and keyboard events"""
         # Tab bar scrolling
-        self.tab_bar.bind("<MouseWheel>", self._on_mousewheel)
-        self.tab_bar.bind("<Button-2>", self._on_tab_middle_click)  # Middle click to close
+        self._bind_scroll(self.tab_bar)
+        self._bind_scroll(self.tab_container)
+        self.tab_container.bind("<Configure>", lambda e: self._request_layout())
         
         # Window bindings for keyboard shortcuts
         self.master.bind("<Control-Tab>", self._next_tab)
         self.master.bind("<Control-Shift-Tab>", self._previous_tab)
         
+    def _bind_scroll(self, widget):
+        widget.bind("<MouseWheel>", self._on_mousewheel)
+        widget.bind("<Button-4>", self._on_mousewheel)  # X11 wheel up
+        widget.bind("<Button-5>", self._on_mousewheel)  # X11 wheel down
+        
     def _on_mousewheel(self, event):
         """Handle mouse wheel scrolling on tab bar"""
-        self.tab_container.winfo_children()[0].pack_configure(
-            padx=(max(0, self.tab_container.winfo_x() + event.delta), 0)
-        )
+        if event.num == 4 or getattr(event, "delta", 0) > 0:
+            direction = -1
+        else:
+            direction = 1
+        self.scroll_to(self._scroll_target + direction * SCROLL_STEP)
         
-    def _on_tab_middle_click(self, event):
-        """Handle middle click to close tab"""
-        for name, tab in self._tabs.items():
-            if tab["button_container"].winfo_containing(event.x_root, event.y_root):
-                self.delete(name)
-                break
-                
     def _next_tab(self, event=None):
         """Switch to next tab"""
         if not self._tab_order:
             return
             
-        current_index = self._tab_order.index(self._current_tab)
+        current_index = self._position(self._current_tab)
         next_index = (current_index + 1) % len(self._tab_order)
         self.set(self._tab_order[next_index])
         
@@ -304,6 +674,105 @@ class VSCodeTabView(ctk.CTkFrame):
         if not self._tab_order:
             return
             
-        current_index = self._tab_order.index(self._current_tab)
+        current_index = self._position(self._current_tab)
         prev_index = (current_index - 1) % len(self._tab_order)
-        self.set(self._tab_order[prev_index]) 
\ No newline at end of file
+        self.set(self._tab_order[prev_index]) 
+
+class TabOverflowMenu(tk.Toplevel):
+    """Dropdown under the tab strip listing every tab, filtered as you type"""
+    
+    def __init__(self, view, width=320, height=300):
+        super().__init__(view)
+        self.view = view
+        self._names = []
+        
+        self.overrideredirect(True)
+        self.configure(background="#252526")
+        x = view.overflow_button.winfo_rootx() + view.overflow_button.winfo_width() - width
+        y = view.tab_bar.winfo_rooty() + view.tab_bar.winfo_height()
+        self.geometry(f"{width}x{height}+{max(0, x)}+{y}")
+        
+        self.entry = tk.Entry(
+            self,
+            background="#3c3c3c",
+            foreground="#cccccc",
+            insertbackground="#cccccc",
+            relief="flat",
+            highlightthickness=1,
+            highlightcolor="#007acc",
+            font=("Segoe UI", 11)
+        )
+        self.entry.pack(fill="x", padx=4, pady=4)
+        
+        self.listbox = tk.Listbox(
+            self,
+            background="#252526",
+            foreground="#cccccc",
+            selectbackground="#04395e",
+            selectforeground="#ffffff",
+            activestyle="none",
+            highlightthickness=0,
+            borderwidth=0,
+            font=("Segoe UI", 11)
+        )
+        self.listbox.pack(fill="both", expand=True, padx=4, pady=(0, 4))
+        
+        # Bind events
+        self.entry.bind("<KeyRelease>", self._on_key_release)
+        self.entry.bind("<Return>", self._choose)
+        self.entry.bind("<Down>", lambda e: self._move_selection(1))
+        self.entry.bind("<Up>", lambda e: self._move_selection(-1))
+        self.listbox.bind("<ButtonRelease-1>", self._choose)
+        self.bind("<Escape>", lambda e: self.destroy())
+        self.bind("<FocusOut>", lambda e: self.after(50, self._close_if_unfocused))
+        
+        self.refresh()
+        self.entry.focus_set()
+        
+    def refresh(self):
+        """List the tabs whose label or path contains the filter text"""
+        query = self.entry.get().lower()
+        tabs = self.view._tabs
+        self._names = [
+            name for name in self.view._tab_order
+            if query in tabs[name]["label"].lower() or query in name.lower()
+        ]
+        self.listbox.delete(0, "end")
+        for name in self._names:
+            label = tabs[name]["label"]
+            self.listbox.insert("end", label + " •" if tabs[name]["modified"] else label)
+        if self._names:
+            current = self.view.get()
+            index = self._names.index(current) if current in self._names else 0
+            self.listbox.selection_set(index)
+            self.listbox.see(index)
+            
+    def _on_key_release(self, event):
+        if event.keysym not in ("Up", "Down", "Return", "Escape"):
+            self.refresh()
+            
+    def _move_selection(self, step):
+        if not self._names:
+            return "break"
+        selection = self.listbox.curselection()
+        current = selection[0] if selection else 0
+        new = max(0, min(len(self._names) - 1, current + step))
+        self.listbox.selection_clear(0, "end")
+        self.listbox.selection_set(new)
+        self.listbox.see(new)
+        return "break"
+        
+    def _choose(self, event=None):
+        selection = self.listbox.curselection()
+        if selection and selection[0] < len(self._names):
+            name = self._names[selection[0]]
+            self.destroy()
+            self.view.set(name)
+        return "break"
+        
+    def _close_if_unfocused(self):
+        if not self.winfo_exists():
+            return
+        focus = self.focus_get()
+        if focus is None or focus.winfo_toplevel() is not self:
+            self.destroy()
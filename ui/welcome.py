@@ -1,15 +1,17 @@
 import customtkinter as ctk
 from PIL import Image
 import os
-import sqlite3
+from services.database import get_database
+from services.todo_pages import get_summary
 from datetime import datetime
 import tempfile
 
 class WelcomeScreen(ctk.CTkFrame):
-    def __init__(self, parent, callback):
+    def __init__(self, parent, callback, sync=None):
         super().__init__(parent, fg_color="#1e1e1e", corner_radius=0)
         self.callback = callback
         self.app = parent  # Store reference to main app
+        self.sync = sync  # SyncEngine of the tasks, if any
         
         # Create main container
         container = ctk.CTkFrame(self, fg_color="transparent")
@@ -78,20 +80,23 @@ class WelcomeScreen(ctk.CTkFrame):
         right_column = ctk.CTkFrame(columns_frame, fg_color="transparent")
         right_column.pack(side="right", fill="both", expand=True)
         
-        pending_tasks_label = ctk.CTkLabel(
+        self.pending_tasks_label = ctk.CTkLabel(
             right_column,
             text="Pending Tasks",
             font=ctk.CTkFont(size=18, weight="bold"),
             text_color="#CCCCCC"
         )
-        pending_tasks_label.pack(anchor="w", pady=(0, 10))
+        self.pending_tasks_label.pack(anchor="w", pady=(0, 10))
         
         # Create scrollable frame for tasks
         tasks_frame = ctk.CTkScrollableFrame(right_column, fg_color="transparent", corner_radius=0)
         tasks_frame.pack(fill="both", expand=True)
         
-        # Load and display pending tasks
+        # Load and display pending tasks, again whenever sync changes them
         self.load_pending_tasks(tasks_frame)
+        if self.sync is not None:
+            self._sync_revision = self.sync.revision
+            self.after(2000, lambda: self._watch_sync(tasks_frame))
 
     def create_action_button(self, parent, title, icon_name, description):
         """Create a clickable action button with icon and description"""
@@ -251,23 +256,34 @@ if __name__ == '__main__':
                     pass
 
     def load_pending_tasks(self, container):
-        """Load and display pending tasks from SQLite database"""
+        """Load and display pending tasks from SQLite database, read on the database worker"""
+        db_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'minux.db')
+        
+        # Pending count and newest pending tasks, cached until tasks change
+        future = get_database(db_path).submit(lambda db: get_summary(db).get(db))
+        self._show_pending_tasks(container, future)
+        
+    def _watch_sync(self, container):
+        """Reload the pending tasks once sync has pulled changes to them"""
+        if not container.winfo_exists():
+            return
+        if self.sync.revision != self._sync_revision:
+            self._sync_revision = self.sync.revision
+            self.load_pending_tasks(container)
+        self.after(2000, lambda: self._watch_sync(container))
+        
+    def _show_pending_tasks(self, container, future):
+        if not container.winfo_exists():
+            return
+        if not future.done():
+            self.after(20, lambda: self._show_pending_tasks(container, future))
+            return
+        # Replace what an earlier load showed
+        for child in container.winfo_children():
+            child.destroy()
         try:
-            db_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'minux.db')
-            conn = sqlite3.connect(db_path)
-            cursor = conn.cursor()
-            
-            # Get pending (not done) tasks, ordered by creation date
-            cursor.execute('''
-                SELECT task, created_date 
-                FROM todos 
-                WHERE done = 0 
-                ORDER BY created_date DESC 
-                LIMIT 5
-            ''')
-            
-            tasks = cursor.fetchall()
-            conn.close()
+            count, tasks = future.result()
+            self.pending_tasks_label.configure(text=f"Pending Tasks ({count})")
             
             if not tasks:
                 # Show message when no tasks are pending
@@ -281,8 +297,8 @@ if __name__ == '__main__':
                 return
             
             # Create a task button for each pending task
-            for task, created_date in tasks:
-                self.create_task_button(container, task, created_date)
+            for task_id, task, created_date in tasks:
+                self.create_task_button(container, task_id, task, created_date)
                 
         except Exception as e:
             # Show error message if database access fails
@@ -294,19 +310,19 @@ if __name__ == '__main__':
             )
             error_label.pack(pady=10)
 
-    def create_task_button(self, parent, task, created_date):
+    def create_task_button(self, parent, task_id, task, created_date):
         """Create a button for a pending task"""
         btn_frame = ctk.CTkFrame(parent, fg_color="#2a2d2e", corner_radius=5)
         btn_frame.pack(fill="x", pady=5)
         
         # Make the entire frame clickable
-        btn_frame.bind("<Button-1>", lambda e: self.callback(("open_todo", task)))
+        btn_frame.bind("<Button-1>", lambda e: self.callback(("open_todo", task_id)))
         btn_frame.bind("<Enter>", lambda e: btn_frame.configure(fg_color="#404040"))
         btn_frame.bind("<Leave>", lambda e: btn_frame.configure(fg_color="#2a2d2e"))
         
         content_frame = ctk.CTkFrame(btn_frame, fg_color="transparent")
         content_frame.pack(fill="x", padx=10, pady=10)
-        content_frame.bind("<Button-1>", lambda e: self.callback(("open_todo", task)))
+        content_frame.bind("<Button-1>", lambda e: self.callback(("open_todo", task_id)))
         
         # Try to load todo icon
         icon_path = os.path.join("media", "icons", "todo.png")
@@ -319,13 +335,13 @@ if __name__ == '__main__':
                 icon_label = ctk.CTkLabel(content_frame, image=icon_img, text="")
                 icon_label.pack(side="left", padx=(0, 10))
                 # Make icon label clickable too
-                icon_label.bind("<Button-1>", lambda e: self.callback(("open_todo", task)))
+                icon_label.bind("<Button-1>", lambda e: self.callback(("open_todo", task_id)))
             except Exception as e:
                 print(f"Error loading todo icon: {e}")
         
         text_frame = ctk.CTkFrame(content_frame, fg_color="transparent")
         text_frame.pack(side="left", fill="x", expand=True)
-        text_frame.bind("<Button-1>", lambda e: self.callback(("open_todo", task)))
+        text_frame.bind("<Button-1>", lambda e: self.callback(("open_todo", task_id)))
         
         # Show task text
         task_label = ctk.CTkLabel(
@@ -336,7 +352,7 @@ if __name__ == '__main__':
             anchor="w"
         )
         task_label.pack(fill="x")
-        task_label.bind("<Button-1>", lambda e: self.callback(("open_todo", task)))
+        task_label.bind("<Button-1>", lambda e: self.callback(("open_todo", task_id)))
         
         # Show creation date
         try:
@@ -353,7 +369,7 @@ if __name__ == '__main__':
             anchor="w"
         )
         date_label.pack(fill="x")
-        date_label.bind("<Button-1>", lambda e: self.callback(("open_todo", task)))
+        date_label.bind("<Button-1>", lambda e: self.callback(("open_todo", task_id)))
         
         # Change cursor to hand when hovering over any part of the button
         for widget in [btn_frame, content_frame, text_frame, task_label, date_label]:
@@ -1,7 +1,45 @@
 import customtkinter as ctk
+import tkinter as tk
 from PIL import Image
 import os
-import tkinter as tk
+import time
+import logging
+from services.database import get_database
+from services.todo_search import search_tasks, query_tokens, snippet
+from services.todo_model import TaskModel, parse_quick_add
+from services.todo_pages import fetch_page, get_summary, GroupCounts, PAGE_SIZE
+
+logger = logging.getLogger(__name__)
+
+# Height of one task row, including the gap below it
+ROW_HEIGHT = 37
+ROW_GAP = 2
+
+# Milliseconds edits are collected before they are written together
+FLUSH_DELAY = 300
+
+# Longest wait, in milliseconds, before retrying a failed write
+FLUSH_MAX_DELAY = 30000
+
+# Seconds the last write may take when the widget is destroyed
+FLUSH_EXIT_TIMEOUT = 10
+
+# Cards shown per board column; the rest are counted below them
+BOARD_CARDS = 50
+
+# Rows left below the view when the next page of tasks is fetched
+PAGE_MARGIN = 20
+
+# Milliseconds between checks for tasks changed by sync
+SYNC_POLL_INTERVAL = 2000
+
+def _tasks_from_rows(rows):
+    """Turn rows of fetch_page() into the panel's task dicts"""
+    return [
+        {"id": task_id, "text": text, "done": bool(done), "priority": priority,
+         "due_date": due_date, "tags": tuple(tag for tag in tags.split(",") if tag)}
+        for task_id, text, done, priority, due_date, tags, _ in rows
+    ]
 
 class TodoWidget(ctk.CTkFrame):
     def _load_icon(self, icon_name, fallback_text):
@@ -24,13 +62,15 @@ class TodoWidget(ctk.CTkFrame):
                 self.show_error_notification(f"Error loading {icon_name}: {e}")
             return fallback_text
 
-    def __init__(self, parent, show_error_notification=None, db_path=None, selected_task=None):
+    def __init__(self, parent, show_error_notification=None, db_path=None, selected_task=None, sync=None):
         super().__init__(parent)
         
         # Store instance variables
         self.show_error_notification = show_error_notification
         self.db_path = db_path
+        self.db = get_database(db_path) if db_path else None
         self.selected_task = selected_task
+        self.sync = sync  # SyncEngine pushing and pulling the tasks, if any
         
         # Create main frame
         self.todo_frame = ctk.CTkFrame(self, fg_color="#1e1e1e", corner_radius=0)
@@ -60,6 +100,10 @@ class TodoWidget(ctk.CTkFrame):
                 font=ctk.CTkFont(size=12, weight="bold")
             )
         title_label.pack(side="left", padx=10)
+        
+        # Pending count, from the summary cached until the next write
+        self.summary_label = ctk.CTkLabel(self.toolbar, text="", text_color="gray60", font=ctk.CTkFont(size=11))
+        self.summary_label.pack(side="left", padx=(0, 10))
 
         # Add view options on the right
         view_options = [
@@ -127,6 +171,35 @@ class TodoWidget(ctk.CTkFrame):
             )
             btn.pack(side="left", padx=5, pady=5)
             self.filter_buttons[text] = btn
+            
+        # Add search box, results follow every keystroke
+        self.search_entry = ctk.CTkEntry(
+            self.filter_bar,
+            placeholder_text="Search tasks",
+            width=200,
+            height=25,
+            corner_radius=4,
+            fg_color="#3c3c3c",
+            border_width=0,
+            text_color="#cccccc"
+        )
+        self.search_entry.pack(side="right", padx=5, pady=5)
+        self.search_entry.bind("<KeyRelease>", lambda e: self.update_search())
+        
+        # Groups of the board columns and tree branches
+        self.group_menu = ctk.CTkOptionMenu(
+            self.filter_bar,
+            values=["Status", "Tag", "Due"],
+            width=90,
+            height=25,
+            corner_radius=4,
+            fg_color="#3c3c3c",
+            button_color="#3c3c3c",
+            button_hover_color="#505050",
+            font=ctk.CTkFont(size=11),
+            command=self.set_grouping
+        )
+        self.group_menu.pack(side="right", padx=5, pady=5)
         
         # Create content area
         self.content = ctk.CTkFrame(self.todo_frame, fg_color="#1e1e1e", corner_radius=0)
@@ -170,7 +243,7 @@ class TodoWidget(ctk.CTkFrame):
         
         self.task_entry = ctk.CTkEntry(
             self.entry_frame,
-            placeholder_text="Add a task... (Press Enter to add)",
+            placeholder_text="Add a task... #tag due:tomorrow !1 (Press Enter to add)",
             height=35,
             corner_radius=4,
             fg_color="#3c3c3c",
@@ -181,28 +254,76 @@ class TodoWidget(ctk.CTkFrame):
         self.task_entry.pack(side="left", fill="x", expand=True, padx=(0, 8))
         self.task_entry.bind("<Return>", lambda e: self.add_task())
         
-        # Create tasks list
-        self.tasks_frame = ctk.CTkScrollableFrame(
-            self.content,
-            fg_color="transparent",
-            corner_radius=0,
-            scrollbar_button_color="#424242",
-            scrollbar_button_hover_color="#525252"
-        )
+        # Create tasks list: a fixed pool of row widgets is placed over the
+        # visible part of the list and refilled as it scrolls
+        self.tasks_frame = ctk.CTkFrame(self.content, fg_color="transparent", corner_radius=0)
         self.tasks_frame.pack(fill="both", expand=True, pady=(10, 0))
+        self.rows_frame = ctk.CTkFrame(self.tasks_frame, fg_color="transparent", corner_radius=0)
+        self.rows_frame.pack(side="left", fill="both", expand=True)
+        self.scrollbar = ctk.CTkScrollbar(
+            self.tasks_frame,
+            command=self._on_scrollbar,
+            button_color="#424242",
+            button_hover_color="#525252"
+        )
+        self.scrollbar.pack(side="right", fill="y")
+        self.rows_frame.bind("<Configure>", lambda e: self._resize_pool())
+        self._bind_scroll(self.rows_frame)
+        
+        # Delete icon shared by every row
+        try:
+            self.delete_image = ctk.CTkImage(
+                light_image=Image.open("media/icons/close.png"),
+                dark_image=Image.open("media/icons/close.png"),
+                size=(12, 12)
+            )
+        except Exception as e:
+            if self.show_error_notification:
+                self.show_error_notification(f"Error loading delete icon: {e}")
+            self.delete_image = "×"
+        
+        # Board columns, built the first time the board is shown
+        self.board_frame = None
+        self._columns = {}  # {group: column widgets}
+        self._column_order = []
         
         # Initialize empty tasks list and views
-        self.tasks = []
+        self.model = TaskModel()  # Tasks in list order, grouped for the board and tree
+        self._visible = []  # Tasks passing the current filter, and tree group headers
+        self._collapsed = set()  # Groups folded in the tree
+        self._tree = None  # Where each group's rows sit in _visible, to update them in place
+        self._added = []  # Tasks added here; they follow the loaded pages
+        self._cursor = None  # Keyset cursor of the next page
+        self._exhausted = not self.db
+        self._loading = False
+        self._pending_highlight = None  # Row id to highlight once its page is in
+        self._group_counts = GroupCounts()
+        self._counts = None  # (grouping, {group: [to do, done]}) of every stored task
+        self._counts_generation = 0
+        self._rows = []  # Recycled row widgets
+        self._scroll_y = 0
+        self._highlighted = None
+        self._by_id = {}  # Stored tasks by row id
+        self._search = None  # Matching tasks while searching
+        self._snippets = {}  # {task id: text with the matches marked}
+        self._search_generation = 0
+        self._journal = {}  # {id(task): (task, set of changes)} not yet stored
+        self._flush_job = None
+        self._flush_failures = 0  # Failed writes in a row, for the retry backoff
         self.current_view = "list"  # Default view
+        self.current_grouping = "status"
         self.current_filter = "All"  # Default filter
+        self.current_font_size = 12
         
-        # Load tasks from database if available
-        if self.db_path:
+        # Load tasks from database if available; the selected task is
+        # highlighted once they are in
+        if self.db:
             self.load_tasks()
-            
-        # Highlight selected task if provided
-        if self.selected_task:
-            self.highlight_task(self.selected_task)
+            if selected_task is not None:
+                self.highlight_task(selected_task)
+            if self.sync is not None:
+                self._sync_revision = self.sync.revision
+                self.after(SYNC_POLL_INTERVAL, self._watch_sync)
             
         # Update UI state
         self._update_view_buttons()
@@ -212,9 +333,6 @@ class TodoWidget(ctk.CTkFrame):
         self.bind("<Control-plus>", self._increase_font_size)
         self.bind("<Control-minus>", self._decrease_font_size)
         self.bind("<Control-equal>", self._increase_font_size)  # For keyboards where + is on the = key
-        
-        # Initialize font size
-        self.current_font_size = 12
 
     def _increase_font_size(self, event=None):
         """Increase font size for all elements"""
@@ -240,9 +358,8 @@ class TodoWidget(ctk.CTkFrame):
         # Update task entry
         self.task_entry.configure(font=ctk.CTkFont(size=self.current_font_size))
         
-        # Update tasks
-        for task in self.tasks:
-            task["checkbox"].configure(font=ctk.CTkFont(size=self.current_font_size))
+        # Update the rows on screen, the others pick it up when reused
+        self._redraw()
 
     def _update_view_buttons(self):
         """Update the visual state of view buttons"""
@@ -264,268 +381,821 @@ class TodoWidget(ctk.CTkFrame):
         """Show all tasks"""
         self.current_filter = "All"
         self._update_filter_buttons()
-        for task in self.tasks:
-            task["frame"].pack(fill="x", pady=(0, 2))
+        self.update_search()
 
     def show_active_tasks(self):
         """Show only active (uncompleted) tasks"""
         self.current_filter = "Active"
         self._update_filter_buttons()
-        for task in self.tasks:
-            if not task["completed"].get():
-                task["frame"].pack(fill="x", pady=(0, 2))
-            else:
-                task["frame"].pack_forget()
+        self.update_search()
 
     def show_completed_tasks(self):
         """Show only completed tasks"""
         self.current_filter = "Completed"
         self._update_filter_buttons()
-        for task in self.tasks:
-            if task["completed"].get():
-                task["frame"].pack(fill="x", pady=(0, 2))
-            else:
-                task["frame"].pack_forget()
+        self.update_search()
 
     def tree_view(self):
         """Switch to tree view"""
-        self.current_view = "tree"
-        self._update_view_buttons()
-        # Placeholder for tree view layout
-        self.show_error_notification("Tree view is a placeholder")
+        self._show_view("tree")
 
     def list_view(self):
         """Switch to list view"""
-        self.current_view = "list"
-        self._update_view_buttons()
-        self.refresh_view()
+        self._show_view("list")
 
     def board_view(self):
         """Switch to board view"""
-        self.current_view = "board"
+        self._show_view("board")
+        
+    def set_grouping(self, choice):
+        """Group the board and tree by status, tag or due date"""
+        self.current_grouping = choice.lower()
+        if self.current_view != "list":
+            self._update_counts()
+            self.refresh_view()
+
+    def _show_view(self, view):
+        # The list and the tree share the row pool; the board keeps its
+        # own widgets while hidden, so switching back rebuilds nothing
+        self.current_view = view
         self._update_view_buttons()
-        # Placeholder for board view layout
-        self.show_error_notification("Board view is a placeholder")
+        if view == "board":
+            if self.board_frame is None:
+                self.board_frame = ctk.CTkFrame(self.content, fg_color="transparent", corner_radius=0)
+                self.board_frame.grid_rowconfigure(0, weight=1)
+            self.tasks_frame.pack_forget()
+            self.board_frame.pack(fill="both", expand=True, pady=(10, 0))
+        else:
+            if self.board_frame is not None:
+                self.board_frame.pack_forget()
+            self.tasks_frame.pack(fill="both", expand=True, pady=(10, 0))
+        self._scroll_y = 0
+        self._update_counts()
+        self.refresh_view()
+
+    def _passes_filter(self, task):
+        if self.current_filter == "Active":
+            return not task["done"]
+        if self.current_filter == "Completed":
+            return task["done"]
+        return True
 
     def refresh_view(self):
         """Refresh the current view"""
-        for task in self.tasks:
-            task["frame"].pack_forget()
+        if self.current_view == "board":
+            self._render_board()
+            return
+        if self.current_view == "tree":
+            self._refresh_tree()
+        else:
+            tasks = self.model.tasks if self._search is None else self._search
+            self._visible = [task for task in tasks if self._passes_filter(task)]
+        self._scroll_to(self._scroll_y)
+        
+    def _refresh_tree(self):
+        """Flatten the groups into _visible, redoing only the groups that changed"""
+        grouping = self.current_grouping
+        if self._search is not None:
+            # Search results are grouped on the fly and are few
+            self._tree = None
+            self._visible = []
+            for key, tasks in self.model.groups(grouping, self._search):
+                self._visible.extend(self._tree_rows(key, tasks))
+            return
+            
+        keys = self.model.group_keys(grouping)
+        tree = self._tree
+        if tree is None or tree["visible"] is not self._visible or tree["view"] != (grouping, self.current_filter) \
+                or tree["keys"] != keys:
+            tree = self._tree = {"visible": [], "view": (grouping, self.current_filter), "keys": keys,
+                                 "states": {}, "lengths": {}}
+            self._visible = tree["visible"]
+            
+        offset = 0
+        for key in keys:
+            state = (self.model.revision(grouping, key), key in self._collapsed, self._counts_generation)
+            length = tree["lengths"].get(key, 0)
+            if tree["states"].get(key) != state:
+                rows = self._tree_rows(key, self.model.members(grouping, key))
+                self._visible[offset:offset + length] = rows
+                tree["states"][key] = state
+                tree["lengths"][key] = length = len(rows)
+            offset += length
+            
+    def _tree_rows(self, key, tasks):
+        """Return the header and, unless folded, the tasks of a tree group that pass the filter"""
+        tasks = [task for task in tasks if self._passes_filter(task)]
+        if not tasks:
+            return []
+        return [("group", key, self._group_count(key, tasks))] + ([] if key in self._collapsed else tasks)
+        
+    def _group_count(self, key, tasks):
+        """Return the number of stored tasks in a group passing the filter, or of `tasks` until it is known"""
+        if self._search is not None or self._counts is None or self._counts[0] != self.current_grouping:
+            return len(tasks)
+        todo, done = self._counts[1].get(key, (0, 0))
+        if self.current_filter == "Active":
+            return todo
+        if self.current_filter == "Completed":
+            return done
+        return todo + done
+        
+    def _update_counts(self):
+        """Fetch the counts of the groups of the board and tree in the background"""
+        if not self.db or self.current_view == "list":
+            return
+        grouping, today = self.current_grouping, self.model.today()
+        
+        def counted(counts):
+            self._counts = (grouping, counts)
+            self._counts_generation += 1
+            if self.current_view != "list":
+                self.refresh_view()
+                
+        self._run_db(lambda db: self._group_counts.get(db, grouping, today), counted)
         
+    def _redraw(self):
+        """Show changed tasks; list rows stay where they are until the next refresh"""
         if self.current_view == "list":
-            for task in self.tasks:
-                task["frame"].pack(fill="x", pady=(0, 2))
+            self._render_rows()
+        else:
+            self.refresh_view()
+            
+    def _toggle_group(self, header):
+        """Fold or unfold a tree group"""
+        key = header[1]
+        if key in self._collapsed:
+            self._collapsed.remove(key)
+        else:
+            self._collapsed.add(key)
+        self.refresh_view()
+        
+    def _task_label(self, task):
+        """Return (text, details) shown for a task"""
+        text = task["text"] if self._search is None else self._snippets.get(task["id"], task["text"])
+        if task.get("priority"):
+            text = "!" * (4 - task["priority"]) + " " + text
+        details = [f"#{tag}" for tag in task.get("tags", ())]
+        if task.get("due_date"):
+            details.append(f"due {task['due_date']}")
+        return text, "  ".join(details)
+        
+    def _render_board(self):
+        """Show each group as a column of cards, touching only changed columns"""
+        grouping = self.current_grouping
+        keys = self.model.group_keys(grouping) if self._search is None else [
+            key for key, _ in self.model.groups(grouping, self._search)]
+        
+        # Drop the columns of groups that are gone, e.g. a tag no task has
+        # anymore, and regrid when the columns changed
+        for key in list(self._columns):
+            if key not in keys or self._columns[key]["grouping"] != grouping:
+                self._columns.pop(key)["frame"].destroy()
+        if keys != self._column_order:
+            for position in range(max(len(keys), len(self._column_order))):
+                self.board_frame.grid_columnconfigure(position, weight=0, uniform="")
+            for position, key in enumerate(keys):
+                if key not in self._columns:
+                    self._columns[key] = self._create_column(key, grouping)
+                self._columns[key]["frame"].grid(row=0, column=position, sticky="nsew", padx=4)
+                self.board_frame.grid_columnconfigure(position, weight=1, uniform="column")
+            self._column_order = keys
+            
+        searched = None if self._search is None else dict(self.model.groups(grouping, self._search))
+        highlighted = id(self._highlighted) if self._highlighted is not None else None
+        for key in keys:
+            column = self._columns[key]
+            # Same tasks, filter and look as last time: nothing to do
+            state = (self.model.revision(grouping, key), self.current_filter, self._search_generation,
+                     self._search is None, highlighted, self.current_font_size, self._exhausted,
+                     self._counts_generation)
+            if column["state"] == state:
+                continue
+            tasks = self.model.members(grouping, key) if searched is None else searched[key]
+            self._render_column(column, key, [task for task in tasks if self._passes_filter(task)])
+            column["state"] = state
+            
+    def _create_column(self, key, grouping):
+        column = {"grouping": grouping, "cards": {}, "order": [], "state": None, "title_text": None}
+        column["frame"] = ctk.CTkFrame(self.board_frame, fg_color="#252526", corner_radius=4)
+        column["title"] = ctk.CTkLabel(
+            column["frame"],
+            text=key,
+            anchor="w",
+            text_color="#cccccc",
+            font=ctk.CTkFont(size=12, weight="bold")
+        )
+        column["title"].pack(fill="x", padx=8, pady=(6, 2))
+        column["cards_frame"] = ctk.CTkScrollableFrame(column["frame"], fg_color="transparent", corner_radius=0)
+        column["cards_frame"].pack(fill="both", expand=True, padx=2, pady=(0, 4))
+        column["more"] = ctk.CTkLabel(column["frame"], text="", text_color="gray50", font=ctk.CTkFont(size=11))
+        column["more"].bind("<Button-1>", lambda e: self._show_more(column))
+        column["limit"] = BOARD_CARDS
+        return column
+        
+    def _show_more(self, column):
+        """Show more cards in a board column, fetching the next page if they are all shown"""
+        column["limit"] += BOARD_CARDS
+        column["state"] = None
+        self._load_page()
+        self.refresh_view()
+        
+    def _render_column(self, column, key, tasks):
+        """Fill a board column, creating cards only for tasks new to it"""
+        title = f"{key} ({self._group_count(key, tasks)})"
+        if column["title_text"] != title:
+            column["title"].configure(text=title)
+            column["title_text"] = title
+            
+        shown = tasks[:column["limit"]]
+        cards = column["cards"]
+        wanted = {id(task) for task in shown}
+        for task_id in list(cards):
+            if task_id not in wanted:
+                cards.pop(task_id)["frame"].destroy()
+        for task in shown:
+            card = cards.get(id(task))
+            if card is None:
+                card = cards[id(task)] = self._create_card(column["cards_frame"])
+            card["task"] = task
+            self._render_card(card)
+            
+        order = [id(task) for task in shown]
+        if order != column["order"]:
+            for task_id in order:
+                cards[task_id]["frame"].pack_forget()
+            for task_id in order:
+                cards[task_id]["frame"].pack(fill="x", pady=2)
+            column["order"] = order
+            
+        if len(tasks) > len(shown):
+            column["more"].configure(text=f"+{len(tasks) - len(shown)} more")
+            column["more"].pack(pady=(0, 6))
+        elif not self._exhausted and self._search is None:
+            column["more"].configure(text="Load more")
+            column["more"].pack(pady=(0, 6))
+        else:
+            column["more"].pack_forget()
+            
+    def _create_card(self, parent):
+        card = {"task": None, "rendered": None}
+        card["frame"] = ctk.CTkFrame(parent, fg_color="#2d2d30", corner_radius=4)
+        card["var"] = ctk.BooleanVar(value=False)
+        card["checkbox"] = ctk.CTkCheckBox(
+            card["frame"],
+            text="",
+            variable=card["var"],
+            corner_radius=0,
+            text_color="white",
+            command=lambda: self.toggle_task(card["task"], card["var"].get())
+        )
+        card["checkbox"].grid(row=0, column=0, sticky="w", padx=6, pady=(6, 2))
+        icon = self.delete_image
+        card["delete"] = ctk.CTkButton(
+            card["frame"],
+            text="" if isinstance(icon, ctk.CTkImage) else icon,
+            image=icon if isinstance(icon, ctk.CTkImage) else None,
+            width=20,
+            height=20,
+            corner_radius=0,
+            fg_color="transparent",
+            hover_color="#333333",
+            command=lambda: self.delete_task(card["task"])
+        )
+        card["delete"].grid(row=0, column=1, sticky="ne", padx=4, pady=4)
+        card["details"] = ctk.CTkLabel(card["frame"], text="", anchor="w", text_color="gray60", font=ctk.CTkFont(size=10))
+        card["details"].grid(row=1, column=0, columnspan=2, sticky="w", padx=8, pady=(0, 6))
+        card["frame"].grid_columnconfigure(0, weight=1)
+        for widget in (card["frame"], card["checkbox"], card["details"]):
+            widget.bind("<Button-3>", lambda e: self.show_task_menu(e, card["task"]))
+        return card
+        
+    def _render_card(self, card):
+        task = card["task"]
+        text, details = self._task_label(task)
+        state = (text, details, task["done"], task is self._highlighted, self.current_font_size)
+        if card["rendered"] == state:
+            return
+        card["var"].set(task["done"])
+        card["checkbox"].configure(
+            text=text,
+            text_color="gray50" if task["done"] else "white",
+            font=ctk.CTkFont(size=self.current_font_size)
+        )
+        card["details"].configure(text=details)
+        card["frame"].configure(fg_color="#264f78" if task is self._highlighted else "#2d2d30")
+        card["rendered"] = state
+        
+    def update_search(self):
+        """Show the tasks matching the search box, best first, or all tasks when it is empty"""
+        text = self.search_entry.get()
+        tokens = query_tokens(text)
+        self._search_generation += 1
+        generation = self._search_generation
+        if not tokens:
+            self._search = None
+            self._snippets = {}
+            self.refresh_view()
+            return
+            
+        if not self.db:
+            rows = [
+                (task["id"], task["text"], task["done"], snippet(tokens, task["text"]))
+                for task in self.model.tasks if all(token in task["text"].lower() for token in tokens)
+            ]
+            self._show_search_results(generation, rows)
+            return
+            
+        done = {"Active": False, "Completed": True}.get(self.current_filter)
+        self._run_db(
+            lambda db: search_tasks(db, text, done),
+            lambda rows: self._show_search_results(generation, rows),
+            lambda e: self._notify(f"Error searching tasks: {e}")
+        )
+        
+    def _show_search_results(self, generation, rows):
+        # Drop results of a query typed over since
+        if generation != self._search_generation:
+            return
+        self._search = [
+            self._by_id.get(task_id) or {"id": task_id, "text": text, "done": bool(done)}
+            for task_id, text, done, _ in rows
+        ]
+        self._snippets = {task_id: marked for task_id, _, _, marked in rows}
+        self._scroll_y = 0
+        self.refresh_view()
     
-    def load_tasks(self):
-        """Load tasks from the database"""
+    def _run_db(self, fn, on_done=None, on_error=None):
+        """Run fn(db) on the database worker and hand its result to `on_done` on the Tk thread"""
+        self._poll_db(self.db.submit(fn), on_done, on_error)
+        
+    def _poll_db(self, future, on_done, on_error):
+        if not self.winfo_exists():
+            return
+        if not future.done():
+            self.after(20, lambda: self._poll_db(future, on_done, on_error))
+            return
         try:
-            import sqlite3
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
+            result = future.result()
+        except Exception as e:
+            if on_error:
+                on_error(e)
+            return
+        if on_done:
+            on_done(result)
+            
+    def _notify(self, message):
+        if self.show_error_notification:
+            self.show_error_notification(message)
+    
+    def load_tasks(self):
+        """Load the first page of tasks in the background; the rest follow as the list scrolls"""
+        self._load_page()
+        self._update_summary()
+        
+    def _load_page(self):
+        """Fetch the next page of tasks, unless one is on its way or all are in"""
+        if self._loading or self._exhausted:
+            return
+        self._loading = True
+        cursor = self._cursor
+        
+        def load(db):
+            rows, next_cursor = fetch_page(db, cursor)
+            return _tasks_from_rows(rows), next_cursor
             
-            # Get all tasks
-            cursor.execute("SELECT task, done FROM todos ORDER BY created_date DESC")
-            tasks = cursor.fetchall()
+        def loaded(result):
+            tasks, self._cursor = result
+            self._loading = False
+            self._exhausted = self._cursor is None
             
-            # Add each task to the UI
-            for task_text, done in tasks:
-                self.add_task_to_ui(task_text, done)
+            # Pages are older than the tasks added here, which stay last
+            added = sum(1 for task in self._added if task in self.model)
+            self.model.insert_many(len(self.model.tasks) - added, tasks)
+            self._by_id.update((task["id"], task) for task in tasks)
+            self.refresh_view()
+            
+            # Highlight selected task if provided
+            if self._pending_highlight is not None:
+                self._seek_highlight()
                 
-            conn.close()
+        def failed(e):
+            self._loading = False
+            self._notify(f"Error loading tasks: {e}")
             
-        except Exception as e:
-            if self.show_error_notification:
-                self.show_error_notification(f"Error loading tasks: {e}")
+        self._run_db(load, loaded, failed)
+        
+    def _watch_sync(self):
+        """Reload the tasks once sync has pulled changes to them"""
+        if not self.winfo_exists():
+            return
+        # Local changes are written first, so the reload does not undo them
+        if self.sync.revision != self._sync_revision and not self._loading and not self._journal:
+            self._sync_revision = self.sync.revision
+            self.reload_tasks()
+        self.after(SYNC_POLL_INTERVAL, self._watch_sync)
+        
+    def reload_tasks(self):
+        """Read the tasks loaded so far again, keeping how far the list is paged"""
+        if self._loading or not self.db:
+            return
+        self._loading = True
+        limit = max(PAGE_SIZE, len(self.model.tasks))
+        
+        def load(db):
+            rows, next_cursor = fetch_page(db, None, limit)
+            return _tasks_from_rows(rows), next_cursor
+            
+        def loaded(result):
+            tasks, self._cursor = result
+            self._loading = False
+            self._exhausted = self._cursor is None
+            self._added = []
+            self._highlighted = None
+            self.model.load(tasks)
+            self._by_id = {task["id"]: task for task in tasks}
+            self._update_summary()
+            if self._search is not None:
+                self.update_search()
+            else:
+                self.refresh_view()
+                
+        def failed(e):
+            self._loading = False
+            self._notify(f"Error loading tasks: {e}")
+            
+        self._run_db(load, loaded, failed)
+        
+    def _update_summary(self):
+        """Show the pending task count"""
+        if self.db:
+            self._run_db(
+                lambda db: get_summary(db).get(db),
+                lambda summary: self.summary_label.configure(text=f"{summary[0]} pending")
+            )
+            self._update_counts()
     
-    def add_task_to_ui(self, task_text, done=False):
-        """Add a task to the UI with optional completion status"""
-        # Create task frame
-        task_frame = ctk.CTkFrame(
-            self.tasks_frame,
-            fg_color="transparent" if not done else "gray20",
+    def add_task_to_ui(self, task_text, done=False, task_id=None, priority=0, due_date=None, tags=()):
+        """Add a task to the end of the list with optional completion status, row id and details"""
+        task = {"id": task_id, "text": task_text, "done": done, "priority": priority, "due_date": due_date, "tags": tags}
+        self.model.add(task)
+        self._added.append(task)
+        self.refresh_view()
+        return task
+        
+    def _create_row(self):
+        """Create one recyclable row widget"""
+        row = {"task": None, "rendered": None}
+        row["frame"] = ctk.CTkFrame(self.rows_frame, fg_color="transparent", corner_radius=0, height=ROW_HEIGHT - ROW_GAP)
+        row["frame"].pack_propagate(False)
+        row["var"] = ctk.BooleanVar(value=False)
+        row["checkbox"] = ctk.CTkCheckBox(
+            row["frame"],
+            text="",
+            variable=row["var"],
             corner_radius=0,
-            height=35
+            text_color="white",
+            command=lambda: self.toggle_task(row["task"], row["var"].get())
         )
-        task_frame.pack(fill="x", pady=(0, 2))
-        task_frame.pack_propagate(False)
-        
-        # Add checkbox
-        var = ctk.BooleanVar(value=done)
-        checkbox = ctk.CTkCheckBox(
-            task_frame,
-            text=task_text,
-            variable=var,
+        row["checkbox"].pack(side="left", padx=5)
+        
+        icon = self.delete_image
+        row["delete"] = ctk.CTkButton(
+            row["frame"],
+            text="" if isinstance(icon, ctk.CTkImage) else icon,
+            image=icon if isinstance(icon, ctk.CTkImage) else None,
+            width=20,
+            height=20,
             corner_radius=0,
-            text_color="white" if not done else "gray50",
-            command=lambda: self.toggle_task(checkbox, task_frame)
+            fg_color="transparent",
+            hover_color="#333333",
+            command=lambda: self.delete_task(row["task"])
         )
-        checkbox.pack(side="left", padx=5)
+        row["delete"].pack(side="right", padx=5)
         
-        # Add delete button
-        try:
-            self.delete_image = ctk.CTkImage(
-                light_image=Image.open("media/icons/close.png"),
-                dark_image=Image.open("media/icons/close.png"),
-                size=(12, 12)
-            )
-            delete_btn = ctk.CTkButton(
-                task_frame,
-                text="",
-                image=self.delete_image,
-                width=20,
-                height=20,
-                corner_radius=0,
-                fg_color="transparent",
-                hover_color="#333333",
-                command=lambda: self.delete_task(task_frame, task_text)
-            )
-        except Exception as e:
-            if self.show_error_notification:
-                self.show_error_notification(f"Error loading delete icon: {e}")
-            delete_btn = ctk.CTkButton(
-                task_frame,
-                text="×",
-                width=20,
-                height=20,
-                corner_radius=0,
-                fg_color="transparent",
-                hover_color="#333333",
-                command=lambda: self.delete_task(task_frame, task_text)
+        # Shown instead of the checkbox and button on tree group rows
+        row["header"] = ctk.CTkLabel(row["frame"], text="", anchor="w", text_color="#cccccc")
+        row["header"].bind("<Button-1>", lambda e: self._toggle_group(row["task"]))
+        for widget in (row["frame"], row["checkbox"], row["delete"], row["header"]):
+            self._bind_scroll(widget)
+        for widget in (row["frame"], row["checkbox"]):
+            widget.bind("<Button-3>", lambda e: self.show_task_menu(e, row["task"]))
+        return row
+        
+    def _resize_pool(self):
+        """Keep one row widget per visible row, plus one for partial rows"""
+        needed = self.rows_frame.winfo_height() // ROW_HEIGHT + 2
+        while len(self._rows) < needed:
+            self._rows.append(self._create_row())
+        while len(self._rows) > needed:
+            self._rows.pop()["frame"].destroy()
+        self._scroll_to(self._scroll_y)
+        
+    def _render_rows(self):
+        """Fill the pooled rows with the tasks in view, touching only what changed"""
+        first = self._scroll_y // ROW_HEIGHT
+        if self._search is None and first + len(self._rows) + PAGE_MARGIN >= len(self._visible):
+            self._load_page()
+        for offset, row in enumerate(self._rows):
+            index = first + offset
+            if index >= len(self._visible):
+                if row["task"] is not None:
+                    row["frame"].place_forget()
+                    row["task"] = row["rendered"] = None
+                continue
+            task = self._visible[index]
+            row["task"] = task
+            row["frame"].place(x=0, y=index * ROW_HEIGHT - self._scroll_y, relwidth=1)
+            
+            if isinstance(task, tuple):
+                # Tree group header
+                _, key, count = task
+                state = ("group", key, count, key in self._collapsed, self.current_font_size)
+                if row["rendered"] == state:
+                    continue
+                if row["rendered"] is None or row["rendered"][0] != "group":
+                    row["checkbox"].pack_forget()
+                    row["delete"].pack_forget()
+                    row["header"].pack(side="left", fill="x", expand=True, padx=8)
+                row["header"].configure(
+                    text=f"{'▸' if key in self._collapsed else '▾'}  {key}  ({count})",
+                    font=ctk.CTkFont(size=self.current_font_size, weight="bold")
+                )
+                row["frame"].configure(fg_color="#252526")
+                row["rendered"] = state
+                continue
+                
+            text, details = self._task_label(task)
+            if details:
+                text = f"{text}   {details}"
+            state = ("task", text, task["done"], task is self._highlighted, self.current_font_size)
+            if row["rendered"] == state:
+                continue
+            if row["rendered"] is not None and row["rendered"][0] == "group":
+                row["header"].pack_forget()
+                row["checkbox"].pack(side="left", padx=5)
+                row["delete"].pack(side="right", padx=5)
+            _, text, done, highlighted, font_size = state
+            row["var"].set(done)
+            row["checkbox"].configure(
+                text=text,
+                text_color="gray50" if done else "white",
+                font=ctk.CTkFont(size=font_size)
             )
-        delete_btn.pack(side="right", padx=5)
-        
-        # Add task to list
-        self.tasks.append({
-            "frame": task_frame,
-            "checkbox": checkbox,
-            "delete": delete_btn,
-            "completed": var,
-            "text": task_text
-        })
+            if highlighted:
+                row["frame"].configure(fg_color="#264f78")
+            else:
+                row["frame"].configure(fg_color="gray20" if done else "transparent")
+            row["rendered"] = state
+            
+    def _scroll_to(self, y):
+        """Scroll the list to `y` pixels from the top and redraw the rows"""
+        view_height = max(1, self.rows_frame.winfo_height())
+        total = len(self._visible) * ROW_HEIGHT
+        self._scroll_y = int(max(0, min(y, total - view_height)))
+        if total > 0:
+            self.scrollbar.set(self._scroll_y / total, min(1.0, (self._scroll_y + view_height) / total))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+        self._render_rows()
+        
+    def _on_scrollbar(self, action, amount, unit=None):
+        if action == "moveto":
+            self._scroll_to(float(amount) * len(self._visible) * ROW_HEIGHT)
+        elif unit == "pages":
+            self._scroll_to(self._scroll_y + int(amount) * self.rows_frame.winfo_height())
+        else:
+            self._scroll_to(self._scroll_y + int(amount) * ROW_HEIGHT)
+            
+    def _bind_scroll(self, widget):
+        widget.bind("<MouseWheel>", self._on_mousewheel)
+        widget.bind("<Button-4>", self._on_mousewheel)  # X11 wheel up
+        widget.bind("<Button-5>", self._on_mousewheel)  # X11 wheel down
+        
+    def _on_mousewheel(self, event):
+        direction = -1 if event.num == 4 or getattr(event, "delta", 0) > 0 else 1
+        self._scroll_to(self._scroll_y + direction * 3 * ROW_HEIGHT)
+        
+    def _scroll_into_view(self, task):
+        """Scroll the list so `task` is visible"""
+        if task not in self._visible:
+            return
+        top = self._visible.index(task) * ROW_HEIGHT
+        view_height = self.rows_frame.winfo_height()
+        if top < self._scroll_y:
+            self._scroll_to(top)
+        elif top + ROW_HEIGHT > self._scroll_y + view_height:
+            self._scroll_to(top + ROW_HEIGHT - view_height)
     
     def add_task(self):
         """Add a new task"""
-        task_text = self.task_entry.get().strip()
+        task_text, details = parse_quick_add(self.task_entry.get().strip())
         if task_text:
-            try:
-                if self.db_path:
-                    # Add to database
-                    import sqlite3
-                    conn = sqlite3.connect(self.db_path)
-                    cursor = conn.cursor()
-                    cursor.execute("INSERT INTO todos (task) VALUES (?)", (task_text,))
-                    conn.commit()
-                    conn.close()
-                
-                # Add to UI
-                self.add_task_to_ui(task_text)
-                
-                # Clear entry
-                self.task_entry.delete(0, "end")
-                
-            except Exception as e:
-                if self.show_error_notification:
-                    self.show_error_notification(f"Error adding task: {e}")
-    
-    def toggle_task(self, checkbox, task_frame):
-        """Toggle task completion status"""
-        try:
-            is_completed = checkbox.get()
-            task_text = checkbox.cget("text")
+            # Add to UI right away, stored with the next journal flush
+            task = self.add_task_to_ui(task_text, **details)
+            self._scroll_into_view(task)
+            self._record(task, "add")
             
-            if self.db_path:
-                # Update database
-                import sqlite3
-                conn = sqlite3.connect(self.db_path)
-                cursor = conn.cursor()
-                cursor.execute(
-                    "UPDATE todos SET done = ?, completed_date = CASE WHEN ? THEN CURRENT_TIMESTAMP ELSE NULL END WHERE task = ?",
-                    (is_completed, is_completed, task_text)
-                )
-                conn.commit()
-                conn.close()
-            
-            # Update UI
-            if is_completed:
-                checkbox.configure(text_color="gray50")
-                task_frame.configure(fg_color="gray20")
-            else:
-                checkbox.configure(text_color="white")
-                task_frame.configure(fg_color="transparent")
-                
-        except Exception as e:
-            if self.show_error_notification:
-                self.show_error_notification(f"Error toggling task: {e}")
+            # Clear entry
+            self.task_entry.delete(0, "end")
     
-    def delete_task(self, task_frame, task_text):
+    def show_task_menu(self, event, task):
+        """Show the edit and delete menu for a task row or card"""
+        if not isinstance(task, dict):
+            return  # A tree group header
+        menu = tk.Menu(self, tearoff=0)
+        menu.add_command(label="Edit...", command=lambda: self._ask_task_text(task))
+        menu.add_command(label="Delete", command=lambda: self.delete_task(task))
+        menu.tk_popup(event.x_root, event.y_root)
+        
+    def _ask_task_text(self, task):
+        """Ask for the new text of a task"""
+        text = ctk.CTkInputDialog(text=f"Edit \"{task['text']}\":", title="Edit Task").get_input()
+        if text is not None:
+            self.edit_task(task, text)
+    
+    def edit_task(self, task, text):
+        """Change the text of a task"""
+        text = text.strip()
+        if task is None or not text or text == task["text"]:
+            return
+        if task in self.model:
+            self.model.update(task, text=text)
+        else:
+            task["text"] = text
+        self._snippets.pop(task["id"], None)
+        self._redraw()
+        self._record(task, "text")
+    
+    def toggle_task(self, task, is_completed):
+        """Set a task's completion status"""
+        if task is None or task["done"] == bool(is_completed):
+            return
+        if task in self.model:
+            self.model.update(task, done=bool(is_completed))
+        else:
+            task["done"] = bool(is_completed)  # A search result not loaded yet
+        self._redraw()
+        self._record(task, "done")
+    
+    def delete_task(self, task):
         """Delete a task"""
-        try:
-            if self.db_path:
-                # Delete from database
-                import sqlite3
-                conn = sqlite3.connect(self.db_path)
-                cursor = conn.cursor()
-                cursor.execute("DELETE FROM todos WHERE task = ?", (task_text,))
-                conn.commit()
-                conn.close()
-            
-            # Remove from UI
-            for task in self.tasks:
-                if task["frame"] == task_frame:
-                    self.tasks.remove(task)
-                    task_frame.destroy()
-                    break
-                    
-        except Exception as e:
-            if self.show_error_notification:
-                self.show_error_notification(f"Error deleting task: {e}")
+        if task is None:
+            return
+        if task in self.model:
+            self.model.remove(task)
+            self._by_id.pop(task["id"], None)
+        elif self._search is None or task not in self._search:
+            return  # Anything else is a search result not loaded yet
+        if self._search is not None and task in self._search:
+            self._search.remove(task)
+        self._snippets.pop(task["id"], None)
+        self.refresh_view()
+        self._record(task, "delete")
     
-    def highlight_task(self, task_text):
-        """Highlight a specific task"""
-        for task in self.tasks:
-            if task["text"] == task_text:
-                task["frame"].configure(fg_color="#264f78")
-                self.after(2000, lambda: task["frame"].configure(
-                    fg_color="gray20" if task["completed"].get() else "transparent"
-                ))
-                break 
+    def highlight_task(self, task_id):
+        """Highlight the task with the given row id"""
+        task = self._by_id.get(task_id)
+        if task is not None and task in self.model:
+            self._show_highlight(task)
+            return
+        self._pending_highlight = None
+        if not self.db:
+            return
+            
+        # Not loaded yet: page towards it, but only if it is there to find
+        def checked(row):
+            if row is not None:
+                self._pending_highlight = task_id
+                self._seek_highlight()
+                
+        self._run_db(
+            lambda db: db.fetchone("SELECT 1 FROM todos WHERE id = ? AND deleted_at IS NULL", (task_id,)),
+            checked
+        )
+        
+    def _seek_highlight(self):
+        """Highlight the pending task if its page is in, or load the next page"""
+        task = self._by_id.get(self._pending_highlight)
+        if task is not None and task in self.model:
+            self._pending_highlight = None
+            self._show_highlight(task)
+        elif self._exhausted:
+            self._pending_highlight = None
+        else:
+            self._load_page()
+            
+    def _show_highlight(self, task):
+        self._highlighted = task
+        self._scroll_into_view(task)
+        self._redraw()
+        self.after(2000, self._clear_highlight)
+                
+    def _clear_highlight(self):
+        self._highlighted = None
+        self._redraw()
 
     def _focus_task_entry(self):
         """Focus the task entry field"""
         self.task_entry.focus_set()
 
-    def _save_tasks(self):
-        """Save all tasks to the database"""
-        if self.db_path:
+    def _record(self, task, change):
+        """Note a change of `task` ("add", "text", "done" or "delete") for the next flush"""
+        if not self.db:
+            return
+        self._journal.setdefault(id(task), (task, set()))[1].add(change)
+        if self._flush_job is None:
+            self._flush_job = self.after(FLUSH_DELAY, self._flush_journal)
+    
+    def _flush_journal(self, on_done=None, wait=False):
+        """Write the journaled changes in one transaction on the database worker.
+        
+        With `wait` the Tk thread blocks until they are written, and a
+        failed write is reported instead of retried.
+        """
+        if self._flush_job is not None:
+            self.after_cancel(self._flush_job)
+            self._flush_job = None
+        journal, self._journal = self._journal, {}
+        
+        # Collapse each task's changes; the values written are the ones
+        # the task has now, whatever happened in between
+        adds, edits, toggles, deletes = [], [], [], []
+        for task, changes in journal.values():
+            if "delete" in changes:
+                if "add" not in changes:
+                    deletes.append(task)
+            elif "add" in changes:
+                adds.append((task, task["text"], task["done"]))
+            else:
+                if "text" in changes:
+                    edits.append((task, task["text"]))
+                if "done" in changes:
+                    toggles.append((task, task["done"]))
+                    
+        def flush(db):
+            # Ids of tasks added by an earlier flush were set on this
+            # thread, so they are read here rather than on the Tk thread
             try:
-                import sqlite3
-                conn = sqlite3.connect(self.db_path)
-                cursor = conn.cursor()
+                with db.transaction() as conn:
+                    for task, text, done in adds:
+                        task["id"] = conn.execute(
+                            "INSERT INTO todos (task, done, completed_date, priority, due_date, tags) "
+                            "VALUES (?, ?, CASE WHEN ? THEN CURRENT_TIMESTAMP END, ?, ?, ?)",
+                            (text, done, done, task["priority"], task["due_date"], ",".join(task["tags"]))
+                        ).lastrowid
+                    conn.executemany(
+                        "UPDATE todos SET task = ? WHERE id = ?",
+                        ((text, task["id"]) for task, text in edits if task["id"] is not None)
+                    )
+                    conn.executemany(
+                        "UPDATE todos SET done = ?, completed_date = CASE WHEN ? THEN CURRENT_TIMESTAMP ELSE NULL END WHERE id = ?",
+                        ((done, done, task["id"]) for task, done in toggles if task["id"] is not None)
+                    )
+                    # Deleted tasks are kept, marked, until sync has passed the deletion on
+                    deleted_at = int(time.time() * 1000)
+                    conn.executemany(
+                        "UPDATE todos SET deleted_at = ? WHERE id = ?",
+                        ((deleted_at, task["id"]) for task in deletes if task["id"] is not None)
+                    )
+            except BaseException:
+                for task, text, done in adds:
+                    task["id"] = None
+                raise
                 
-                # First, get all tasks from the database
-                cursor.execute("SELECT task FROM todos")
-                db_tasks = set(task[0] for task in cursor.fetchall())
+        def flushed(result):
+            self._flush_failures = 0
+            if self.sync is not None:
+                self.sync.sync_now()
+            for task, text, done in adds:
+                if task in self.model:
+                    self._by_id[task["id"]] = task
+            self._update_summary()
+            if on_done:
+                on_done()
                 
-                # Get current tasks from UI
-                ui_tasks = set(task["text"] for task in self.tasks)
-                
-                # Add new tasks
-                for task_text in ui_tasks - db_tasks:
-                    cursor.execute("INSERT INTO todos (task) VALUES (?)", (task_text,))
-                
-                # Remove deleted tasks
-                for task_text in db_tasks - ui_tasks:
-                    cursor.execute("DELETE FROM todos WHERE task = ?", (task_text,))
-                
-                conn.commit()
-                conn.close()
-                
-                if self.show_error_notification:
-                    self.show_error_notification("Tasks saved successfully")
-                    
+        def failed(e):
+            # Keep the changes and try again, waiting longer after each failure
+            for key, (task, changes) in journal.items():
+                self._journal.setdefault(key, (task, set()))[1].update(changes)
+            self._flush_failures += 1
+            if self._flush_job is None:
+                delay = min(FLUSH_MAX_DELAY, FLUSH_DELAY * 2 ** self._flush_failures)
+                self._flush_job = self.after(delay, self._flush_journal)
+            self._notify(f"Error saving tasks: {e}")
+            
+        if wait:
+            try:
+                self.db.submit(flush).result(timeout=FLUSH_EXIT_TIMEOUT)
             except Exception as e:
-                if self.show_error_notification:
-                    self.show_error_notification(f"Error saving tasks: {e}")
-        else:
-            if self.show_error_notification:
-                self.show_error_notification("No database configured for saving tasks") 
\ No newline at end of file
+                logger.error(f"Failed to save {len(journal)} changed tasks: {e}")
+                self._notify(f"Error saving tasks: {e}")
+            return
+        self._run_db(flush, flushed, failed)
+    
+    def destroy(self):
+        # A failed write could not be retried once the widget is gone, so
+        # the last one is waited for
+        if self._journal:
+            self._flush_journal(wait=True)
+        super().destroy()